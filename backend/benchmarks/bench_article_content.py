@@ -0,0 +1,144 @@
+"""
+Benchmark de ScrapingService.extract_full_article_content : parcours unique contre l'ancienne version en sept passes
+
+Une page de listing synthétique contient N éléments d'article (paragraphes,
+intertitres, listes, spans, sections, articles imbriqués). Les deux versions
+doivent produire le même contenu. Usage :
+
+    python benchmarks/bench_article_content.py --articles 100 --paragraphs 30
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import random
+import time
+from services.content_extractor import CONTENT_CLASS_KEYWORDS
+from services.html_parser import available_engines, parse_html
+from services.scraping_service import ScrapingService
+
+WORDS = (
+    "le la les un une des actualité marché gouvernement économie ville projet "
+    "sécurité santé école entreprise rapport annonce président ministre région "
+    "semaine budget croissance réforme développement public international"
+).split()
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def listing_page(articles, paragraphs, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    for i in range(articles):
+        body = []
+        for j in range(paragraphs):
+            kind = j % 6
+            if kind == 0:
+                body.append(f"<h3>{words(rng, 6)}</h3>")
+            elif kind == 1:
+                body.append(
+                    f"<ul><li>{words(rng, 5)}</li><li>{words(rng, 4)}"
+                    f"<ul><li>{words(rng, 5)}</li></ul></li></ul>"
+                )
+            elif kind == 2:
+                body.append(f"<p><span>{words(rng, 8)}</span> {words(rng, 20)}</p>")
+            else:
+                body.append(f"<p>{words(rng, 30)} <b>{words(rng, 3)}</b>.</p>")
+        parts.append(
+            f"<article class='article'><h2><a href='/a/{i}'>Titre {i} {words(rng, 6)}</a></h2>"
+            f"<div class='article-content summary'>{''.join(body)}"
+            f"<section>{words(rng, 15)}<p>{words(rng, 12)}</p></section></div>"
+            f"<article><p>{words(rng, 10)}</p></article><time>2024-01-0{i % 9 + 1}</time>"
+            f"</article>"
+        )
+    return f"<html><body><main>{''.join(parts)}</main></body></html>"
+
+
+def legacy_extract(service, element, title):
+    """Version d'origine : sept find_all et déduplication quadratique"""
+    content_parts = []
+
+    def add(elements, min_length, separator="", skip_title=True):
+        for item in elements:
+            if separator:
+                txt = service._clean_text(
+                    item.get_text(strip=True, separator=separator)
+                )
+            else:
+                txt = service._clean_text(item.get_text(strip=True))
+            if txt and len(txt) > min_length and (not skip_title or txt != title):
+                if not any(txt in existing for existing in content_parts):
+                    content_parts.append(txt)
+
+    add(element.find_all("p"), 15)
+    add(
+        element.find_all(
+            "div",
+            class_=lambda x: x
+            and any(keyword in x.lower() for keyword in CONTENT_CLASS_KEYWORDS),
+        ),
+        30,
+        "\n",
+    )
+    add(element.find_all(["h2", "h3", "h4", "h5", "h6"]), 10)
+    add(
+        [
+            item
+            for list_elem in element.find_all(["ul", "ol"])
+            for item in list_elem.find_all("li")
+        ],
+        10,
+        skip_title=False,
+    )
+    add(element.find_all("span"), 20)
+    add(element.find_all("section"), 50)
+    add([a for a in element.find_all("article") if a != element], 30)
+    return service._clean_text("\n\n".join(content_parts))
+
+
+def run(extract, service, elements, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [extract(service, element, "") for element in elements]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--paragraphs", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    service = ScrapingService.__new__(ScrapingService)
+    html = listing_page(args.articles, args.paragraphs)
+    print(
+        f"{'moteur':<14}{'éléments':>10}{'7 passes ms':>14}{'1 passe ms':>13}"
+        f"{'gain':>7}  identique"
+    )
+    for engine in available_engines():
+        soup = parse_html(html, engine)
+        elements = soup.select("article.article")
+        legacy_time, legacy = run(legacy_extract, service, elements, args.repeat)
+        single_time, single = run(
+            ScrapingService.extract_full_article_content,
+            service,
+            elements,
+            args.repeat,
+        )
+        print(
+            f"{engine:<14}{len(elements):>10}{legacy_time * 1000:>14.1f}"
+            f"{single_time * 1000:>13.1f}{legacy_time / single_time:>6.1f}x"
+            f"  {'oui' if legacy == single else 'NON'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de extract_article_from_url : mode "selectors" (historique) contre mode "readability"
+
+Pages d'article synthétiques avec navigation, barre latérale, articles liés
+et commentaires, selon trois gabarits : corps dans <article>, corps dans une
+div sans classe connue précédé de vignettes <article>, corps dans .content.
+On mesure le temps d'extraction, la longueur du contenu et la part des
+paragraphes du corps retrouvés. Usage :
+
+    python benchmarks/bench_article_extraction.py --pages 60 --paragraphs 25
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import random
+import time
+from services.readability_extractor import EXTRACTION_MODES
+from services.scraping_service import ScrapingService
+
+WORDS = (
+    "le la les un une des actualité marché gouvernement économie ville projet "
+    "sécurité santé école entreprise rapport annonce président ministre région "
+    "semaine budget croissance réforme développement public international"
+).split()
+
+LAYOUTS = ("article", "teasers", "content")
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def article_page(index, paragraphs):
+    """(HTML, paragraphes du corps) d'une page d'article"""
+    rng = random.Random(index)
+    layout = LAYOUTS[index % len(LAYOUTS)]
+    body = [
+        f"{words(rng, rng.randint(25, 60))}, {words(rng, 10)}."
+        for _ in range(paragraphs)
+    ]
+    body_html = "".join(
+        f"<h2>{words(rng, 5)}</h2><p>{text}</p>" if i % 8 == 4 else f"<p>{text}</p>"
+        for i, text in enumerate(body)
+    )
+    nav = "".join(f"<li><a href='/r/{i}'>{words(rng, 2)}</a></li>" for i in range(40))
+    teasers = "".join(
+        f"<article class='card'><h3><a href='/a/{i}'>{words(rng, 6)}</a></h3>"
+        f"<p>{words(rng, 18)}</p></article>"
+        for i in range(6)
+    )
+    comments = "".join(
+        f"<div class='comment'><span class='author'>{words(rng, 2)}</span>"
+        f"<p>{words(rng, 15)}</p></div>"
+        for _ in range(10)
+    )
+    header = f"<h1>Titre {index} {words(rng, 8)}</h1><time>2024-03-{index % 28 + 1:02d}</time>"
+    if layout == "article":
+        main = f"<article>{header}{body_html}</article><aside>{teasers}</aside>"
+    elif layout == "teasers":
+        main = f"<aside class='related'>{teasers}</aside><div class='story'>{header}{body_html}</div>"
+    else:
+        main = f"<div class='content'>{header}{body_html}</div><aside>{teasers}</aside>"
+    html = (
+        f"<html><head><title>Article {index}</title></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header><main>{main}</main>"
+        f"<section class='comments'>{comments}</section>"
+        f"<footer><ul>{nav}</ul></footer></body></html>"
+    )
+    return html, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--paragraphs", type=int, default=25)
+    args = parser.parse_args()
+
+    service = ScrapingService()
+    pages = [article_page(i, args.paragraphs) for i in range(args.pages)]
+    print(
+        f"{'mode':<13}{'gabarit':<10}{'ms/page':>9}{'caractères':>12}"
+        f"{'corps trouvé':>14}{'hors corps':>12}"
+    )
+    for mode in EXTRACTION_MODES:
+        for layout in LAYOUTS + ("tous",):
+            selected = [
+                page
+                for i, page in enumerate(pages)
+                if layout == "tous" or LAYOUTS[i % len(LAYOUTS)] == layout
+            ]
+            elapsed = 0.0
+            lengths, recalls, noises = [], [], []
+            for i, (html, body) in enumerate(selected):
+                url = f"https://exemple.fr/article/{i}"
+                start = time.perf_counter()
+                article = service.extract_article_from_url(
+                    url, url, html=html, extraction=mode
+                )
+                elapsed += time.perf_counter() - start
+                content = article["content"] if article else ""
+                found = [text for text in body if service._clean_text(text) in content]
+                lengths.append(len(content))
+                recalls.append(len(found) / len(body))
+                body_chars = sum(len(text) for text in found)
+                noises.append(max(0, len(content) - body_chars) / max(1, len(content)))
+            count = len(selected)
+            print(
+                f"{mode:<13}{layout:<10}{elapsed * 1000 / count:>9.2f}"
+                f"{sum(lengths) / count:>12.0f}{sum(recalls) / count:>13.0%}"
+                f"{sum(noises) / count:>12.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Benchmark des clients HTTP du chemin "requests" : requests (HTTP/1.1) contre httpx (HTTP/1.1 et HTTP/2)
+
+Un serveur local sert N pages d'article compressées selon l'Accept-Encoding
+annoncé (zstd, br, gzip). Le serveur HTTP/2 (h2c, sans TLS) utilise le
+paquet h2. Usage :
+
+    python benchmarks/bench_http_clients.py --requests 200 --concurrency 16 --delay 0.02
+"""
+
+import argparse
+import gzip
+import random
+import socket
+import socketserver
+import threading
+import time
+import http.server
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import requests
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:  # Pas de serveur HTTP/2 sans h2
+    h2 = None
+
+WORDS = (
+    "le la les un une des actualité marché gouvernement économie ville projet "
+    "sécurité santé école entreprise rapport annonce président ministre région "
+    "semaine budget croissance réforme développement public international"
+).split()
+
+
+def article_body(index, paragraphs=60):
+    rng = random.Random(index)
+    text = "".join(
+        f"<p>{' '.join(rng.choice(WORDS) for _ in range(60))}.</p>\n"
+        for _ in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Article {index}</title></head><body>"
+        f"<h1>Article {index}</h1><article>{text}</article></body></html>"
+    ).encode()
+
+
+def encode(body, accept_encoding):
+    """Compresser selon la préférence du client (zstd > br > gzip)"""
+    offered = {value.split(";")[0].strip() for value in accept_encoding.split(",")}
+    if "zstd" in offered and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(body), "zstd"
+    if "br" in offered and brotli is not None:
+        return brotli.compress(body), "br"
+    if "gzip" in offered:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.bytes_sent = 0
+        self.encodings = set()
+
+    def add(self, size, encoding):
+        with self.lock:
+            self.bytes_sent += size
+            self.encodings.add(encoding or "identity")
+
+
+def start_http1_server(bodies, stats, delay):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with stats.lock:
+                stats.connections += 1
+
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            index = int(self.path.rsplit("/", 1)[-1])
+            payload, encoding = encode(
+                bodies[index], self.headers.get("Accept-Encoding", "")
+            )
+            stats.add(len(payload), encoding)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _H2Connection:
+    """Connexion HTTP/2 côté serveur : un thread par flux, contrôle de flux géré"""
+
+    def __init__(self, sock, bodies, stats, delay):
+        self.sock = sock
+        self.bodies = bodies
+        self.stats = stats
+        self.delay = delay
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def _flush(self):
+        data = self.conn.data_to_send()
+        if data:
+            self.sock.sendall(data)
+
+    def _send_pending(self, stream_id):
+        payload = self.pending.get(stream_id)
+        if payload is None:
+            return
+        while payload:
+            window = min(
+                self.conn.local_flow_control_window(stream_id),
+                self.conn.max_outbound_frame_size,
+            )
+            if window <= 0:
+                break
+            chunk, payload = payload[:window], payload[window:]
+            self.conn.send_data(stream_id, chunk, end_stream=not payload)
+        if payload:
+            self.pending[stream_id] = payload
+        else:
+            del self.pending[stream_id]
+
+    def _respond(self, stream_id, headers):
+        if self.delay:
+            time.sleep(self.delay)
+        index = int(headers[":path"].rsplit("/", 1)[-1])
+        payload, encoding = encode(
+            self.bodies[index], headers.get("accept-encoding", "")
+        )
+        self.stats.add(len(payload), encoding)
+        response_headers = [
+            (":status", "200"),
+            ("content-type", "text/html; charset=utf-8"),
+            ("content-length", str(len(payload))),
+        ]
+        if encoding:
+            response_headers.append(("content-encoding", encoding))
+        with self.lock:
+            self.conn.send_headers(stream_id, response_headers)
+            self.pending[stream_id] = payload
+            self._send_pending(stream_id)
+            self._flush()
+
+    def serve(self):
+        with self.lock:
+            self.conn.initiate_connection()
+            self._flush()
+        while True:
+            data = self.sock.recv(65536)
+            if not data:
+                break
+            with self.lock:
+                events = self.conn.receive_data(data)
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = {
+                            (k.decode() if isinstance(k, bytes) else k): (
+                                v.decode() if isinstance(v, bytes) else v
+                            )
+                            for k, v in event.headers
+                        }
+                        threading.Thread(
+                            target=self._respond,
+                            args=(event.stream_id, headers),
+                            daemon=True,
+                        ).start()
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        for stream_id in list(self.pending):
+                            self._send_pending(stream_id)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                self._flush()
+
+
+def start_http2_server(bodies, stats, delay):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(64)
+
+    def accept_loop():
+        while True:
+            sock, _ = listener.accept()
+            with stats.lock:
+                stats.connections += 1
+            connection = _H2Connection(sock, bodies, stats, delay)
+            threading.Thread(target=connection.serve, daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return listener
+
+
+def run(name, fetch, urls, concurrency, stats):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        sizes = list(executor.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    return {
+        "backend": name,
+        "requests": len(urls),
+        "seconds": elapsed,
+        "req_per_s": len(urls) / elapsed,
+        "connections": stats.connections,
+        "wire_kb": stats.bytes_sent / 1024,
+        "body_kb": sum(sizes) / 1024,
+        "encodings": ",".join(sorted(stats.encodings)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--delay", type=float, default=0.02, help="latence serveur simulée (s)"
+    )
+    args = parser.parse_args()
+
+    bodies = [article_body(i) for i in range(args.requests)]
+    results = []
+
+    stats = Stats()
+    server = start_http1_server(bodies, stats, args.delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/article/{i}" for i in range(args.requests)]
+
+    session = requests.Session()
+    session.mount(
+        "http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    )
+    results.append(
+        run(
+            "requests HTTP/1.1",
+            lambda url: len(session.get(url, timeout=10).content),
+            urls,
+            args.concurrency,
+            stats,
+        )
+    )
+    session.close()
+
+    stats = Stats()
+    server = start_http1_server(bodies, stats, args.delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/article/{i}" for i in range(args.requests)]
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    with httpx.Client(limits=limits) as client:
+        results.append(
+            run(
+                "httpx HTTP/1.1",
+                lambda url: len(client.get(url, timeout=10).content),
+                urls,
+                args.concurrency,
+                stats,
+            )
+        )
+
+    if h2 is not None:
+        stats = Stats()
+        listener = start_http2_server(bodies, stats, args.delay)
+        base = f"http://127.0.0.1:{listener.getsockname()[1]}"
+        urls = [f"{base}/article/{i}" for i in range(args.requests)]
+        # h2c « prior knowledge » : HTTP/2 sans TLS (ALPN en production)
+        with httpx.Client(http1=False, http2=True, limits=limits) as client:
+            results.append(
+                run(
+                    "httpx HTTP/2",
+                    lambda url: len(client.get(url, timeout=10).content),
+                    urls,
+                    args.concurrency,
+                    stats,
+                )
+            )
+    else:
+        print("Paquet h2 absent : HTTP/2 non mesuré")
+
+    print(
+        f"{'client':<20}{'req':>6}{'durée s':>10}{'req/s':>10}{'connex.':>9}"
+        f"{'réseau Ko':>12}{'corps Ko':>11}  encodages"
+    )
+    for r in results:
+        print(
+            f"{r['backend']:<20}{r['requests']:>6}{r['seconds']:>10.2f}"
+            f"{r['req_per_s']:>10.1f}{r['connections']:>9}{r['wire_kb']:>12.0f}"
+            f"{r['body_kb']:>11.0f}  {r['encodings']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
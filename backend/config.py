@@ -88,7 +88,258 @@ class Config:
     # Configuration Scraping
     SCRAPING_TIMEOUT = 15
     SCRAPING_MAX_ARTICLES = 100
-    SCRAPING_MAX_PAGES = 5
+    SCRAPING_MAX_PAGES = int(os.getenv("SCRAPING_MAX_PAGES", 5))
+    # Pagination pipelinée : page suivante préchargée, pages ?page=N spéculatives
+    SCRAPING_PAGINATION_PREFETCH = (
+        os.getenv("SCRAPING_PAGINATION_PREFETCH", "True").lower() == "true"
+    )
+    SCRAPING_PAGINATION_SPECULATIVE = (
+        os.getenv("SCRAPING_PAGINATION_SPECULATIVE", "True").lower() == "true"
+    )
+    SCRAPING_PREFETCH_WORKERS = int(os.getenv("SCRAPING_PREFETCH_WORKERS", 3))
+
+    # Sessions HTTP persistantes (une session keep-alive par hôte)
+    SCRAPING_POOL_SIZE = int(os.getenv("SCRAPING_POOL_SIZE", 10))
+    SCRAPING_POOL_MAX_PER_HOST = int(os.getenv("SCRAPING_POOL_MAX_PER_HOST", 6))
+    SCRAPING_KEEP_ALIVE = os.getenv("SCRAPING_KEEP_ALIVE", "True").lower() == "true"
+    SCRAPING_SESSION_IDLE_TIMEOUT = int(os.getenv("SCRAPING_SESSION_IDLE_TIMEOUT", 90))
+    SCRAPING_MAX_SESSIONS = int(os.getenv("SCRAPING_MAX_SESSIONS", 100))
+    # Client du chemin "requests" : "requests" (HTTP/1.1) ou "httpx" (HTTP/2, br/zstd)
+    SCRAPING_HTTP_CLIENT = os.getenv("SCRAPING_HTTP_CLIENT", "requests")
+    # HTTP/2 pour les clients httpx (nécessite le paquet h2)
+    SCRAPING_HTTP2 = os.getenv("SCRAPING_HTTP2", "True").lower() == "true"
+
+    # Moteur de récupération HTML : "sync" (requests) ou "async" (httpx/asyncio)
+    SCRAPING_FETCH_ENGINE = os.getenv("SCRAPING_FETCH_ENGINE", "sync")
+    SCRAPING_ASYNC_MAX_CONNECTIONS = int(
+        os.getenv("SCRAPING_ASYNC_MAX_CONNECTIONS", 100)
+    )
+    SCRAPING_ASYNC_CONCURRENCY = int(os.getenv("SCRAPING_ASYNC_CONCURRENCY", 50))
+
+    # Politesse par domaine (seau à jetons) : débit en requêtes/s et rafale
+    SCRAPING_DOMAIN_RATE = float(os.getenv("SCRAPING_DOMAIN_RATE", 2.0))
+    SCRAPING_DOMAIN_BURST = float(os.getenv("SCRAPING_DOMAIN_BURST", 3))
+    # Surcharges par domaine : "exemple.com=0.5:1,autre.fr=4"
+    SCRAPING_DOMAIN_RATE_OVERRIDES = os.getenv("SCRAPING_DOMAIN_RATE_OVERRIDES", "")
+    SCRAPING_SCHEDULER_MAX_DOMAINS = int(
+        os.getenv("SCRAPING_SCHEDULER_MAX_DOMAINS", 10000)
+    )
+
+    # Pool de navigateurs Playwright persistants
+    SCRAPING_PLAYWRIGHT_POOL_SIZE = int(os.getenv("SCRAPING_PLAYWRIGHT_POOL_SIZE", 2))
+    SCRAPING_PLAYWRIGHT_MAX_PAGES_PER_BROWSER = int(
+        os.getenv("SCRAPING_PLAYWRIGHT_MAX_PAGES_PER_BROWSER", 50)
+    )
+    SCRAPING_PLAYWRIGHT_MAX_MEMORY_MB = int(
+        os.getenv("SCRAPING_PLAYWRIGHT_MAX_MEMORY_MB", 1024)
+    )
+    # Pages en cours (exécution + attente) au-delà desquelles on refuse
+    SCRAPING_PLAYWRIGHT_MAX_CONCURRENT_PAGES = int(
+        os.getenv("SCRAPING_PLAYWRIGHT_MAX_CONCURRENT_PAGES", 4)
+    )
+    SCRAPING_PLAYWRIGHT_QUEUE_TIMEOUT = int(
+        os.getenv("SCRAPING_PLAYWRIGHT_QUEUE_TIMEOUT", 30)
+    )
+    # Attente avant de relancer un worker dont Playwright n'a pas démarré
+    # (doublée à chaque échec consécutif, jusqu'au maximum)
+    SCRAPING_PLAYWRIGHT_RESPAWN_DELAY = float(
+        os.getenv("SCRAPING_PLAYWRIGHT_RESPAWN_DELAY", 5)
+    )
+    SCRAPING_PLAYWRIGHT_RESPAWN_MAX_DELAY = float(
+        os.getenv("SCRAPING_PLAYWRIGHT_RESPAWN_MAX_DELAY", 300)
+    )
+
+    # Pool de WebDrivers Selenium (plafond par worker gunicorn)
+    SCRAPING_SELENIUM_MAX_DRIVERS = int(os.getenv("SCRAPING_SELENIUM_MAX_DRIVERS", 2))
+    SCRAPING_SELENIUM_MAX_NAVIGATIONS = int(
+        os.getenv("SCRAPING_SELENIUM_MAX_NAVIGATIONS", 30)
+    )
+    SCRAPING_SELENIUM_CHECKOUT_TIMEOUT = int(
+        os.getenv("SCRAPING_SELENIUM_CHECKOUT_TIMEOUT", 30)
+    )
+
+    # Navigateurs headless : ressources bloquées et détection de fin de rendu
+    SCRAPING_BLOCKED_RESOURCE_TYPES = os.getenv(
+        "SCRAPING_BLOCKED_RESOURCE_TYPES", "image,media,font"
+    )
+    SCRAPING_BLOCKED_HOSTS = os.getenv(
+        "SCRAPING_BLOCKED_HOSTS",
+        "doubleclick.net,googlesyndication.com,googleadservices.com,"
+        "google-analytics.com,googletagmanager.com,googletagservices.com,"
+        "facebook.net,connect.facebook.net,scorecardresearch.com,criteo.com,"
+        "criteo.net,taboola.com,outbrain.com,hotjar.com,amazon-adsystem.com,"
+        "adnxs.com,chartbeat.com,quantserve.com,smartadserver.com",
+    )
+    # "selectors" (dès qu'un article est dans le DOM) ou "legacy" (networkidle / pause de 2 s)
+    SCRAPING_RENDER_STRATEGY = os.getenv("SCRAPING_RENDER_STRATEGY", "selectors")
+    # Attente maximale d'un sélecteur d'article (bornée par max_wait, et par la
+    # pause de 2 s sous Selenium) ; au-delà, le DOM est rendu tel quel, sans
+    # repli sur networkidle
+    SCRAPING_RENDER_TIMEOUT = int(os.getenv("SCRAPING_RENDER_TIMEOUT", 5))
+
+    # Sélection adaptative de la méthode de récupération (stats par domaine)
+    SCRAPING_METHOD_MIN_SAMPLES = int(os.getenv("SCRAPING_METHOD_MIN_SAMPLES", 5))
+    SCRAPING_METHOD_SKIP_THRESHOLD = float(
+        os.getenv("SCRAPING_METHOD_SKIP_THRESHOLD", 0.2)
+    )
+    SCRAPING_METHOD_EXPLORATION_RATE = float(
+        os.getenv("SCRAPING_METHOD_EXPLORATION_RATE", 0.1)
+    )
+    SCRAPING_METHOD_STATS_WINDOW = int(os.getenv("SCRAPING_METHOD_STATS_WINDOW", 100))
+    SCRAPING_METHOD_STATS_TTL = int(
+        os.getenv("SCRAPING_METHOD_STATS_TTL", 7 * 24 * 3600)
+    )
+    SCRAPING_METHOD_LATENCY_SAMPLES = int(
+        os.getenv("SCRAPING_METHOD_LATENCY_SAMPLES", 50)
+    )
+
+    # Classification statique / dynamique des pages
+    SCRAPING_CLASSIFIER_TTL = int(os.getenv("SCRAPING_CLASSIFIER_TTL", 6 * 3600))
+    SCRAPING_MIN_STATIC_TEXT = int(os.getenv("SCRAPING_MIN_STATIC_TEXT", 500))
+
+    # Cache des réponses HTML brutes (Redis, sinon disque)
+    SCRAPING_HTML_CACHE_ENABLED = (
+        os.getenv("SCRAPING_HTML_CACHE_ENABLED", "True").lower() == "true"
+    )
+    SCRAPING_HTML_CACHE_TTL = int(os.getenv("SCRAPING_HTML_CACHE_TTL", 900))
+    # Durée de conservation après expiration, pour revalidation conditionnelle
+    SCRAPING_HTML_CACHE_STALE_TTL = int(
+        os.getenv("SCRAPING_HTML_CACHE_STALE_TTL", 24 * 3600)
+    )
+    SCRAPING_HTML_CACHE_DIR = os.getenv(
+        "SCRAPING_HTML_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "html"),
+    )
+    SCRAPING_HTML_CACHE_DISK_MAX_ENTRIES = int(
+        os.getenv("SCRAPING_HTML_CACHE_DISK_MAX_ENTRIES", 5000)
+    )
+
+    # Disjoncteurs par domaine et par fournisseur (état partagé via Redis)
+    SCRAPING_CIRCUIT_FAILURE_THRESHOLD = int(
+        os.getenv("SCRAPING_CIRCUIT_FAILURE_THRESHOLD", 5)
+    )
+    SCRAPING_CIRCUIT_RECOVERY_TIMEOUT = int(
+        os.getenv("SCRAPING_CIRCUIT_RECOVERY_TIMEOUT", 60)
+    )
+    SCRAPING_CIRCUIT_STATE_TTL = int(os.getenv("SCRAPING_CIRCUIT_STATE_TTL", 24 * 3600))
+
+    # Requêtes couvertes (hedging) : méthode suivante lancée au-delà du p90
+    SCRAPING_HEDGE_ENABLED = (
+        os.getenv("SCRAPING_HEDGE_ENABLED", "False").lower() == "true"
+    )
+    SCRAPING_HEDGE_PERCENTILE = float(os.getenv("SCRAPING_HEDGE_PERCENTILE", 0.9))
+    # Délai avant couverture quand le domaine n'a pas assez de mesures
+    SCRAPING_HEDGE_DEFAULT_DELAY = float(os.getenv("SCRAPING_HEDGE_DEFAULT_DELAY", 3.0))
+    SCRAPING_HEDGE_MIN_DELAY = float(os.getenv("SCRAPING_HEDGE_MIN_DELAY", 0.5))
+    # Budget de couverture (protège les crédits Scrape.do), tous workers confondus
+    SCRAPING_HEDGE_MAX_PER_HOUR = int(os.getenv("SCRAPING_HEDGE_MAX_PER_HOUR", 100))
+    # Limite : un perdant déjà démarré va à son terme (créneau de navigateur
+    # compris) ; on ne couvre donc pas par un navigateur dont le pool est plein
+
+    # Politique de retry (backoff exponentiel avec jitter, Retry-After, échéance)
+    SCRAPING_RETRY_MAX_ATTEMPTS = int(os.getenv("SCRAPING_RETRY_MAX_ATTEMPTS", 3))
+    SCRAPING_RETRY_BASE_DELAY = float(os.getenv("SCRAPING_RETRY_BASE_DELAY", 0.5))
+    SCRAPING_RETRY_MAX_DELAY = float(os.getenv("SCRAPING_RETRY_MAX_DELAY", 10))
+    # Durée totale au-delà de laquelle on ne relance plus de tentative
+    SCRAPING_RETRY_DEADLINE = float(os.getenv("SCRAPING_RETRY_DEADLINE", 30))
+    # Retry-After plus long : abandon immédiat plutôt qu'une longue attente
+    SCRAPING_RETRY_AFTER_MAX = float(os.getenv("SCRAPING_RETRY_AFTER_MAX", 30))
+
+    # Lecture des réponses en streaming
+    SCRAPING_MAX_RESPONSE_BYTES = int(
+        os.getenv("SCRAPING_MAX_RESPONSE_BYTES", 10 * 1024 * 1024)
+    )
+    # Troncature volontaire : budget d'octets lus (0 = illimité) et arrêt à </body>
+    SCRAPING_READ_BUDGET_BYTES = int(os.getenv("SCRAPING_READ_BUDGET_BYTES", 0))
+    SCRAPING_STOP_AT_BODY_END = (
+        os.getenv("SCRAPING_STOP_AT_BODY_END", "False").lower() == "true"
+    )
+    SCRAPING_READ_CHUNK_SIZE = int(os.getenv("SCRAPING_READ_CHUNK_SIZE", 64 * 1024))
+
+    # Pool de proxies : liste séparée par des virgules et/ou fichier (un par ligne)
+    SCRAPING_PROXIES = os.getenv("SCRAPING_PROXIES", "")
+    SCRAPING_PROXY_FILE = os.getenv("SCRAPING_PROXY_FILE", "")
+    # Échecs consécutifs avant mise en quarantaine, puis backoff exponentiel
+    SCRAPING_PROXY_FAILURE_THRESHOLD = int(
+        os.getenv("SCRAPING_PROXY_FAILURE_THRESHOLD", 3)
+    )
+    SCRAPING_PROXY_QUARANTINE_BASE = float(
+        os.getenv("SCRAPING_PROXY_QUARANTINE_BASE", 30)
+    )
+    SCRAPING_PROXY_QUARANTINE_MAX = float(
+        os.getenv("SCRAPING_PROXY_QUARANTINE_MAX", 1800)
+    )
+    # Latence de référence (s) pour le score : un proxy à cette latence vaut moitié
+    SCRAPING_PROXY_LATENCY_REFERENCE = float(
+        os.getenv("SCRAPING_PROXY_LATENCY_REFERENCE", 2.0)
+    )
+    # Mesures minimales sur un domaine avant d'utiliser son score propre
+    SCRAPING_PROXY_MIN_SAMPLES = int(os.getenv("SCRAPING_PROXY_MIN_SAMPLES", 5))
+
+    # robots.txt (mis en cache par domaine) et Crawl-delay
+    SCRAPING_RESPECT_ROBOTS = (
+        os.getenv("SCRAPING_RESPECT_ROBOTS", "True").lower() == "true"
+    )
+    SCRAPING_ROBOTS_USER_AGENT = os.getenv("SCRAPING_ROBOTS_USER_AGENT", "*")
+    SCRAPING_ROBOTS_TTL = int(os.getenv("SCRAPING_ROBOTS_TTL", 24 * 3600))
+    # robots.txt inaccessible (5xx, réseau) : nouvel essai plus tôt
+    SCRAPING_ROBOTS_ERROR_TTL = int(os.getenv("SCRAPING_ROBOTS_ERROR_TTL", 600))
+    SCRAPING_MAX_CRAWL_DELAY = float(os.getenv("SCRAPING_MAX_CRAWL_DELAY", 30))
+    # Flux RSS/Atom et sitemaps news utilisés à la place des pages de listing
+    SCRAPING_USE_FEEDS = os.getenv("SCRAPING_USE_FEEDS", "True").lower() == "true"
+    SCRAPING_SITEMAP_MAX_FETCHES = int(os.getenv("SCRAPING_SITEMAP_MAX_FETCHES", 3))
+
+    # Moteur d'analyse HTML : "lxml", "selectolax" (si installé) ou "html.parser"
+    SCRAPING_PARSER_ENGINE = os.getenv("SCRAPING_PARSER_ENGINE", "lxml")
+
+    # Extraction du contenu des pages d'articles : "selectors" ou "readability"
+    SCRAPING_EXTRACTION_MODE = os.getenv("SCRAPING_EXTRACTION_MODE", "selectors")
+    # Mode par domaine : "exemple.com=readability,autre.fr=selectors"
+    SCRAPING_EXTRACTION_MODE_OVERRIDES = os.getenv(
+        "SCRAPING_EXTRACTION_MODE_OVERRIDES", ""
+    )
+    SCRAPING_READABILITY_MIN_TEXT_LENGTH = int(
+        os.getenv("SCRAPING_READABILITY_MIN_TEXT_LENGTH", 25)
+    )
+    SCRAPING_READABILITY_RETRY_LENGTH = int(
+        os.getenv("SCRAPING_READABILITY_RETRY_LENGTH", 250)
+    )
+
+    # Profils d'extraction appris par domaine (sélecteurs ayant produit des articles)
+    SCRAPING_EXTRACTION_PROFILES = (
+        os.getenv("SCRAPING_EXTRACTION_PROFILES", "True").lower() == "true"
+    )
+    SCRAPING_PROFILE_TTL = int(os.getenv("SCRAPING_PROFILE_TTL", 30 * 24 * 3600))
+    # Scan complet si le rendement des sélecteurs appris tombe sous cette part
+    SCRAPING_PROFILE_MIN_YIELD_RATIO = float(
+        os.getenv("SCRAPING_PROFILE_MIN_YIELD_RATIO", 0.5)
+    )
+
+    # Repli IA quand aucun sélecteur ne trouve d'articles :
+    # "raw" (HTML envoyé à chaque job), "spec" (sélecteurs JSON générés une fois par
+    # domaine puis rejoués, sur option) ou "off"
+    SCRAPING_AI_FALLBACK_MODE = os.getenv("SCRAPING_AI_FALLBACK_MODE", "raw")
+    SCRAPING_LLM_SPEC_MODEL = os.getenv("SCRAPING_LLM_SPEC_MODEL", "llama3-8b-8192")
+    SCRAPING_LLM_SPEC_TTL = int(os.getenv("SCRAPING_LLM_SPEC_TTL", 30 * 24 * 3600))
+    # Délai avant de redemander au LLM après une spécification invalide
+    SCRAPING_LLM_SPEC_RETRY_TTL = int(os.getenv("SCRAPING_LLM_SPEC_RETRY_TTL", 3600))
+    SCRAPING_LLM_SPEC_MIN_ITEMS = int(os.getenv("SCRAPING_LLM_SPEC_MIN_ITEMS", 2))
+    SCRAPING_LLM_SPEC_HTML_CHARS = int(os.getenv("SCRAPING_LLM_SPEC_HTML_CHARS", 20000))
+
+    # Données structurées (JSON-LD, __NEXT_DATA__, microdata, OpenGraph) avant les sélecteurs CSS
+    SCRAPING_STRUCTURED_DATA = (
+        os.getenv("SCRAPING_STRUCTURED_DATA", "True").lower() == "true"
+    )
+    # Articles déclarés requis pour remplacer le scan des sélecteurs d'une page de listing
+    SCRAPING_STRUCTURED_MIN_RECORDS = int(
+        os.getenv("SCRAPING_STRUCTURED_MIN_RECORDS", 2)
+    )
+
+    # Extraction concurrente des pages d'articles
+    SCRAPING_DETAIL_CONCURRENCY = int(os.getenv("SCRAPING_DETAIL_CONCURRENCY", 8))
+    SCRAPING_DETAIL_CONCURRENCY_PER_DOMAIN = int(
+        os.getenv("SCRAPING_DETAIL_CONCURRENCY_PER_DOMAIN", 4)
+    )
 
     # Configuration IA
     IA_MODEL = "llama3-8b-8192"
@@ -13,6 +13,8 @@ import os
 
 from database.mysql_connector import mysql_connector
 from database.redis_connector import redis_connector
+from services.circuit_breaker import circuit_breakers
+from services.proxy_pool import proxy_pool
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -68,6 +70,25 @@ def health_check():
             "available" if Config.HAS_SCRAPEDO else "unavailable"
         )
 
+        # Disjoncteurs de scraping ouverts ou semi-ouverts
+        try:
+            health_status["circuit_breakers"] = circuit_breakers.get_states()
+            scrapedo_circuit = health_status["circuit_breakers"].get(
+                "provider:scrapedo"
+            )
+            if Config.HAS_SCRAPEDO and scrapedo_circuit:
+                health_status["services"][
+                    "scrapedo"
+                ] = f"unavailable: circuit {scrapedo_circuit['state']}"
+        except Exception as e:
+            logger.warning(f"Impossible de lire les disjoncteurs: {e}")
+
+        # Pool de proxies : scores et quarantaines
+        if proxy_pool.enabled:
+            health_status["proxy_pool"] = proxy_pool.get_stats()
+            if not health_status["proxy_pool"]["available"]:
+                health_status["services"]["proxies"] = "unavailable: all quarantined"
+
         status_code = 200 if health_status["status"] == "healthy" else 503
 
         return jsonify(health_status), status_code
@@ -55,6 +55,9 @@ def extract_articles():
         method = data.get("method", "scrapedo")
         max_articles = data.get("max_articles", 20)
         max_ia_summaries = data.get("max_ia_summaries", 10)  # Added this line
+        hedge = data.get("hedge")  # None : valeur par défaut de la configuration
+        # "selectors" ou "readability" ; None : mode du domaine ou de la configuration
+        extraction = data.get("extraction")
 
         if not site_url:
             return jsonify({"success": False, "message": "URL requise"}), 400
@@ -65,6 +68,8 @@ def extract_articles():
             method=method,
             max_articles=max_articles,
             max_ia_summaries=max_ia_summaries,  # Passed this parameter
+            hedge=hedge,
+            extraction=extraction,
         )
 
         if not result["success"]:
@@ -0,0 +1,334 @@
+"""
+Moteur de récupération HTML asynchrone (httpx.AsyncClient)
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import asyncio
+import logging
+import time
+from urllib.parse import urlparse
+import httpx
+from services.fetch_router import FetchRouter
+from services.scraping_metrics import HEDGE_EVENTS
+from services.response_reader import ContentRejectedError
+from services.circuit_breaker import (
+    CircuitOpenError,
+    domain_circuit,
+    provider_circuit,
+)
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ProxiedClients:
+    """Clients httpx d'une boucle, un par proxy (httpx fixe le proxy à la création)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._clients = {}
+
+    def for_proxy(self, proxy=None):
+        client = self._clients.get(proxy)
+        if client is None:
+            client = self._clients[proxy] = self._factory(proxy)
+        return client
+
+    def stream(self, *args, **kwargs):
+        """Requête directe, sans proxy (ex: API Scrape.do)"""
+        return self.for_proxy(None).stream(*args, **kwargs)
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class AsyncFetchEngine:
+    """Implémentation asynchrone du contrat get_html(url, method_order=...)
+
+    Les méthodes HTTP (requests, scrapedo) sont natives asyncio ; les
+    navigateurs (selenium, playwright) sont délégués à un thread.
+    """
+
+    def __init__(self, service, max_connections=None, concurrency=None):
+        self.service = service
+        self.max_connections = max_connections or Config.SCRAPING_ASYNC_MAX_CONNECTIONS
+        self.concurrency = concurrency or Config.SCRAPING_ASYNC_CONCURRENCY
+
+    def open_client(self):
+        """Créer un client partageable entre plusieurs appels sur une même boucle"""
+        return ProxiedClients(self._new_client)
+
+    def _new_client(self, proxy=None):
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            http2=self.service.sessions.http2,
+            proxy=proxy,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.service.sessions.pool_size,
+                keepalive_expiry=self.service.sessions.idle_timeout,
+            ),
+        )
+
+    async def _http_get_with_retry(self, client, url, headers=None, timeout=10):
+        """GET HTTP asynchrone rejoué selon la politique de retry partagée"""
+        circuit = domain_circuit(urlparse(url).netloc)
+
+        async def attempt_get(attempt):
+            if attempt and self.service.breakers.is_open(circuit):
+                raise CircuitOpenError(f"Disjoncteur {circuit} ouvert")
+            await asyncio.sleep(self.service._reserve_request_slot(url))
+            h = dict(headers or {})
+            if "User-Agent" not in h:
+                h["User-Agent"] = self.service._get_random_user_agent()
+            with self.service.proxy_pool.use(url) as proxy:
+                async with client.for_proxy(proxy).stream(
+                    "GET", url, headers=h, timeout=timeout
+                ) as resp:
+                    if resp.status_code != 304:
+                        resp.raise_for_status()
+                    return await self.service.response_reader.aread(resp)
+
+        return await self.service.retry_policy.call_async(
+            attempt_get, f"HTTP GET async {url}"
+        )
+
+    async def _scrape_with_scrapedo(self, client, url):
+        if not self.service.config.HAS_SCRAPEDO:
+            raise Exception("Scrape.do API key non configurée")
+        circuit = provider_circuit("scrapedo")
+        self.service.breakers.check(circuit)
+
+        async def attempt_scrapedo(attempt):
+            if attempt and self.service.breakers.is_open(circuit):
+                raise CircuitOpenError(f"Disjoncteur {circuit} ouvert")
+            async with client.stream(
+                "GET",
+                "https://api.scrape.do/",
+                params={"token": self.service.config.SCRAPEDO_API_KEY, "url": url},
+                timeout=30,
+            ) as response:
+                response.raise_for_status()
+                return await self.service.response_reader.aread(response)
+
+        try:
+            response = await self.service.retry_policy.call_async(
+                attempt_scrapedo, "Scrape.do (async)"
+            )
+        except Exception as e:
+            self.service.breakers.record_failure(circuit, e)
+            raise
+        self.service.breakers.record_success(circuit)
+        return response.text
+
+    async def _fetch_with_method(self, client, url, method, max_wait=10, router=None):
+        if method == "requests":
+            if router is None:
+                resp = await self._http_get_with_retry(client, url)
+                return resp.text
+            resp = await self._http_get_with_retry(
+                client, url, headers=router.request_headers()
+            )
+            return router.accept_response(resp.status_code, resp.text, resp.headers)
+        elif method == "scrapedo":
+            return await self._scrape_with_scrapedo(client, url)
+        elif method in ("selenium", "playwright"):
+            return await asyncio.to_thread(
+                self.service._fetch_with_method, url, method, max_wait
+            )
+        raise ValueError(f"Méthode de récupération inconnue: {method}")
+
+    async def fetch_html(
+        self, url, method_order=None, max_wait=10, client=None, hedge=False
+    ):
+        """Version asynchrone de ScrapingService.fetch_html"""
+        await asyncio.to_thread(self.service._check_robots, url)
+        router = FetchRouter(self.service, url, method_order)
+        cached = router.cached_result()
+        if cached:
+            return cached
+        owns_client = client is None
+        if owns_client:
+            client = self.open_client()
+        try:
+            if hedge:
+                return await self._fetch_hedged(client, router, url, max_wait)
+            for method in router:
+                start = time.time()
+                try:
+                    html = await self._fetch_with_method(
+                        client, url, method, max_wait, router
+                    )
+                except Exception as e:
+                    router.on_error(method, e, time.time() - start)
+                    continue
+                result = router.on_html(method, html, time.time() - start)
+                if result:
+                    return result
+            return router.finish()
+        finally:
+            if owns_client:
+                await client.aclose()
+
+    async def _fetch_hedged(self, client, router, url, max_wait):
+        """Version asynchrone de ScrapingService._fetch_hedged (perdant annulé)"""
+        hedge_policy = self.service.hedge_policy
+        methods = iter(router)
+        pending = {}
+        deferred = None
+
+        def launch(method):
+            task = asyncio.ensure_future(
+                self._fetch_with_method(client, url, method, max_wait, router)
+            )
+            pending[task] = (method, time.time())
+
+        try:
+            while True:
+                primary, deferred = deferred or next(methods, None), None
+                if primary is None:
+                    return router.finish()
+                launch(primary)
+                hedge = None
+                timeout = hedge_policy.delay(router.domain, primary)
+                while pending:
+                    done, _ = await asyncio.wait(
+                        pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        candidate = next(methods, None)
+                        if candidate is not None and hedge_policy.try_acquire():
+                            hedge = candidate
+                            launch(candidate)
+                            router.reason += (
+                                f"; couverture {candidate} après {timeout:.1f}s"
+                            )
+                        else:
+                            deferred = candidate
+                        timeout = None
+                        continue
+                    for task in done:
+                        method, start = pending.pop(task)
+                        try:
+                            html = task.result()
+                        except Exception as e:
+                            router.on_error(method, e, time.time() - start)
+                            continue
+                        result = router.on_html(method, html, time.time() - start)
+                        if result:
+                            if hedge is not None:
+                                HEDGE_EVENTS.labels(
+                                    result="won" if method == hedge else "lost"
+                                ).inc()
+                            return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_html(self, url, method_order=None, max_wait=10, client=None) -> str:
+        """Version asynchrone de ScrapingService.get_html"""
+        result = await self.fetch_html(url, method_order, max_wait, client)
+        return result["html"]
+
+    async def fetch_article_html(self, client, article_url, max_wait=10):
+        """Version asynchrone de ScrapingService._fetch_article_html"""
+        await asyncio.to_thread(self.service._check_robots, article_url)
+        html_cache = self.service.html_cache
+        breakers = self.service.breakers
+        entry = html_cache.lookup(article_url)
+        if entry and entry["fresh"]:
+            return entry["html"]
+        circuit = domain_circuit(urlparse(article_url).netloc)
+        breakers.check(circuit)
+
+        async def attempt_article(attempt):
+            await asyncio.sleep(self.service._reserve_request_slot(article_url))
+            with self.service.proxy_pool.use(article_url) as proxy:
+                async with client.for_proxy(proxy).stream(
+                    "GET",
+                    article_url,
+                    timeout=10,
+                    headers={
+                        "User-Agent": self.service.ARTICLE_USER_AGENT,
+                        **html_cache.conditional_headers(entry),
+                    },
+                ) as response:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return await self.service.response_reader.aread(response)
+
+        try:
+            response = await self.service.retry_policy.call_async(
+                attempt_article, f"Article async {article_url}"
+            )
+            if response.status_code == 304 and entry:
+                breakers.record_success(circuit)
+                html_cache.mark_revalidated(article_url, entry)
+                return entry["html"]
+            html = response.text
+            breakers.record_success(circuit)
+            html_cache.store(
+                article_url, html, "requests", *html_cache.validators(response.headers)
+            )
+            return html
+        except ContentRejectedError:
+            raise
+        except Exception as e:
+            breakers.record_failure(circuit, e)
+            # Fallback vers Selenium
+            try:
+                html = await asyncio.to_thread(
+                    self.service.get_site_content_selenium, article_url, max_wait
+                )
+            except Exception as selenium_error:
+                breakers.record_failure(circuit, selenium_error, rendered=True)
+                raise
+            breakers.record_success(circuit)
+            html_cache.store(article_url, html, "selenium")
+            return html
+
+    async def get_many(
+        self, urls, method_order=None, max_wait=10, fetcher=None, per_host=None
+    ):
+        """Récupérer plusieurs URLs sur une seule boucle (ordre conservé)
+
+        La concurrence est bornée globalement et par hôte (`per_host`, au plus
+        le nombre de connexions par hôte des sessions). Chaque résultat est le
+        HTML, ou l'exception levée pour cette URL. `fetcher` permet de
+        remplacer get_html (ex: fetch_article_html). Le client n'est partagé
+        que pendant l'appel : les connexions ne sont pas réutilisées d'un appel
+        à l'autre.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        host_limit = self.service.sessions.max_per_host
+        if per_host:
+            host_limit = min(host_limit, per_host)
+        host_semaphores = {}
+
+        async with self.open_client() as client:
+
+            async def fetch(url):
+                host = urlparse(url).netloc
+                if host not in host_semaphores:
+                    host_semaphores[host] = asyncio.Semaphore(host_limit)
+                async with semaphore, host_semaphores[host]:
+                    if fetcher is not None:
+                        return await fetcher(client, url, max_wait)
+                    return await self.get_html(url, method_order, max_wait, client)
+
+            return await asyncio.gather(
+                *(fetch(url) for url in urls), return_exceptions=True
+            )
@@ -0,0 +1,292 @@
+"""
+Disjoncteurs par domaine cible et par fournisseur de récupération
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import threading
+import time
+from database.redis_connector import redis_connector
+from services.scraping_metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATES = (CLOSED, HALF_OPEN, OPEN)
+
+# Statuts client qui signalent un blocage plutôt qu'une page absente
+BLOCKING_CLIENT_STATUSES = (403, 429)
+
+# Erreurs réseau remontées par Chrome (Selenium et Playwright)
+BROWSER_NETWORK_ERROR = "net::ERR_"
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé immédiatement : le disjoncteur est ouvert"""
+
+
+def domain_circuit(domain):
+    return f"domain:{domain}"
+
+
+def provider_circuit(provider):
+    return f"provider:{provider}"
+
+
+def metric_label(circuit):
+    """Libellé Prometheus borné : le fournisseur, ou « domain » pour tout domaine"""
+    return circuit if circuit.startswith("provider:") else "domain"
+
+
+def _export_states(states):
+    """Publier le nombre de circuits par état ({circuit: état})"""
+    counts = {}
+    for circuit, state in states.items():
+        key = (metric_label(circuit), state)
+        counts[key] = counts.get(key, 0) + 1
+    for label in {label for label, _ in counts} | {"domain"}:
+        for state in STATES:
+            CIRCUIT_STATE.labels(circuit=label, state=state).set(
+                counts.get((label, state), 0)
+            )
+
+
+def counts_as_failure(exc, rendered=False):
+    """Une erreur réseau, un 5xx ou un blocage ouvrent le circuit ; un 404 non
+
+    Pour un navigateur (`rendered`), seules les erreurs réseau de Chrome
+    comptent : les autres viennent le plus souvent du navigateur lui-même.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if rendered:
+        return BROWSER_NETWORK_ERROR in str(exc)
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        return True
+    return status >= 500 or status in BLOCKING_CLIENT_STATUSES
+
+
+class CircuitBreakerRegistry:
+    """Disjoncteurs fermé / ouvert / semi-ouvert partagés via Redis
+
+    Après `failure_threshold` échecs consécutifs le circuit s'ouvre et les
+    appels échouent immédiatement. Passé `recovery_timeout`, un seul appel
+    test est autorisé (semi-ouvert) : son succès referme le circuit, son
+    échec le rouvre. Sans Redis, l'état est local au worker.
+    """
+
+    KEY_PREFIX = "circuit_breaker"
+
+    def __init__(
+        self, cache=None, failure_threshold=None, recovery_timeout=None, ttl=None
+    ):
+        self.cache = cache or redis_connector
+        self.failure_threshold = (
+            failure_threshold or Config.SCRAPING_CIRCUIT_FAILURE_THRESHOLD
+        )
+        self.recovery_timeout = (
+            recovery_timeout or Config.SCRAPING_CIRCUIT_RECOVERY_TIMEOUT
+        )
+        self.ttl = ttl or Config.SCRAPING_CIRCUIT_STATE_TTL
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def _key(self, circuit):
+        return f"{self.KEY_PREFIX}:{circuit}"
+
+    def _redis(self):
+        try:
+            return self.cache.get_connection()
+        except Exception:
+            return None
+
+    def _read(self, circuit):
+        redis_conn = self._redis()
+        if redis_conn is not None:
+            try:
+                raw = redis_conn.hgetall(self._key(circuit))
+                return {
+                    "state": raw.get("state", CLOSED),
+                    "failures": int(raw.get("failures", 0)),
+                    "opened_at": float(raw.get("opened_at", 0)),
+                }
+            except Exception as e:
+                logger.warning(f"Erreur lors de la lecture du disjoncteur: {e}")
+        with self._lock:
+            return dict(
+                self._local.get(
+                    circuit, {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+                )
+            )
+
+    def _set_state(self, circuit, state, opened_at=None):
+        fields = {"state": state}
+        if state == CLOSED:
+            fields["failures"] = 0
+        if opened_at is not None:
+            fields["opened_at"] = opened_at
+        redis_conn = self._redis()
+        if redis_conn is not None:
+            try:
+                key = self._key(circuit)
+                redis_conn.hset(key, mapping=fields)
+                redis_conn.expire(key, self.ttl)
+                if state != HALF_OPEN:
+                    redis_conn.delete(f"{key}:probe")
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'écriture du disjoncteur: {e}")
+        with self._lock:
+            local = self._local.setdefault(
+                circuit, {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+            )
+            local.update(fields)
+            if state != HALF_OPEN:
+                local.pop("probe", None)
+            states = {name: entry["state"] for name, entry in self._local.items()}
+        _export_states(states)
+
+    def _claim_probe(self, circuit):
+        """Un seul appel test par fenêtre de récupération, tous workers confondus"""
+        redis_conn = self._redis()
+        if redis_conn is not None:
+            try:
+                return bool(
+                    redis_conn.set(
+                        f"{self._key(circuit)}:probe",
+                        1,
+                        nx=True,
+                        ex=max(1, int(self.recovery_timeout)),
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Erreur lors de la réservation de l'appel test: {e}")
+        with self._lock:
+            local = self._local.setdefault(
+                circuit, {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+            )
+            if local.get("probe", 0) > time.time():
+                return False
+            local["probe"] = time.time() + self.recovery_timeout
+            return True
+
+    # --- API ---
+
+    def is_open(self, circuit):
+        """Le circuit est-il ouvert (sans consommer d'appel test) ?"""
+        status = self._read(circuit)
+        return (
+            status["state"] == OPEN
+            and time.time() - status["opened_at"] < self.recovery_timeout
+        )
+
+    def allow(self, circuit):
+        """Autoriser un appel ; en semi-ouvert, seul l'appel test passe"""
+        status = self._read(circuit)
+        if status["state"] == CLOSED:
+            return True
+        if (
+            status["state"] == OPEN
+            and time.time() - status["opened_at"] < self.recovery_timeout
+        ):
+            CIRCUIT_REJECTIONS.labels(circuit=metric_label(circuit)).inc()
+            return False
+        if self._claim_probe(circuit):
+            if status["state"] == OPEN:
+                self._set_state(circuit, HALF_OPEN)
+                logger.info(f"Disjoncteur {circuit} semi-ouvert: appel test")
+            return True
+        CIRCUIT_REJECTIONS.labels(circuit=metric_label(circuit)).inc()
+        return False
+
+    def check(self, circuit):
+        """Lever CircuitOpenError si l'appel n'est pas autorisé"""
+        if not self.allow(circuit):
+            raise CircuitOpenError(f"Disjoncteur {circuit} ouvert")
+
+    def record_success(self, circuit):
+        status = self._read(circuit)
+        if status["state"] != CLOSED or status["failures"]:
+            if status["state"] != CLOSED:
+                logger.info(f"Disjoncteur {circuit} refermé")
+            self._set_state(circuit, CLOSED)
+
+    def record_failure(self, circuit, exc=None, rendered=False):
+        """Compter un échec ; les erreurs qui ne mettent pas en cause l'amont sont ignorées"""
+        if exc is not None and not counts_as_failure(exc, rendered):
+            return
+        status = self._read(circuit)
+        if status["state"] == HALF_OPEN:
+            logger.warning(f"Disjoncteur {circuit} rouvert (appel test échoué)")
+            self._set_state(circuit, OPEN, opened_at=time.time())
+            return
+        failures = self._increment_failures(circuit)
+        if failures >= self.failure_threshold and status["state"] == CLOSED:
+            logger.warning(
+                f"Disjoncteur {circuit} ouvert après {failures} échecs consécutifs"
+            )
+            self._set_state(circuit, OPEN, opened_at=time.time())
+
+    def _increment_failures(self, circuit):
+        redis_conn = self._redis()
+        if redis_conn is not None:
+            try:
+                key = self._key(circuit)
+                pipe = redis_conn.pipeline()
+                pipe.hincrby(key, "failures", 1)
+                pipe.expire(key, self.ttl)
+                return int(pipe.execute()[0])
+            except Exception as e:
+                logger.warning(f"Erreur lors du comptage des échecs: {e}")
+        with self._lock:
+            local = self._local.setdefault(
+                circuit, {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+            )
+            local["failures"] += 1
+            return local["failures"]
+
+    def get_states(self):
+        """États des circuits non fermés {circuit: {"state", "failures", "retry_in"}}"""
+        circuits = set()
+        redis_conn = self._redis()
+        if redis_conn is not None:
+            try:
+                prefix = f"{self.KEY_PREFIX}:"
+                for key in redis_conn.scan_iter(match=f"{prefix}*", count=500):
+                    if not key.endswith(":probe"):
+                        circuits.add(key[len(prefix) :])
+            except Exception as e:
+                logger.warning(f"Erreur lors de la lecture des disjoncteurs: {e}")
+        with self._lock:
+            circuits.update(self._local)
+
+        states = {}
+        current = {}
+        for circuit in sorted(circuits):
+            status = self._read(circuit)
+            current[circuit] = status["state"]
+            if status["state"] == CLOSED:
+                continue
+            states[circuit] = {
+                "state": status["state"],
+                "failures": status["failures"],
+                "retry_in": max(
+                    0.0,
+                    round(status["opened_at"] + self.recovery_timeout - time.time(), 1),
+                ),
+            }
+        _export_states(current)
+        return states
+
+
+# Instance globale partagée par les services et les routes
+circuit_breakers = CircuitBreakerRegistry()
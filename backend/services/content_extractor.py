@@ -0,0 +1,163 @@
+"""
+Extraction du contenu textuel d'un élément de listing en un seul parcours
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+from services.html_parser import walk
+
+logger = logging.getLogger(__name__)
+
+# Fragments par ordre de priorité : (longueur minimale, séparateur de get_text, écarter le titre)
+CONTENT_CATEGORIES = (
+    (15, "", True),  # 1. Paragraphes principaux
+    (30, "\n", True),  # 2. Divs de contenu (classe)
+    (10, "", True),  # 3. Sous-titres et intertitres
+    (10, "", False),  # 4. Éléments de listes (ul, ol)
+    (20, "", True),  # 5. Spans avec contenu textuel
+    (50, "", True),  # 6. Sections
+    (30, "", True),  # 7. Articles imbriqués
+)
+DIV_CATEGORY = 1
+LIST_ITEM_CATEGORY = 3
+TAG_CATEGORIES = {
+    "p": 0,
+    "h2": 2,
+    "h3": 2,
+    "h4": 2,
+    "h5": 2,
+    "h6": 2,
+    "span": 4,
+    "section": 5,
+    "article": 6,
+}
+# Mots-clés de classe des divs de contenu
+CONTENT_CLASS_KEYWORDS = (
+    "content",
+    "text",
+    "body",
+    "article",
+    "post",
+    "entry",
+    "description",
+    "excerpt",
+    "summary",
+)
+
+
+class _Fragment:
+    """Élément candidat : plage de textes couverte et plus proche candidat englobant"""
+
+    __slots__ = ("category", "start", "end", "parent", "text", "accepted")
+
+    def __init__(self, category, start, parent):
+        self.category = category
+        self.start = start
+        self.end = start
+        self.parent = parent
+        self.text = ""
+        self.accepted = False
+
+    def inside_accepted(self):
+        """Texte forcément inclus dans celui d'un candidat englobant déjà retenu"""
+        separator = CONTENT_CATEGORIES[self.category][1]
+        single = self.end - self.start == 1
+        parent = self.parent
+        while parent is not None:
+            if parent.accepted and (
+                single or CONTENT_CATEGORIES[parent.category][1] == separator
+            ):
+                return True
+            parent = parent.parent
+        return False
+
+
+def _category(element, in_list):
+    name = element.name
+    if name == "div":
+        classes = element.get("class")
+        if not classes:
+            return None
+        value = (classes if isinstance(classes, str) else " ".join(classes)).lower()
+        if any(keyword in value for keyword in CONTENT_CLASS_KEYWORDS):
+            return DIV_CATEGORY
+        return None
+    if name == "li":
+        return LIST_ITEM_CATEGORY if in_list else None
+    return TAG_CATEGORIES.get(name)
+
+
+def _collect(element, clean):
+    """Candidats par catégorie, dans l'ordre du document, en un seul parcours"""
+    strings = []
+    # Pile des éléments ouverts : (fragment ou None, est une liste ul/ol)
+    open_elements = []
+    enclosing = None
+    list_depth = 0
+    found = [[] for _ in CONTENT_CATEGORIES]
+    for event, value in walk(element):
+        if event == "text":
+            value = value.strip()
+            if value:
+                strings.append(value)
+        elif event == "start":
+            category = _category(value, list_depth > 0)
+            is_list = value.name in ("ul", "ol")
+            list_depth += is_list
+            fragment = None
+            if category is not None:
+                fragment = _Fragment(category, len(strings), enclosing)
+                found[category].append(fragment)
+                enclosing = fragment
+            open_elements.append((fragment, is_list))
+        else:
+            fragment, is_list = open_elements.pop()
+            list_depth -= is_list
+            if fragment is not None:
+                fragment.end = len(strings)
+                separator = CONTENT_CATEGORIES[fragment.category][1]
+                fragment.text = clean(
+                    separator.join(strings[fragment.start : fragment.end])
+                )
+                enclosing = fragment.parent
+    return found
+
+
+def extract_content(element, title, clean):
+    """Contenu de `element` : fragments par priorité, sans doublons
+
+    `clean` normalise chaque fragment (ScrapingService._clean_text). Un
+    fragment déjà contenu dans un fragment retenu est écarté : d'abord par
+    la structure (candidat englobant retenu) ou un ensemble de textes, sinon
+    par une recherche de sous-chaîne dans les fragments retenus, concaténés
+    en UTF-8 (séparés par \\x00).
+    """
+    content_parts = []
+    accepted = set()
+    joined = bytearray()
+    for (min_length, _, skip_title), fragments in zip(
+        CONTENT_CATEGORIES, _collect(element, clean)
+    ):
+        for fragment in fragments:
+            txt = fragment.text
+            if not txt or len(txt) <= min_length or (skip_title and txt == title):
+                continue
+            # Éviter les doublons
+            if txt in accepted or fragment.inside_accepted():
+                continue
+            encoded = txt.encode("utf-8", errors="surrogatepass")
+            if b"\x00" in encoded:
+                if any(txt in existing for existing in content_parts):
+                    continue
+            elif encoded in joined:
+                continue
+            fragment.accepted = True
+            accepted.add(txt)
+            content_parts.append(txt)
+            joined += b"\x00" + encoded
+    return clean("\n\n".join(content_parts))
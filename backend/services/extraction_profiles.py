@@ -0,0 +1,108 @@
+"""
+Profils d'extraction appris par domaine : sélecteurs qui ont réellement produit des articles
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import time
+from database.redis_connector import redis_connector
+from services.selector_matcher import SelectorMatcher
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionProfiles:
+    """Sélecteurs de listing appris par domaine, partagés via Redis
+
+    Une page de listing essaie d'abord les sélecteurs qui ont produit des
+    articles lors des jobs précédents ; le scan complet n'est relancé que si
+    le rendement tombe sous `min_yield_ratio` du rendement appris. Les pages
+    d'articles gardent l'ordre de priorité fixe : le dernier sélecteur gagnant
+    n'y dit rien de la page suivante (un article sans h1 ferait prendre le
+    premier h2 pour titre à tous les autres).
+    """
+
+    LISTING_PREFIX = "extraction_profile:listing"
+    # Poids de la dernière page dans le rendement moyen
+    YIELD_ALPHA = 0.3
+
+    def __init__(self, cache=None, ttl=None, min_yield_ratio=None, enabled=None):
+        self.cache = cache or redis_connector
+        self.ttl = ttl or Config.SCRAPING_PROFILE_TTL
+        self.min_yield_ratio = (
+            Config.SCRAPING_PROFILE_MIN_YIELD_RATIO
+            if min_yield_ratio is None
+            else min_yield_ratio
+        )
+        self.enabled = (
+            Config.SCRAPING_EXTRACTION_PROFILES if enabled is None else enabled
+        )
+        self._matchers = {}
+
+    def _get(self, prefix, domain):
+        if not self.enabled or not domain:
+            return None
+        try:
+            return self.cache.get_cached_data(f"{prefix}:{domain.lower()}")
+        except Exception as e:
+            logger.warning(f"Lecture du profil d'extraction impossible ({domain}): {e}")
+            return None
+
+    def _set(self, prefix, domain, profile):
+        profile["updated_at"] = time.time()
+        try:
+            self.cache.set_cached_data(f"{prefix}:{domain.lower()}", profile, self.ttl)
+        except Exception as e:
+            logger.warning(
+                f"Écriture du profil d'extraction impossible ({domain}): {e}"
+            )
+
+    def listing(self, domain):
+        """Profil de listing du domaine : {"selectors", "yield"} ou None"""
+        profile = self._get(self.LISTING_PREFIX, domain)
+        if not profile or not profile.get("selectors"):
+            return None
+        return profile
+
+    def listing_matcher(self, profile):
+        """SelectorMatcher des seuls sélecteurs appris (compilé une fois)"""
+        selectors = tuple(profile["selectors"])
+        matcher = self._matchers.get(selectors)
+        if matcher is None:
+            matcher = SelectorMatcher(selectors)
+            self._matchers[selectors] = matcher
+        return matcher
+
+    def yield_dropped(self, profile, count, remaining):
+        """Vrai si les sélecteurs appris produisent nettement moins qu'attendu"""
+        expected = min(profile.get("yield", 0.0), remaining)
+        return count < max(1.0, expected * self.min_yield_ratio)
+
+    def record_listing(self, domain, produced, selectors, profile=None):
+        """Mémoriser les sélecteurs qui ont produit des articles sur une page
+
+        `produced` : {sélecteur: nombre d'articles} ; `selectors` : liste
+        complète, pour conserver l'ordre de priorité.
+        """
+        if not self.enabled or not domain or not produced:
+            return
+        count = sum(produced.values())
+        learned = [selector for selector in selectors if produced.get(selector)]
+        if profile is not None and set(learned) <= set(profile["selectors"]):
+            learned = profile["selectors"]
+            page_yield = profile.get("yield", count)
+            page_yield += self.YIELD_ALPHA * (count - page_yield)
+        else:
+            logger.info(f"Profil de listing appris pour {domain}: {learned}")
+            page_yield = count
+        self._set(
+            self.LISTING_PREFIX,
+            domain,
+            {"selectors": learned, "yield": round(page_yield, 2)},
+        )
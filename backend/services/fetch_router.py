@@ -0,0 +1,183 @@
+"""
+Routage d'une récupération HTML entre les méthodes (partagé sync / async)
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+from urllib.parse import urlparse
+from services.method_selector import html_quality
+from services.circuit_breaker import CircuitOpenError, domain_circuit
+from services.response_reader import ContentRejectedError
+from services.page_classifier import DYNAMIC, STATIC
+
+logger = logging.getLogger(__name__)
+
+# Méthodes qui exécutent le JavaScript de la page
+RENDER_METHODS = ("selenium", "playwright")
+
+# Statuts pour lesquels un navigateur peut réussir là où HTTP a échoué
+BLOCKING_STATUSES = (401, 403, 429, 503)
+
+# Marqueur : le serveur a confirmé (304) que le HTML en cache est à jour
+_NOT_MODIFIED = object()
+
+
+def http_status_of(exc):
+    """Statut HTTP porté par une exception requests/httpx (None sinon)"""
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+class FetchRouter:
+    """Décide quelle méthode essayer ensuite et quel HTML accepter
+
+    Usage (identique dans le moteur sync et le moteur async) :
+
+        router = FetchRouter(service, url, method_order)
+        cached = router.cached_result()
+        if cached:
+            return cached
+        for method in router:
+            try:
+                html = fetch(method)  # réponse HTTP : router.accept_response(...)
+            except Exception as e:
+                router.on_error(method, e, elapsed)
+                continue
+            result = router.on_html(method, html, elapsed)
+            if result:
+                return result
+        return router.finish()
+    """
+
+    def __init__(self, service, url, method_order=None):
+        self.service = service
+        self.url = url
+        self.domain = urlparse(url).netloc
+        self.methods, self.reason = service.method_selector.plan(
+            self.domain, method_order or service.DEFAULT_METHOD_ORDER
+        )
+        self.verdict = service.page_classifier.get_domain_verdict(self.domain)
+        if self.verdict == DYNAMIC:
+            render = [m for m in self.methods if m in RENDER_METHODS]
+            if render:
+                self.methods = render + [
+                    m for m in self.methods if m not in RENDER_METHODS
+                ]
+                self.reason += "; page dynamique, rendu navigateur d'abord"
+        self.last_exc = None
+        self.shell = None
+        self.breakers = service.breakers
+        self.circuit = domain_circuit(self.domain)
+        self.html_cache = service.html_cache
+        self.cache_entry = self.html_cache.lookup(url)
+        self._response_validators = {}
+
+    def cached_result(self):
+        """Résultat servi par le cache HTML s'il est encore frais (None sinon)"""
+        entry = self.cache_entry
+        if entry is None or not entry["fresh"]:
+            return None
+        logger.info(f"HTML servi depuis le cache pour {self.url}")
+        return {
+            "html": entry["html"],
+            "method": entry["method"],
+            "reason": "cache HTML",
+        }
+
+    def request_headers(self):
+        """En-têtes conditionnels pour revalider une entrée périmée"""
+        return self.html_cache.conditional_headers(self.cache_entry)
+
+    def accept_response(self, status_code, text, headers, method="requests"):
+        """Texte d'une réponse HTTP, ou le HTML en cache si le serveur répond 304"""
+        if status_code == 304 and self.cache_entry is not None:
+            self._response_validators[method] = _NOT_MODIFIED
+            return self.cache_entry["html"]
+        self._response_validators[method] = self.html_cache.validators(headers)
+        return text
+
+    def _remember(self, method, html):
+        validators = self._response_validators.pop(method, None)
+        if validators is _NOT_MODIFIED:
+            self.html_cache.mark_revalidated(self.url, self.cache_entry)
+            self.reason += "; cache revalidé (304)"
+        else:
+            self.html_cache.store(self.url, html, method, *(validators or (None, None)))
+
+    def __iter__(self):
+        for method in self.methods:
+            if self._should_skip(method):
+                continue
+            # Scrape.do passe par son propre disjoncteur (fournisseur)
+            if method != "scrapedo" and not self.breakers.allow(self.circuit):
+                logger.info(f"{method} refusé: disjoncteur {self.circuit} ouvert")
+                self.last_exc = CircuitOpenError(f"Disjoncteur {self.circuit} ouvert")
+                continue
+            yield method
+
+    def _should_skip(self, method):
+        # Contenu non HTML ou démesuré : aucune autre méthode n'y changera rien
+        if isinstance(self.last_exc, ContentRejectedError):
+            return True
+        if method in RENDER_METHODS:
+            # Page statique : un navigateur n'aide que face à un blocage
+            if self.verdict == STATIC and self.last_exc is not None:
+                if http_status_of(self.last_exc) not in BLOCKING_STATUSES:
+                    logger.info(f"{method} ignoré: page statique pour {self.domain}")
+                    return True
+            return False
+        # Coquille SPA déjà obtenue : les autres méthodes HTTP n'y changeront rien
+        return self.shell is not None
+
+    def on_error(self, method, exc, elapsed):
+        self._response_validators.pop(method, None)
+        if method != "scrapedo":
+            self.breakers.record_failure(
+                self.circuit, exc, rendered=method in RENDER_METHODS
+            )
+        self.service.method_selector.record(self.domain, method, False, elapsed)
+        logger.warning(f"Méthode {method} échouée: {exc}")
+        self.last_exc = exc
+
+    def on_html(self, method, html, elapsed):
+        """Retourner le résultat si le HTML est exploitable, sinon None"""
+        if method != "scrapedo":
+            self.breakers.record_success(self.circuit)
+        if method not in RENDER_METHODS:
+            classification = self.service.page_classifier.classify_and_remember(
+                self.domain, html
+            )
+            self.verdict = classification["verdict"]
+            if self.verdict == DYNAMIC and any(
+                m in RENDER_METHODS for m in self.methods
+            ):
+                self.service.method_selector.record(self.domain, method, False, elapsed)
+                self.shell = {
+                    "html": html,
+                    "method": method,
+                    "reason": self.reason + "; coquille SPA, rendu impossible",
+                }
+                self.reason += f"; coquille SPA via {method}"
+                self._response_validators.pop(method, None)
+                return None
+        self.service.method_selector.record(
+            self.domain, method, True, elapsed, html_quality(html)
+        )
+        self._remember(method, html)
+        logger.info(f"HTML récupéré via {method} ({self.reason})")
+        return {"html": html, "method": method, "reason": self.reason}
+
+    def finish(self):
+        """Aucune méthode n'a abouti : coquille SPA à défaut, sinon erreur"""
+        if self.shell is not None:
+            return self.shell
+        logger.error(
+            f"Toutes les méthodes de récupération HTML ont échoué pour {self.url}"
+        )
+        if self.last_exc is not None:
+            raise self.last_exc
+        raise Exception("Impossible de récupérer le HTML")
@@ -0,0 +1,171 @@
+"""
+Blocage de ressources et détection de fin de rendu pour les navigateurs headless
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import time
+from urllib.parse import urlparse
+from selenium.webdriver.support.ui import WebDriverWait
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+# Motifs d'URL utilisés côté Selenium (CDP ne filtre pas par type de ressource)
+RESOURCE_TYPE_PATTERNS = {
+    "image": [
+        "*.png",
+        "*.jpg",
+        "*.jpeg",
+        "*.gif",
+        "*.webp",
+        "*.avif",
+        "*.svg",
+        "*.ico",
+    ],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+    "stylesheet": ["*.css"],
+}
+
+
+def _split_setting(value):
+    return [item.strip().lower() for item in (value or "").split(",") if item.strip()]
+
+
+class HeadlessRenderPolicy:
+    """Ressources à bloquer et stratégie d'attente du rendu
+
+    Stratégies : "selectors" (retour dès qu'un sélecteur d'article est dans
+    le DOM, sans attente supplémentaire s'il n'apparaît pas) ou "legacy"
+    (networkidle pour Playwright, pause fixe de 2 s pour Selenium).
+    """
+
+    # Pause fixe historique après chargement Selenium : budget d'attente maximal
+    SELENIUM_PAUSE = 2
+
+    def __init__(
+        self,
+        ready_selectors,
+        blocked_resource_types=None,
+        blocked_hosts=None,
+        strategy=None,
+        render_timeout=None,
+    ):
+        self.ready_selector = ", ".join(ready_selectors)
+        self.blocked_resource_types = set(
+            blocked_resource_types
+            if blocked_resource_types is not None
+            else _split_setting(Config.SCRAPING_BLOCKED_RESOURCE_TYPES)
+        )
+        self.blocked_hosts = tuple(
+            blocked_hosts
+            if blocked_hosts is not None
+            else _split_setting(Config.SCRAPING_BLOCKED_HOSTS)
+        )
+        self.strategy = strategy or Config.SCRAPING_RENDER_STRATEGY
+        self.render_timeout = render_timeout or Config.SCRAPING_RENDER_TIMEOUT
+
+    def is_blocked_host(self, host):
+        host = (host or "").lower()
+        return any(
+            host == blocked or host.endswith("." + blocked)
+            for blocked in self.blocked_hosts
+        )
+
+    def should_block(self, resource_type, url):
+        if resource_type in self.blocked_resource_types:
+            return True
+        return self.is_blocked_host(urlparse(url).hostname)
+
+    # --- Playwright ---
+
+    def install_playwright_blocking(self, context):
+        """Intercepter les requêtes du contexte et abandonner les ressources inutiles"""
+        if not self.blocked_resource_types and not self.blocked_hosts:
+            return
+
+        def handle(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route("**/*", handle)
+
+    def goto_playwright(self, page, url, max_wait):
+        """Naviguer puis attendre la fin de rendu selon la stratégie
+
+        Avec "selectors", le DOM est rendu tel quel si aucun sélecteur
+        d'article n'apparaît dans le délai : pas d'attente networkidle en plus.
+        """
+        if self.strategy != "selectors":
+            page.goto(url, wait_until="networkidle")
+            return "networkidle"
+        page.goto(url, wait_until="domcontentloaded")
+        try:
+            page.wait_for_selector(
+                self.ready_selector,
+                state="attached",
+                timeout=min(self.render_timeout, max_wait) * 1000,
+            )
+            return "selectors"
+        except Exception:
+            # Aucun sélecteur d'article : le délai est écoulé, pas d'attente en plus
+            return "timeout"
+
+    # --- Selenium ---
+
+    def configure_selenium_options(self, chrome_options):
+        """Préférences Chrome : chargement 'eager' et images désactivées si bloquées"""
+        if self.strategy == "selectors":
+            chrome_options.page_load_strategy = "eager"
+        if "image" in self.blocked_resource_types:
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return chrome_options
+
+    def selenium_blocked_url_patterns(self):
+        patterns = []
+        for resource_type in sorted(self.blocked_resource_types):
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        for host in self.blocked_hosts:
+            patterns.append(f"*://{host}/*")
+            patterns.append(f"*.{host}/*")
+        return patterns
+
+    def install_selenium_blocking(self, driver):
+        """Bloquer les ressources via le protocole DevTools (appelé à la création du driver)"""
+        patterns = self.selenium_blocked_url_patterns()
+        if not patterns:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning(f"Blocage de ressources Selenium indisponible: {e}")
+
+    def wait_selenium(self, driver, max_wait):
+        """Attendre un sélecteur d'article, au plus la pause historique de 2 s"""
+        if self.strategy == "selectors":
+            timeout = min(self.render_timeout, max_wait, self.SELENIUM_PAUSE)
+            try:
+                WebDriverWait(driver, timeout).until(
+                    lambda d: d.execute_script(
+                        "return document.querySelector(arguments[0]) !== null",
+                        self.ready_selector,
+                    )
+                )
+                return "selectors"
+            except Exception:
+                return "timeout"
+        time.sleep(self.SELENIUM_PAUSE)
+        return "sleep"
@@ -0,0 +1,91 @@
+"""
+Requêtes couvertes (hedging) : délai de déclenchement et budget partagé
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import threading
+import time
+from database.redis_connector import redis_connector
+from services.scraping_metrics import HEDGE_EVENTS
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeCancelledError(Exception):
+    """Requête couverte non démarrée : un résultat a déjà été retenu"""
+
+
+class HedgePolicy:
+    """Quand lancer la méthode suivante en parallèle, et combien de fois
+
+    Le délai est le percentile (p90 par défaut) des latences réussies de la
+    méthode principale sur le domaine. Le budget horaire est partagé entre
+    workers via Redis pour ne pas consommer de crédits Scrape.do à chaque appel.
+    """
+
+    KEY_PREFIX = "hedge_budget"
+
+    def __init__(
+        self,
+        method_selector,
+        cache=None,
+        max_per_hour=None,
+        percentile=None,
+        default_delay=None,
+        min_delay=None,
+    ):
+        self.method_selector = method_selector
+        self.cache = cache or redis_connector
+        self.max_per_hour = (
+            Config.SCRAPING_HEDGE_MAX_PER_HOUR if max_per_hour is None else max_per_hour
+        )
+        self.percentile = percentile or Config.SCRAPING_HEDGE_PERCENTILE
+        self.default_delay = default_delay or Config.SCRAPING_HEDGE_DEFAULT_DELAY
+        self.min_delay = (
+            Config.SCRAPING_HEDGE_MIN_DELAY if min_delay is None else min_delay
+        )
+        self._local_hour = None
+        self._local_count = 0
+        self._lock = threading.Lock()
+
+    def delay(self, domain, method):
+        """Secondes à attendre la méthode principale avant de la couvrir"""
+        latency = self.method_selector.latency_percentile(
+            domain, method, self.percentile
+        )
+        if latency is None:
+            latency = self.default_delay
+        return max(self.min_delay, latency)
+
+    def try_acquire(self):
+        """Consommer une couverture du budget horaire (False si épuisé)"""
+        hour = int(time.time() // 3600)
+        count = None
+        try:
+            redis_conn = self.cache.get_connection()
+            if redis_conn is not None:
+                key = f"{self.KEY_PREFIX}:{hour}"
+                pipe = redis_conn.pipeline()
+                pipe.incr(key)
+                pipe.expire(key, 3600)
+                count = int(pipe.execute()[0])
+        except Exception as e:
+            logger.warning(f"Erreur lors de la lecture du budget de couverture: {e}")
+        if count is None:
+            with self._lock:
+                if self._local_hour != hour:
+                    self._local_hour, self._local_count = hour, 0
+                self._local_count += 1
+                count = self._local_count
+        if count > self.max_per_hour:
+            HEDGE_EVENTS.labels(result="budget_exhausted").inc()
+            return False
+        HEDGE_EVENTS.labels(result="launched").inc()
+        return True
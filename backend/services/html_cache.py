@@ -0,0 +1,215 @@
+"""
+Cache des réponses HTML brutes (Redis, repli disque) avec revalidation conditionnelle
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from database.redis_connector import redis_connector
+from services.scraping_metrics import HTML_CACHE_EVENTS
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Paramètres de suivi sans effet sur le contenu de la page
+TRACKING_PARAMS = ("fbclid", "gclid", "mc_cid", "mc_eid", "igshid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """URL canonique utilisée comme clé de cache"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class HtmlResponseCache:
+    """HTML compressé par URL normalisée, frais pendant `ttl` secondes
+
+    Les entrées expirées sont conservées `stale_ttl` secondes de plus pour
+    être revalidées (If-None-Match / If-Modified-Since) plutôt que
+    retéléchargées. Sans Redis, les entrées sont écrites sur disque.
+    """
+
+    KEY_PREFIX = "html_cache"
+
+    def __init__(
+        self,
+        cache=None,
+        ttl=None,
+        stale_ttl=None,
+        disk_dir=None,
+        disk_max_entries=None,
+        enabled=None,
+    ):
+        self.cache = cache or redis_connector
+        self.ttl = ttl or Config.SCRAPING_HTML_CACHE_TTL
+        self.stale_ttl = (
+            Config.SCRAPING_HTML_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        )
+        self.disk_dir = disk_dir or Config.SCRAPING_HTML_CACHE_DIR
+        self.disk_max_entries = (
+            disk_max_entries or Config.SCRAPING_HTML_CACHE_DISK_MAX_ENTRIES
+        )
+        self.enabled = (
+            Config.SCRAPING_HTML_CACHE_ENABLED if enabled is None else enabled
+        )
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+
+    def _key(self, url):
+        digest = hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    # --- Stockage ---
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key.split(":", 1)[1] + ".json")
+
+    def _read(self, key):
+        redis_conn = self.cache.get_connection()
+        if redis_conn is not None:
+            return self.cache.get_cached_data(key)
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache HTML illisible ({path}): {e}")
+            return None
+        if record.get("stored_at", 0) + self.ttl + self.stale_ttl < time.time():
+            self._remove(path)
+            return None
+        return record
+
+    def _write(self, key, record):
+        redis_conn = self.cache.get_connection()
+        if redis_conn is not None:
+            self.cache.set_cached_data(
+                key, record, expire_time=self.ttl + self.stale_ttl
+            )
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Écriture du cache HTML sur disque impossible: {e}")
+            return
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % 100 == 0
+        if prune:
+            self._prune_disk()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        """Supprimer les entrées disque les plus anciennes au-delà du plafond"""
+        try:
+            entries = [
+                os.path.join(self.disk_dir, name)
+                for name in os.listdir(self.disk_dir)
+                if name.endswith(".json")
+            ]
+            if len(entries) <= self.disk_max_entries:
+                return
+            entries.sort(key=os.path.getmtime)
+            for path in entries[: len(entries) - self.disk_max_entries]:
+                self._remove(path)
+        except OSError as e:
+            logger.warning(f"Nettoyage du cache HTML disque impossible: {e}")
+
+    # --- API ---
+
+    def lookup(self, url):
+        """Entrée en cache {"html", "method", "etag", "last_modified", "fresh"} ou None"""
+        if not self.enabled:
+            return None
+        record = self._read(self._key(url))
+        if not record:
+            HTML_CACHE_EVENTS.labels(result="miss").inc()
+            return None
+        try:
+            html = zlib.decompress(base64.b64decode(record["html"])).decode("utf-8")
+        except (KeyError, ValueError, zlib.error) as e:
+            logger.warning(f"Entrée de cache HTML corrompue pour {url}: {e}")
+            HTML_CACHE_EVENTS.labels(result="miss").inc()
+            return None
+        fresh = time.time() - record.get("stored_at", 0) < self.ttl
+        HTML_CACHE_EVENTS.labels(result="hit" if fresh else "stale").inc()
+        return {
+            "html": html,
+            "method": record.get("method"),
+            "etag": record.get("etag"),
+            "last_modified": record.get("last_modified"),
+            "fresh": fresh,
+        }
+
+    def store(self, url, html, method, etag=None, last_modified=None):
+        """Mettre en cache le HTML d'une URL avec ses validateurs HTTP"""
+        if not self.enabled or not html:
+            return
+        record = {
+            "html": base64.b64encode(zlib.compress(html.encode("utf-8"), 6)).decode(
+                "ascii"
+            ),
+            "method": method,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        try:
+            self._write(self._key(url), record)
+        except Exception as e:
+            logger.warning(f"Erreur lors de la mise en cache HTML de {url}: {e}")
+
+    def mark_revalidated(self, url, entry):
+        """Réponse 304 : l'entrée redevient fraische pour un nouveau TTL"""
+        HTML_CACHE_EVENTS.labels(result="revalidated").inc()
+        self.store(
+            url, entry["html"], entry["method"], entry["etag"], entry["last_modified"]
+        )
+
+    @staticmethod
+    def conditional_headers(entry):
+        """En-têtes If-None-Match / If-Modified-Since pour une entrée périmée"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def validators(response_headers):
+        """(etag, last_modified) d'une réponse requests/httpx"""
+        return response_headers.get("ETag"), response_headers.get("Last-Modified")
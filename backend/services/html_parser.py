@@ -0,0 +1,336 @@
+"""
+Moteurs d'analyse HTML interchangeables : lxml, selectolax (lexbor) ou BeautifulSoup
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import threading
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from config import Config
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Moteur selectolax indisponible sans le paquet
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+PARSER_ENGINES = ("lxml", "selectolax", "html.parser")
+
+# Textes ignorés par BeautifulSoup.get_text (scripts, styles, gabarits, ruby)
+SKIPPED_TEXT_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+
+# Attributs multi-valués : listes comme dans BeautifulSoup
+MULTI_VALUED_ATTRIBUTES = frozenset(("class", "rel", "rev", "headers", "accesskey"))
+
+_selectors = {}
+_selectors_lock = threading.Lock()
+_lxml_parser = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _css(selector):
+    """Sélecteur CSS lxml compilé une seule fois par processus"""
+    compiled = _selectors.get(selector)
+    if compiled is None:
+        compiled = CSSSelector(selector, translator="html")
+        with _selectors_lock:
+            _selectors[selector] = compiled
+    return compiled
+
+
+def _names(name):
+    if name is None:
+        return ()
+    return (name,) if isinstance(name, str) else tuple(name)
+
+
+def _class_matches(value, class_):
+    """Même règle que BeautifulSoup : chaque classe, puis l'attribut complet"""
+    if class_ is None:
+        return True
+    if value is None:
+        return bool(class_(None))
+    classes = value.split()
+    return any(class_(c) for c in classes) or bool(class_(" ".join(classes)))
+
+
+def _join_text(strings, separator, strip):
+    if strip:
+        strings = (s.strip() for s in strings)
+        return separator.join(s for s in strings if s)
+    return separator.join(strings)
+
+
+def _attribute(value, key, default):
+    if value is None:
+        return default
+    if key in MULTI_VALUED_ATTRIBUTES:
+        return value.split()
+    return value
+
+
+class _Node:
+    """Sous-ensemble de l'API Tag de BeautifulSoup utilisé par l'extraction"""
+
+    __slots__ = ("_node", "_include_self")
+
+    def __init__(self, node, include_self=False):
+        self._node = node
+        # Le document racine peut lui-même correspondre (comme BeautifulSoup)
+        self._include_self = include_self
+
+    def __bool__(self):
+        return True
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def find(self, name=None, class_=None):
+        return next(iter(self.find_all(name, class_=class_)), None)
+
+    def select_one(self, selector):
+        return next(iter(self.select(selector)), None)
+
+
+class LxmlNode(_Node):
+    """Élément lxml.html"""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, LxmlNode) and other._node is self._node
+
+    @property
+    def element(self):
+        """Élément lxml sous-jacent"""
+        return self._node
+
+    def __hash__(self):
+        return hash(self._node)
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def get(self, key, default=None):
+        return _attribute(self._node.get(key), key, default)
+
+    def select(self, selector):
+        return [
+            LxmlNode(element)
+            for element in _css(selector)(self._node)
+            if self._include_self or element is not self._node
+        ]
+
+    def find_all(self, name=None, class_=None):
+        tags = _names(name) or (etree.Element,)
+        return [
+            LxmlNode(element)
+            for element in self._node.iter(*tags)
+            if element is not self._node
+            and _class_matches(element.get("class"), class_)
+        ]
+
+    def _strings(self):
+        skipped = 0
+        for event, element in etree.iterwalk(self._node, events=("start", "end")):
+            is_tag = isinstance(element.tag, str)
+            if event == "start":
+                if is_tag and element.tag in SKIPPED_TEXT_TAGS:
+                    skipped += 1
+                elif is_tag and not skipped and element.text:
+                    yield element.text
+                continue
+            if is_tag and element.tag in SKIPPED_TEXT_TAGS:
+                skipped -= 1
+            if element is not self._node and not skipped and element.tail:
+                yield element.tail
+
+    def get_text(self, separator="", strip=False):
+        return _join_text(self._strings(), separator, strip)
+
+    def walk(self):
+        skipped = 0
+        for event, element in etree.iterwalk(self._node, events=("start", "end")):
+            is_tag = isinstance(element.tag, str)
+            if event == "start":
+                if not is_tag:
+                    continue
+                if element is not self._node:
+                    yield "start", LxmlNode(element)
+                if element.tag in SKIPPED_TEXT_TAGS:
+                    skipped += 1
+                elif not skipped and element.text:
+                    yield "text", element.text
+                continue
+            if is_tag:
+                if element.tag in SKIPPED_TEXT_TAGS:
+                    skipped -= 1
+                if element is not self._node:
+                    yield "end", None
+            if element is not self._node and not skipped and element.tail:
+                yield "text", element.tail
+
+
+class LexborNode(_Node):
+    """Nœud selectolax (moteur lexbor)"""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, LexborNode) and other._node.mem_id == self._node.mem_id
+
+    def __hash__(self):
+        return hash(self._node.mem_id)
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def get(self, key, default=None):
+        return _attribute(self._node.attributes.get(key), key, default)
+
+    def select(self, selector):
+        own_id = self._node.mem_id
+        return [
+            LexborNode(node)
+            for node in self._node.css(selector)
+            if self._include_self or node.mem_id != own_id
+        ]
+
+    def find_all(self, name=None, class_=None):
+        # Noms de balises exacts, comme BeautifulSoup (pas de sélecteur CSS)
+        names = _names(name)
+        own_id = self._node.mem_id
+        return [
+            LexborNode(node)
+            for node in self._node.traverse()
+            if node.mem_id != own_id
+            and (node.tag in names if names else not node.tag.startswith(("-", "_")))
+            and _class_matches(node.attributes.get("class"), class_)
+        ]
+
+    def _strings(self):
+        skipped = {
+            text.mem_id
+            for node in self._node.css(", ".join(SKIPPED_TEXT_TAGS))
+            for text in node.traverse(include_text=True)
+        }
+        for node in self._node.traverse(include_text=True):
+            if node.tag == "-text" and node.mem_id not in skipped:
+                yield node.text_content or ""
+
+    def get_text(self, separator="", strip=False):
+        return _join_text(self._strings(), separator, strip)
+
+    def walk(self):
+        stack = [(self._node.iter(include_text=True), False)]
+        while stack:
+            children, skipped = stack[-1]
+            node = next(children, None)
+            if node is None:
+                stack.pop()
+                if stack:
+                    yield "end", None
+                continue
+            tag = node.tag
+            if tag == "-text":
+                if not skipped:
+                    yield "text", node.text_content or ""
+            elif not tag.startswith(("-", "_", "!")):
+                yield "start", LexborNode(node)
+                stack.append(
+                    (node.iter(include_text=True), skipped or tag in SKIPPED_TEXT_TAGS)
+                )
+
+
+def _walk_soup(tag):
+    stack = [iter(tag.children)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            if stack:
+                yield "end", None
+        elif isinstance(child, Tag):
+            yield "start", child
+            stack.append(iter(child.children))
+        elif type(child) in (NavigableString, CData):
+            yield "text", str(child)
+
+
+def walk(element):
+    """Parcours unique en profondeur du sous-arbre de `element` (exclu)
+
+    Émet ("start", élément), ("end", None) et ("text", chaîne) dans l'ordre
+    du document ; les textes sont ceux que retiendrait get_text (scripts et
+    styles exclus).
+    """
+    if isinstance(element, _Node):
+        return element.walk()
+    return _walk_soup(element)
+
+
+def node_key(element):
+    """Identité d'un élément, stable entre deux recherches sur le même document"""
+    if isinstance(element, LxmlNode):
+        return element._node
+    if isinstance(element, LexborNode):
+        return element._node.mem_id
+    return id(element)
+
+
+def available_engines():
+    """Moteurs utilisables dans cet environnement"""
+    return tuple(
+        engine
+        for engine in PARSER_ENGINES
+        if engine != "selectolax" or LexborHTMLParser is not None
+    )
+
+
+def _parse_lxml(html):
+    if isinstance(html, str):
+        html = html.encode("utf-8", errors="replace")
+    return LxmlNode(
+        lxml_html.document_fromstring(html, parser=_lxml_parser), include_self=True
+    )
+
+
+def _parse_selectolax(html):
+    tree = LexborHTMLParser(html)
+    if tree.root is None:
+        raise ValueError("Document vide")
+    return LexborNode(tree.root, include_self=True)
+
+
+_PARSERS = {"lxml": _parse_lxml, "selectolax": _parse_selectolax}
+
+
+def parse_html(html, engine=None):
+    """Analyser `html` avec le moteur configuré (SCRAPING_PARSER_ENGINE)
+
+    Le document retourné offre select, select_one, find, find_all,
+    get_text et get comme BeautifulSoup. En cas d'échec (document vide,
+    moteur absent), BeautifulSoup + html.parser prend le relais.
+    """
+    engine = engine or Config.SCRAPING_PARSER_ENGINE
+    if engine == "selectolax" and LexborHTMLParser is None:
+        engine = "lxml"
+    parser = _PARSERS.get(engine)
+    if parser is not None and html:
+        try:
+            return parser(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"Analyse {engine} impossible, repli html.parser: {e}")
+    return BeautifulSoup(html or "", "html.parser")
@@ -0,0 +1,238 @@
+"""
+Gestionnaire de sessions HTTP persistantes par hôte
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+try:
+    import h2  # noqa: F401
+
+    HAS_HTTP2 = True
+except ImportError:  # HTTP/2 désactivé sans le paquet h2
+    HAS_HTTP2 = False
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENTS = ("requests", "httpx")
+
+
+class HttpxSession:
+    """Clients httpx d'un hôte exposant le sous-ensemble de requests.Session utilisé
+
+    En HTTP/2, les requêtes simultanées vers l'hôte partagent une seule
+    connexion. httpx annonce les encodages qu'il sait décoder (gzip, deflate,
+    br avec brotli, zstd avec zstandard). Le proxy étant fixé à la création
+    d'un client httpx, un client est créé par proxy.
+    """
+
+    def __init__(self, http2, pool_size, headers=None):
+        self.http2 = http2
+        self.pool_size = pool_size
+        self.headers = dict(headers or {})
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, proxy):
+        with self._lock:
+            client = self._clients.get(proxy)
+            if client is None:
+                client = httpx.Client(
+                    http2=self.http2,
+                    proxy=proxy,
+                    follow_redirects=True,
+                    headers=self.headers,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                )
+                self._clients[proxy] = client
+            return client
+
+    def request(self, method, url, stream=False, proxies=None, **kwargs):
+        proxy = (proxies or {}).get(urlparse(url).scheme)
+        client = self._client(proxy)
+        return client.send(client.build_request(method, url, **kwargs), stream=stream)
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+
+class HttpSessionManager:
+    """Maintient une session (keep-alive) par hôte cible
+
+    `client` choisit la bibliothèque : requests (HTTP/1.1) ou httpx (HTTP/2
+    si h2 est installé et `http2` activé).
+    """
+
+    def __init__(
+        self,
+        pool_size=None,
+        max_per_host=None,
+        keep_alive=None,
+        idle_timeout=None,
+        max_sessions=None,
+        client=None,
+        http2=None,
+    ):
+        self.pool_size = pool_size or Config.SCRAPING_POOL_SIZE
+        self.max_per_host = max_per_host or Config.SCRAPING_POOL_MAX_PER_HOST
+        self.keep_alive = (
+            Config.SCRAPING_KEEP_ALIVE if keep_alive is None else keep_alive
+        )
+        self.idle_timeout = idle_timeout or Config.SCRAPING_SESSION_IDLE_TIMEOUT
+        self.max_sessions = max_sessions or Config.SCRAPING_MAX_SESSIONS
+        self.client = client or Config.SCRAPING_HTTP_CLIENT
+        if self.client not in HTTP_CLIENTS:
+            raise ValueError(f"Client HTTP inconnu: {self.client}")
+        http2 = Config.SCRAPING_HTTP2 if http2 is None else http2
+        if http2 and not HAS_HTTP2:
+            logger.warning("Paquet h2 absent : HTTP/2 désactivé")
+        self.http2 = http2 and HAS_HTTP2
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _host_key(self, url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    def _create_session(self):
+        """Créer une session avec un pool de connexions dimensionné"""
+        if self.client == "httpx":
+            return HttpxSession(
+                self.http2,
+                max(self.pool_size, self.max_per_host),
+                headers=None if self.keep_alive else {"Connection": "close"},
+            )
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.pool_size, self.max_per_host),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _acquire_entry(self, url):
+        key = self._host_key(url)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle_locked(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = {
+                    "session": self._create_session(),
+                    "semaphore": threading.BoundedSemaphore(self.max_per_host),
+                    "in_flight": 0,
+                    "requests": 0,
+                    "last_used": now,
+                }
+                self._sessions[key] = entry
+                logger.debug(f"Nouvelle session HTTP pour {key}")
+            entry["in_flight"] += 1
+            entry["last_used"] = now
+        return entry
+
+    def _release_entry(self, entry):
+        with self._lock:
+            entry["in_flight"] -= 1
+            entry["requests"] += 1
+            entry["last_used"] = time.monotonic()
+
+    def _evict_idle_locked(self, now):
+        """Fermer les sessions inactives (appelé sous verrou)"""
+        idle_keys = [
+            key
+            for key, entry in self._sessions.items()
+            if entry["in_flight"] == 0 and now - entry["last_used"] > self.idle_timeout
+        ]
+        # Au-delà du nombre max de sessions, évincer les moins récemment utilisées
+        if len(self._sessions) - len(idle_keys) >= self.max_sessions:
+            candidates = sorted(
+                (
+                    (entry["last_used"], key)
+                    for key, entry in self._sessions.items()
+                    if entry["in_flight"] == 0 and key not in idle_keys
+                )
+            )
+            overflow = len(self._sessions) - len(idle_keys) - self.max_sessions + 1
+            idle_keys.extend(key for _, key in candidates[:overflow])
+        for key in idle_keys:
+            entry = self._sessions.pop(key)
+            try:
+                entry["session"].close()
+            except Exception as e:
+                logger.debug(f"Erreur lors de la fermeture de la session {key}: {e}")
+        if idle_keys:
+            logger.debug(f"{len(idle_keys)} session(s) HTTP inactive(s) fermée(s)")
+
+    def request(self, method, url, **kwargs):
+        """Exécuter une requête via la session de l'hôte (limite de connexions par hôte)"""
+        entry = self._acquire_entry(url)
+        try:
+            with entry["semaphore"]:
+                return entry["session"].request(method, url, **kwargs)
+        finally:
+            self._release_entry(entry)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method, url, **kwargs):
+        """Requête en streaming : la connexion reste réservée jusqu'à la sortie du bloc"""
+        entry = self._acquire_entry(url)
+        try:
+            with entry["semaphore"]:
+                response = entry["session"].request(method, url, stream=True, **kwargs)
+                try:
+                    yield response
+                finally:
+                    response.close()
+        finally:
+            self._release_entry(entry)
+
+    def close_all(self):
+        """Fermer toutes les sessions"""
+        with self._lock:
+            for entry in self._sessions.values():
+                try:
+                    entry["session"].close()
+                except Exception:
+                    pass
+            self._sessions.clear()
+
+    def get_stats(self):
+        """Statistiques des sessions ouvertes"""
+        with self._lock:
+            return {
+                "client": self.client,
+                "http2": self.http2,
+                "sessions": len(self._sessions),
+                "hosts": {
+                    key: {
+                        "in_flight": entry["in_flight"],
+                        "requests": entry["requests"],
+                    }
+                    for key, entry in self._sessions.items()
+                },
+            }
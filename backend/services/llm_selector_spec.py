@@ -0,0 +1,223 @@
+"""
+Sélecteurs de listing générés une fois par domaine par le LLM, puis rejoués sans LLM
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import json
+import logging
+import re
+from urllib.parse import urljoin
+from database.redis_connector import redis_connector
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Clés de la spécification : "item" est obligatoire, les autres sont relatives à l'item
+SPEC_FIELDS = ("item", "title", "link", "date", "content")
+
+_NOISE_RE = re.compile(
+    r"<(script|style|noscript|svg|template|iframe)\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+_HEAD_RE = re.compile(r"<head\b[^>]*>.*?</head\s*>", re.IGNORECASE | re.DOTALL)
+_WS_RE = re.compile(r"\s+")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+SPEC_PROMPT = """Voici le HTML (simplifié) d'une page de listing d'actualités : {url}
+---
+{html}
+---
+Donne les sélecteurs CSS permettant d'extraire les articles de cette page et de
+toutes les pages du même site. Réponds UNIQUEMENT avec un objet JSON :
+{{"item": "sélecteur d'un bloc d'article (un élément par article)",
+ "title": "sélecteur du titre, relatif au bloc",
+ "link": "sélecteur du lien vers l'article, relatif au bloc (null si le bloc est le lien)",
+ "date": "sélecteur de la date, relatif au bloc, ou null",
+ "content": "sélecteur du résumé/chapô, relatif au bloc, ou null"}}
+Pas de code, pas d'explication, pas de sélecteur dépendant d'un identifiant unique d'article."""
+
+
+class InvalidSpecError(ValueError):
+    """Spécification de sélecteurs inutilisable"""
+
+
+def compact_html(html, max_chars=None):
+    """HTML réduit pour le prompt : sans head, scripts, styles ni commentaires"""
+    max_chars = max_chars or Config.SCRAPING_LLM_SPEC_HTML_CHARS
+    html = _HEAD_RE.sub(" ", html or "")
+    html = _NOISE_RE.sub(" ", html)
+    return _WS_RE.sub(" ", html).strip()[:max_chars]
+
+
+def parse_spec(text):
+    """Objet JSON de la réponse du LLM (éventuellement entouré de ```json)"""
+    match = _JSON_OBJECT_RE.search(text or "")
+    if not match:
+        raise InvalidSpecError("Aucun objet JSON dans la réponse")
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        raise InvalidSpecError(f"JSON invalide: {e}")
+    if not isinstance(data, dict):
+        raise InvalidSpecError("La réponse n'est pas un objet JSON")
+    spec = {}
+    for field in SPEC_FIELDS:
+        value = data.get(field)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            spec[field] = None
+        elif isinstance(value, str):
+            spec[field] = value.strip()
+        else:
+            raise InvalidSpecError(f"Sélecteur « {field} » invalide: {value!r}")
+    if not spec["item"]:
+        raise InvalidSpecError("Sélecteur « item » manquant")
+    return spec
+
+
+def _select_one(element, selector):
+    return element.select_one(selector) if selector else None
+
+
+def apply_spec(soup, spec, page_url, clean, content_of=None):
+    """Candidats {title, url, content, date} désignés par la spécification
+
+    `content_of(élément, titre)` extrait le contenu quand la spécification
+    n'a pas de sélecteur de contenu (ou qu'il ne trouve rien). Lève
+    InvalidSpecError si un sélecteur est syntaxiquement invalide.
+    """
+    try:
+        items = soup.select(spec["item"])
+    except Exception as e:
+        raise InvalidSpecError(f"Sélecteur « item » invalide: {e}")
+    candidates = []
+    seen_titles = set()
+    for item in items:
+        try:
+            title_elem = _select_one(item, spec.get("title")) or item
+            link_elem = _select_one(item, spec.get("link"))
+            date_elem = _select_one(item, spec.get("date"))
+            content_elem = _select_one(item, spec.get("content"))
+        except Exception as e:
+            raise InvalidSpecError(f"Sélecteur relatif invalide: {e}")
+        title = clean(title_elem.get_text(strip=True))
+        if len(title) < 10 or title.lower() in seen_titles:
+            continue
+        seen_titles.add(title.lower())
+        if link_elem is None:
+            link_elem = item if item.name == "a" else item.find("a")
+        href = link_elem.get("href") if link_elem is not None else None
+        content = ""
+        if content_elem is not None:
+            content = clean(content_elem.get_text(" ", strip=True))
+        if not content and content_of is not None:
+            content = content_of(item, title)
+        candidates.append(
+            {
+                "title": title,
+                "url": urljoin(page_url, str(href)) if href else page_url,
+                "content": content,
+                "date": clean(date_elem.get_text(strip=True)) if date_elem else "",
+            }
+        )
+    return candidates
+
+
+class LlmSelectorSpecs:
+    """Spécification de sélecteurs par domaine : demandée au LLM, validée, rejouée
+
+    Le LLM n'est interrogé que si aucune spécification stockée ne produit au
+    moins `min_items` articles sur la page. Après une génération invalide, le
+    domaine n'est pas redemandé avant `retry_ttl` secondes.
+    """
+
+    KEY_PREFIX = "llm_selector_spec"
+    FAILURE_PREFIX = "llm_selector_spec_failed"
+
+    def __init__(self, cache=None, llm=None, ttl=None, retry_ttl=None, min_items=None):
+        self.cache = cache or redis_connector
+        self._llm = llm
+        self.ttl = ttl or Config.SCRAPING_LLM_SPEC_TTL
+        self.retry_ttl = retry_ttl or Config.SCRAPING_LLM_SPEC_RETRY_TTL
+        self.min_items = min_items or Config.SCRAPING_LLM_SPEC_MIN_ITEMS
+        self.llm_calls = 0
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from langchain_groq import ChatGroq
+
+            self._llm = ChatGroq(model=Config.SCRAPING_LLM_SPEC_MODEL, temperature=0.0)
+        return self._llm
+
+    def get(self, domain):
+        return self.cache.get_cached_data(f"{self.KEY_PREFIX}:{domain}")
+
+    def store(self, domain, spec):
+        self.cache.set_cached_data(f"{self.KEY_PREFIX}:{domain}", spec, self.ttl)
+
+    def invalidate(self, domain):
+        self.cache.delete_cached_data(f"{self.KEY_PREFIX}:{domain}")
+
+    def _validate(self, soup, spec, page_url, clean, content_of):
+        """Candidats de la page si la spécification en produit assez, sinon None"""
+        try:
+            candidates = apply_spec(soup, spec, page_url, clean, content_of)
+        except InvalidSpecError as e:
+            logger.info(f"Spécification de sélecteurs invalide: {e}")
+            return None
+        with_url = [c for c in candidates if c["url"] and c["url"] != page_url]
+        if len(with_url) < self.min_items:
+            logger.info(
+                f"Spécification de sélecteurs insuffisante: {len(with_url)} article(s)"
+            )
+            return None
+        return candidates
+
+    def generate(self, html, page_url):
+        """Demander une spécification au LLM (un appel)"""
+        self.llm_calls += 1
+        response = self.llm.invoke(
+            SPEC_PROMPT.format(url=page_url, html=compact_html(html))
+        )
+        return parse_spec(getattr(response, "content", None) or str(response))
+
+    def candidates(
+        self, domain, soup, html, page_url, clean, content_of=None, generate=True
+    ):
+        """Candidats de la page via la spécification du domaine ([] si aucune valide)
+
+        La spécification stockée est rejouée avec le parseur habituel ; le LLM
+        n'est appelé que si elle est absente ou ne valide plus sur la page, et
+        seulement si `generate` (première page d'un job).
+        """
+        spec = self.get(domain)
+        if spec:
+            candidates = self._validate(soup, spec, page_url, clean, content_of)
+            if candidates is not None:
+                return candidates
+            if not generate:
+                return []
+            logger.info(f"Spécification de {domain} périmée, nouvelle génération")
+            self.invalidate(domain)
+        if not generate or (not Config.HAS_GROQ and self._llm is None):
+            return []
+        failure_key = f"{self.FAILURE_PREFIX}:{domain}"
+        if self.cache.get_cached_data(failure_key):
+            return []
+        try:
+            spec = self.generate(html, page_url)
+            candidates = self._validate(soup, spec, page_url, clean, content_of)
+        except Exception as e:
+            logger.warning(f"Génération de sélecteurs par le LLM impossible: {e}")
+            candidates = None
+        if candidates is None:
+            self.cache.set_cached_data(failure_key, True, self.retry_ttl)
+            return []
+        logger.info(f"Spécification de sélecteurs apprise pour {domain}: {spec}")
+        self.store(domain, spec)
+        return candidates
@@ -0,0 +1,213 @@
+"""
+Sélection adaptative de la méthode de récupération par domaine
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import math
+import random
+import threading
+from collections import deque
+from database.redis_connector import redis_connector
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def html_quality(html):
+    """Score 0..1 de contenu exploitable (comptage rapide de balises de contenu)"""
+    if not html:
+        return 0.0
+    lowered = html.lower()
+    markers = lowered.count("<p") + lowered.count("<h2") + lowered.count("<article")
+    return min(1.0, markers / 20.0)
+
+
+class FetchMethodSelector:
+    """Enregistre succès, latence et qualité par (domaine, méthode) et réordonne
+
+    Les compteurs sont partagés entre workers via Redis (repli en mémoire) et
+    divisés par deux au-delà de la fenêtre pour privilégier les mesures récentes.
+    """
+
+    KEY_PREFIX = "fetch_method_stats"
+    LATENCY_PREFIX = "fetch_method_latency"
+
+    def __init__(
+        self,
+        cache=None,
+        min_samples=None,
+        skip_threshold=None,
+        exploration_rate=None,
+        window=None,
+        ttl=None,
+        latency_samples=None,
+    ):
+        self.cache = cache or redis_connector
+        self.min_samples = min_samples or Config.SCRAPING_METHOD_MIN_SAMPLES
+        self.skip_threshold = (
+            Config.SCRAPING_METHOD_SKIP_THRESHOLD
+            if skip_threshold is None
+            else skip_threshold
+        )
+        self.exploration_rate = (
+            Config.SCRAPING_METHOD_EXPLORATION_RATE
+            if exploration_rate is None
+            else exploration_rate
+        )
+        self.window = window or Config.SCRAPING_METHOD_STATS_WINDOW
+        self.ttl = ttl or Config.SCRAPING_METHOD_STATS_TTL
+        self.latency_samples = latency_samples or Config.SCRAPING_METHOD_LATENCY_SAMPLES
+        self._local_stats = {}
+        self._local_latencies = {}
+        self._lock = threading.Lock()
+
+    def _key(self, domain, method):
+        return f"{self.KEY_PREFIX}:{domain}:{method}"
+
+    def _latency_key(self, domain, method):
+        return f"{self.LATENCY_PREFIX}:{domain}:{method}"
+
+    def record(self, domain, method, success, latency, quality=0.0):
+        """Enregistrer le résultat d'une tentative"""
+        key = self._key(domain, method)
+        latency_key = self._latency_key(domain, method)
+        increments = {
+            "attempts": 1,
+            "successes": 1 if success else 0,
+            "latency_total": latency,
+            "quality_total": quality if success else 0.0,
+        }
+        try:
+            redis_conn = self.cache.get_connection()
+            if redis_conn is not None:
+                pipe = redis_conn.pipeline()
+                for field, value in increments.items():
+                    pipe.hincrbyfloat(key, field, value)
+                pipe.expire(key, self.ttl)
+                if success:
+                    # Latences récentes des réponses réussies (percentiles)
+                    pipe.lpush(latency_key, round(latency, 3))
+                    pipe.ltrim(latency_key, 0, self.latency_samples - 1)
+                    pipe.expire(latency_key, self.ttl)
+                attempts = pipe.execute()[0]
+                if float(attempts) > self.window:
+                    self._decay(redis_conn, key)
+                return
+        except Exception as e:
+            logger.warning(f"Erreur lors de l'enregistrement des stats de méthode: {e}")
+
+        with self._lock:
+            stats = self._local_stats.setdefault(key, dict.fromkeys(increments, 0.0))
+            for field, value in increments.items():
+                stats[field] += value
+            if stats["attempts"] > self.window:
+                for field in stats:
+                    stats[field] /= 2
+            if success:
+                self._local_latencies.setdefault(
+                    latency_key, deque(maxlen=self.latency_samples)
+                ).appendleft(latency)
+
+    def _decay(self, redis_conn, key):
+        stats = redis_conn.hgetall(key)
+        if stats:
+            redis_conn.hset(
+                key, mapping={field: float(v) / 2 for field, v in stats.items()}
+            )
+
+    def get_stats(self, domain, method):
+        """Statistiques agrégées d'une méthode sur un domaine (None si inconnue)"""
+        key = self._key(domain, method)
+        raw = None
+        try:
+            redis_conn = self.cache.get_connection()
+            if redis_conn is not None:
+                raw = redis_conn.hgetall(key)
+        except Exception as e:
+            logger.warning(f"Erreur lors de la lecture des stats de méthode: {e}")
+        if raw is None:
+            with self._lock:
+                raw = dict(self._local_stats.get(key, {}))
+        if not raw:
+            return None
+        attempts = float(raw.get("attempts", 0))
+        if attempts <= 0:
+            return None
+        successes = float(raw.get("successes", 0))
+        return {
+            "attempts": attempts,
+            "success_rate": successes / attempts,
+            "avg_latency": float(raw.get("latency_total", 0)) / attempts,
+            "avg_quality": (
+                float(raw.get("quality_total", 0)) / successes if successes else 0.0
+            ),
+        }
+
+    def latency_percentile(self, domain, method, percentile=0.9):
+        """Percentile des latences récentes réussies (None si trop peu de mesures)"""
+        key = self._latency_key(domain, method)
+        samples = None
+        try:
+            redis_conn = self.cache.get_connection()
+            if redis_conn is not None:
+                samples = [float(v) for v in redis_conn.lrange(key, 0, -1)]
+        except Exception as e:
+            logger.warning(f"Erreur lors de la lecture des latences: {e}")
+        if samples is None:
+            with self._lock:
+                samples = list(self._local_latencies.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        samples.sort()
+        index = max(0, math.ceil(percentile * len(samples)) - 1)
+        return samples[index]
+
+    def _score(self, stats):
+        return (
+            stats["success_rate"]
+            * (0.5 + 0.5 * stats["avg_quality"])
+            / (1.0 + stats["avg_latency"] / 10.0)
+        )
+
+    def plan(self, domain, method_order):
+        """Retourner (ordre des méthodes, raison du choix)"""
+        method_order = list(dict.fromkeys(method_order))
+        if random.random() < self.exploration_rate:
+            return method_order, "exploration (ordre demandé)"
+
+        known = {}
+        for method in method_order:
+            stats = self.get_stats(domain, method)
+            if stats and stats["attempts"] >= self.min_samples:
+                known[method] = stats
+
+        # Méthodes qui échouent presque toujours : reléguées en dernier recours
+        relegated = [
+            m
+            for m in method_order
+            if m in known and known[m]["success_rate"] < self.skip_threshold
+        ]
+        healthy = [m for m in method_order if m not in relegated]
+
+        reasons = []
+        scored = [m for m in healthy if m in known]
+        if scored:
+            best = max(scored, key=lambda m: self._score(known[m]))
+            if best != healthy[0]:
+                healthy.remove(best)
+                healthy.insert(0, best)
+                stats = known[best]
+                reasons.append(
+                    f"{best} en tête (succès {stats['success_rate']:.0%}, "
+                    f"{stats['avg_latency']:.1f}s)"
+                )
+        if relegated:
+            reasons.append(f"{', '.join(relegated)} relégué(s) (échecs répétés)")
+
+        return healthy + relegated, "; ".join(reasons) or "ordre demandé"
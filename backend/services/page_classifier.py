@@ -0,0 +1,109 @@
+"""
+Classification statique / dynamique des pages avant rendu navigateur
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import re
+from database.redis_connector import redis_connector
+from services.structured_data import has_article_records
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+STATIC = "static"
+DYNAMIC = "dynamic"
+
+_SCRIPT_STYLE_RE = re.compile(
+    r"<(script|style|noscript|template)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# Conteneurs racines vides typiques des applications monopages
+_EMPTY_ROOT_RE = re.compile(
+    r"<(div|main)\s[^>]*id=[\"'](root|app|__next|__nuxt|svelte|q-app)[\"'][^>]*>\s*</\1>"
+    r"|<app-root[^>]*>\s*</app-root>",
+    re.IGNORECASE,
+)
+_NOSCRIPT_JS_RE = re.compile(
+    r"<noscript[^>]*>[^<]*(enable javascript|activer javascript|activez javascript"
+    r"|requires javascript|javascript is required)",
+    re.IGNORECASE,
+)
+
+
+class PageClassifier:
+    """Décide si un HTML récupéré sans navigateur est complet ou une coquille SPA
+
+    Le verdict est mis en cache par domaine pour router les requêtes suivantes
+    directement vers la bonne méthode.
+    """
+
+    KEY_PREFIX = "page_class"
+
+    def __init__(self, cache=None, ttl=None, min_text_length=None):
+        self.cache = cache or redis_connector
+        self.ttl = ttl or Config.SCRAPING_CLASSIFIER_TTL
+        self.min_text_length = min_text_length or Config.SCRAPING_MIN_STATIC_TEXT
+
+    def classify(self, html):
+        """Retourner {"verdict", "text_length", "reasons"}"""
+        reasons = []
+        html = html or ""
+        text = _WS_RE.sub(" ", _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", html)))
+        text_length = len(text.strip())
+        lowered = html.lower()
+        script_count = lowered.count("<script")
+        content_markers = lowered.count("<p") + lowered.count("<article")
+
+        if _EMPTY_ROOT_RE.search(html):
+            reasons.append("conteneur racine SPA vide")
+        if _NOSCRIPT_JS_RE.search(html):
+            reasons.append("noscript exige JavaScript")
+        if text_length < self.min_text_length:
+            reasons.append(f"peu de texte ({text_length} caractères)")
+            if script_count > 5:
+                reasons.append(f"{script_count} scripts")
+            if content_markers == 0:
+                reasons.append("aucun paragraphe")
+
+        # Une page avec assez de texte est exploitable, même rendue par un framework
+        dynamic = text_length < self.min_text_length and len(reasons) > 1
+        # Coquille SPA livrant ses articles en JSON (__NEXT_DATA__, JSON-LD) : pas de rendu
+        if dynamic and Config.SCRAPING_STRUCTURED_DATA and has_article_records(html):
+            reasons.append("articles en données structurées")
+            dynamic = False
+        return {
+            "verdict": DYNAMIC if dynamic else STATIC,
+            "text_length": text_length,
+            "reasons": reasons,
+        }
+
+    def get_domain_verdict(self, domain):
+        """Verdict en cache pour le domaine (None si inconnu ou expiré)"""
+        cached = self.cache.get_cached_data(f"{self.KEY_PREFIX}:{domain}")
+        return cached.get("verdict") if isinstance(cached, dict) else None
+
+    def set_domain_verdict(self, domain, classification):
+        self.cache.set_cached_data(
+            f"{self.KEY_PREFIX}:{domain}",
+            {
+                "verdict": classification["verdict"],
+                "reasons": classification["reasons"],
+            },
+            expire_time=self.ttl,
+        )
+
+    def classify_and_remember(self, domain, html):
+        classification = self.classify(html)
+        self.set_domain_verdict(domain, classification)
+        if classification["verdict"] == DYNAMIC:
+            logger.info(
+                f"Page dynamique détectée pour {domain}: {', '.join(classification['reasons'])}"
+            )
+        return classification
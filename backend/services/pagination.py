@@ -0,0 +1,147 @@
+"""
+Pagination pipelinée : pré-analyse du lien suivant et préchargement des pages
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+_LINK_TAG_RE = re.compile(r"<(?:a|link)\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.IGNORECASE
+)
+
+# Numéro de page dans l'URL : ?page=N (et variantes) ou /page/N/
+_PAGE_NUMBER_PATTERNS = (
+    re.compile(r"([?&](?:page|p|paged|pg)=)(\d+)", re.IGNORECASE),
+    re.compile(r"(/page/)(\d+)", re.IGNORECASE),
+)
+
+
+def _attributes(tag):
+    return {
+        match.group(1).lower(): unescape(
+            match.group(2) or match.group(3) or match.group(4) or ""
+        )
+        for match in _ATTR_RE.finditer(tag)
+    }
+
+
+def prescan_next_page_url(html, base_url):
+    """Lien « page suivante » trouvé par expression régulière, sans parser le DOM
+
+    Même priorité que ScrapingService.find_next_page_url (rel="next", puis
+    classe "next", puis aria-label / title) ; le résultat n'est qu'une
+    prédiction, confirmée après le parsing de la page.
+    """
+    candidates = {}
+    for match in _LINK_TAG_RE.finditer(html or ""):
+        attrs = _attributes(match.group(0))
+        href = attrs.get("href")
+        if not href:
+            continue
+        if "next" in attrs.get("rel", "").lower().split():
+            rank = 0
+        elif "next" in attrs.get("class", "").split():
+            rank = 1
+        elif "next" in attrs.get("aria-label", "") or "next" in attrs.get("title", ""):
+            rank = 2
+        else:
+            continue
+        candidates.setdefault(rank, href)
+        if rank == 0:
+            break
+    if not candidates:
+        return None
+    return urljoin(base_url, candidates[min(candidates)])
+
+
+def speculative_page_urls(current_url, next_url, count):
+    """Pages suivantes déduites d'un motif évident (?page=N, /page/N/)"""
+    if count <= 0:
+        return []
+    for pattern in _PAGE_NUMBER_PATTERNS:
+        next_match = pattern.search(next_url)
+        if not next_match:
+            continue
+        next_number = int(next_match.group(2))
+        current_match = pattern.search(current_url)
+        current_number = int(current_match.group(2)) if current_match else 1
+        if next_number != current_number + 1:
+            continue
+        prefix = next_url[: next_match.start(2)]
+        suffix = next_url[next_match.end(2) :]
+        if current_match and current_url != f"{prefix}{current_number}{suffix}":
+            # Autre chose que le numéro change d'une page à l'autre
+            continue
+        return [
+            f"{prefix}{number}{suffix}"
+            for number in range(next_number + 1, next_number + 1 + count)
+        ]
+    return []
+
+
+class PrefetchCancelled(Exception):
+    """Préchargement abandonné : le job est terminé"""
+
+
+class PagePrefetcher:
+    """Récupère en arrière-plan les pages probablement demandées ensuite
+
+    get(url) retourne le résultat préchargé s'il existe, sinon récupère la
+    page directement. Chaque préchargement attend d'abord son créneau
+    (`wait`) puis vérifie que le job n'est pas terminé : close() annule
+    ainsi aussi les tâches déjà lancées qui n'ont pas encore requêté.
+    """
+
+    def __init__(self, fetch, max_workers, wait=None):
+        self.fetch = fetch
+        self.wait = wait
+        self.cancelled = threading.Event()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self.futures = {}
+
+    def _prefetch_one(self, url):
+        if not self.cancelled.is_set() and self.wait is not None:
+            self.wait(url)
+        if self.cancelled.is_set():
+            raise PrefetchCancelled(f"Préchargement annulé: {url}")
+        return self.fetch(url)
+
+    def prefetch(self, urls):
+        for url in urls:
+            if url not in self.futures:
+                logger.debug(f"Préchargement de {url}")
+                self.futures[url] = self.executor.submit(self._prefetch_one, url)
+
+    def get(self, url):
+        future = self.futures.pop(url, None)
+        if future is None:
+            return self.fetch(url)
+        return future.result()
+
+    def close(self):
+        self.cancelled.set()
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,280 @@
+"""
+Pool de navigateurs Playwright persistants
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from playwright.sync_api import sync_playwright
+from config import Config
+
+try:
+    import psutil
+except ImportError:  # Recyclage par mémoire désactivé sans psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolBusyError(Exception):
+    """Plus aucun créneau de page disponible dans le pool"""
+
+
+class _BrowserWorker(threading.Thread):
+    """Thread propriétaire d'un Chromium (l'API sync Playwright est liée à son thread)"""
+
+    # Sérialise les démarrages pour identifier le processus driver de chaque worker
+    _startup_lock = threading.Lock()
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"playwright-browser-{index}", daemon=True)
+        self.pool = pool
+        self.playwright = None
+        self.browser = None
+        self.driver_process = None
+        self.pages_served = 0
+        self.browsers_launched = 0
+
+    def _start_playwright(self):
+        with self._startup_lock:
+            before = self._child_pids()
+            self.playwright = sync_playwright().start()
+            new_pids = self._child_pids() - before
+        if psutil and len(new_pids) == 1:
+            self.driver_process = psutil.Process(new_pids.pop())
+
+    def _child_pids(self):
+        if not psutil:
+            return set()
+        return {child.pid for child in psutil.Process().children()}
+
+    def _launch_browser(self):
+        self.browser = self.playwright.chromium.launch(
+            headless=True, **self.pool.launch_options
+        )
+        self.pages_served = 0
+        self.browsers_launched += 1
+
+    def _close_browser(self):
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception as e:
+                logger.warning(f"Erreur lors de la fermeture du navigateur: {e}")
+            self.browser = None
+
+    def memory_mb(self):
+        """RSS du driver Playwright et de ses Chromium (Mo)"""
+        if self.driver_process is None:
+            return None
+        try:
+            processes = [self.driver_process] + self.driver_process.children(
+                recursive=True
+            )
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except psutil.Error:
+                    continue
+            return rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def _needs_recycling(self):
+        if self.pages_served >= self.pool.max_pages_per_browser:
+            return f"{self.pages_served} pages servies"
+        memory = self.memory_mb()
+        if memory is not None and memory > self.pool.max_memory_mb:
+            return f"mémoire {memory:.0f} Mo"
+        return None
+
+    def run(self):
+        try:
+            self._start_playwright()
+        except Exception as e:
+            logger.error(f"Impossible de démarrer Playwright: {e}")
+            self.pool._worker_failed(self, e)
+            return
+        self.pool._worker_started()
+
+        while True:
+            item = self.pool._jobs.get()
+            if item is None:
+                break
+            job, context_options, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            context = None
+            try:
+                if self.browser is None or not self.browser.is_connected():
+                    self._launch_browser()
+                # Contexte neuf par requête : cookies et cache isolés
+                context = self.browser.new_context(**context_options)
+                future.set_result(job(context))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                if context is not None:
+                    try:
+                        context.close()
+                    except Exception:
+                        pass
+                self.pages_served += 1
+                reason = self._needs_recycling()
+                if reason:
+                    logger.info(f"Recyclage du navigateur {self.name} ({reason})")
+                    self._close_browser()
+
+        self._close_browser()
+        try:
+            self.playwright.stop()
+        except Exception:
+            pass
+
+
+class PlaywrightBrowserPool:
+    """Garde N Chromium chauds et distribue un contexte neuf par requête
+
+    Un créneau de page n'est rendu qu'à la fin réelle du travail, même si
+    l'appelant a cessé d'attendre. Un worker dont Playwright ne démarre pas
+    n'est relancé qu'après un délai, doublé à chaque échec consécutif.
+    """
+
+    def __init__(
+        self,
+        size=None,
+        max_pages_per_browser=None,
+        max_memory_mb=None,
+        max_concurrent_pages=None,
+        launch_options=None,
+        respawn_delay=None,
+        max_respawn_delay=None,
+    ):
+        self.size = size or Config.SCRAPING_PLAYWRIGHT_POOL_SIZE
+        self.max_pages_per_browser = (
+            max_pages_per_browser or Config.SCRAPING_PLAYWRIGHT_MAX_PAGES_PER_BROWSER
+        )
+        self.max_memory_mb = max_memory_mb or Config.SCRAPING_PLAYWRIGHT_MAX_MEMORY_MB
+        self.max_concurrent_pages = (
+            max_concurrent_pages or Config.SCRAPING_PLAYWRIGHT_MAX_CONCURRENT_PAGES
+        )
+        self.launch_options = launch_options or {}
+        self.respawn_delay = respawn_delay or Config.SCRAPING_PLAYWRIGHT_RESPAWN_DELAY
+        self.max_respawn_delay = (
+            max_respawn_delay or Config.SCRAPING_PLAYWRIGHT_RESPAWN_MAX_DELAY
+        )
+        self._failures = 0
+        self._last_error = None
+        self._next_spawn = 0.0
+        self._jobs = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_pages)
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pool Playwright arrêté")
+            self._workers = [w for w in self._workers if w.is_alive()]
+            if len(self._workers) < self.size and time.time() >= self._next_spawn:
+                while len(self._workers) < self.size:
+                    worker = _BrowserWorker(self, len(self._workers))
+                    worker.start()
+                    self._workers.append(worker)
+            if not self._workers:
+                raise RuntimeError(
+                    f"Playwright indisponible, nouvel essai dans "
+                    f"{self._next_spawn - time.time():.0f}s: {self._last_error}"
+                )
+
+    def _worker_started(self):
+        with self._lock:
+            self._failures = 0
+
+    def _worker_failed(self, worker, error):
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            delay = min(
+                self.respawn_delay * 2 ** (self._failures - 1), self.max_respawn_delay
+            )
+            self._next_spawn = time.time() + delay
+        # Faire échouer les travaux en attente plutôt que de les laisser bloqués
+        while True:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[2].set_running_or_notify_cancel():
+                item[2].set_exception(error)
+
+    def has_free_slot(self):
+        """Vrai si un emprunt n'attendrait pas (indication, rien n'est réservé)"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        self._slots.release()
+        return True
+
+    def run(self, job, context_options=None, timeout=None):
+        """Exécuter job(context) dans un contexte neuf d'un navigateur du pool"""
+        timeout = timeout or Config.SCRAPING_PLAYWRIGHT_QUEUE_TIMEOUT
+        if not self._slots.acquire(timeout=timeout):
+            raise BrowserPoolBusyError(
+                f"{self.max_concurrent_pages} pages Playwright déjà en cours"
+            )
+        try:
+            self._ensure_started()
+        except Exception:
+            self._slots.release()
+            raise
+        future = Future()
+        # Créneau rendu à la fin réelle du travail (ou à son annulation en file)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._jobs.put((job, context_options or {}, future))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Ne pas exécuter plus tard un travail dont personne n'attend le résultat
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        """Fermer tous les navigateurs"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+
+    def get_stats(self):
+        """Statistiques du pool"""
+        return {
+            "size": self.size,
+            "queued": self._jobs.qsize(),
+            "browsers": [
+                {
+                    "name": worker.name,
+                    "alive": worker.is_alive(),
+                    "pages_served": worker.pages_served,
+                    "browsers_launched": worker.browsers_launched,
+                    "memory_mb": worker.memory_mb(),
+                }
+                for worker in self._workers
+            ],
+        }
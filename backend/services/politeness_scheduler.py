@@ -0,0 +1,152 @@
+"""
+Ordonnanceur de politesse par domaine (seau à jetons)
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate_overrides(raw):
+    """Parser "domaine=débit[:rafale],..." en {domaine: (débit, rafale)}"""
+    overrides = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, value = item.split("=", 1)
+        try:
+            rate, _, burst = value.partition(":")
+            overrides[domain.strip().lower()] = (
+                float(rate),
+                float(burst) if burst else None,
+            )
+        except ValueError:
+            logger.warning(f"Limite de débit invalide ignorée: {item}")
+    return overrides
+
+
+class _TokenBucket:
+    """Seau à jetons d'un domaine (les jetons peuvent devenir négatifs : file d'attente)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self):
+        """Consommer un jeton et retourner l'attente nécessaire (s)"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def is_idle(self):
+        with self.lock:
+            self._refill(time.monotonic())
+            return self.tokens >= self.burst
+
+
+class PolitenessScheduler:
+    """Limite le débit par domaine ; les domaines indépendants ne s'attendent pas
+
+    Aucun verrou n'est tenu pendant l'attente : l'appelant dort en dehors des
+    sections critiques (time.sleep est coopératif sous gevent, asyncio.sleep
+    côté moteur async).
+    """
+
+    def __init__(self, rate=None, burst=None, overrides=None, max_domains=None):
+        self.default_rate = rate or Config.SCRAPING_DOMAIN_RATE
+        self.default_burst = burst or Config.SCRAPING_DOMAIN_BURST
+        self.overrides = (
+            overrides
+            if overrides is not None
+            else parse_rate_overrides(Config.SCRAPING_DOMAIN_RATE_OVERRIDES)
+        )
+        self.max_domains = max_domains or Config.SCRAPING_SCHEDULER_MAX_DOMAINS
+        self.crawl_delays = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _domain(self, url_or_domain):
+        if "://" in url_or_domain:
+            return urlparse(url_or_domain).netloc.lower()
+        return url_or_domain.lower()
+
+    def _limits_for(self, domain):
+        rate, burst = self.overrides.get(domain, (self.default_rate, None))
+        burst = burst or self.default_burst
+        crawl_delay = self.crawl_delays.get(domain)
+        if crawl_delay:
+            # Crawl-delay : une requête toutes les N secondes, sans rafale
+            rate = min(rate, 1.0 / crawl_delay)
+            burst = 1
+        return rate, burst
+
+    def _get_bucket(self, domain):
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                if len(self._buckets) >= self.max_domains:
+                    self._prune_locked()
+                bucket = _TokenBucket(*self._limits_for(domain))
+                self._buckets[domain] = bucket
+            return bucket
+
+    def _prune_locked(self):
+        """Oublier les seaux pleins (domaines inactifs)"""
+        for domain in [d for d, b in self._buckets.items() if b.is_idle()]:
+            del self._buckets[domain]
+
+    def set_crawl_delay(self, domain, delay):
+        """Appliquer le Crawl-delay (robots.txt) d'un domaine"""
+        domain = self._domain(domain)
+        with self._lock:
+            if delay and delay > 0:
+                self.crawl_delays[domain] = float(delay)
+            else:
+                self.crawl_delays.pop(domain, None)
+            # Le seau sera recréé avec les nouvelles limites
+            self._buckets.pop(domain, None)
+
+    def reserve(self, url_or_domain):
+        """Réserver un créneau pour le domaine et retourner l'attente (s)"""
+        return self._get_bucket(self._domain(url_or_domain)).reserve()
+
+    def acquire(self, url_or_domain):
+        """Attendre le créneau du domaine"""
+        delay = self.reserve(url_or_domain)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def get_stats(self):
+        """Limites actives par domaine"""
+        with self._lock:
+            return {
+                domain: {
+                    "rate": bucket.rate,
+                    "burst": bucket.burst,
+                    "crawl_delay": self.crawl_delays.get(domain),
+                }
+                for domain, bucket in self._buckets.items()
+            }
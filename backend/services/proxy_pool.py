@@ -0,0 +1,305 @@
+"""
+Pool de proxies : score par domaine, rotation à chaque requête et quarantaine
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from services.circuit_breaker import counts_as_failure
+from services.scraping_metrics import PROXY_EVENTS
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Statuts qui signalent un proxy bloqué par le site cible
+BAN_STATUSES = (403, 429)
+# Le proxy lui-même refuse la requête (identifiants invalides)
+PROXY_AUTH_STATUS = 407
+
+
+def load_proxies(value=None, path=None):
+    """Proxies configurés : SCRAPING_PROXIES (virgules) puis SCRAPING_PROXY_FILE"""
+    value = Config.SCRAPING_PROXIES if value is None else value
+    path = Config.SCRAPING_PROXY_FILE if path is None else path
+    proxies = [proxy.strip() for proxy in (value or "").split(",")]
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                proxies += [
+                    line.strip() for line in f if not line.lstrip().startswith("#")
+                ]
+        except OSError as e:
+            logger.warning(f"Impossible de lire le fichier de proxies {path}: {e}")
+    return list(dict.fromkeys(proxy for proxy in proxies if proxy))
+
+
+def proxies_from_mapping(proxies):
+    """Ancien format requests {"http": ..., "https": ...} vers une liste"""
+    if not proxies:
+        return []
+    return list(
+        dict.fromkeys(
+            proxy for proxy in (proxies.get("http"), proxies.get("https")) if proxy
+        )
+    )
+
+
+def display_proxy(proxy):
+    """Proxy sans identifiants (logs, statistiques, option Chrome)"""
+    parsed = urlparse(proxy)
+    if not parsed.hostname:
+        return proxy
+    netloc = parsed.hostname
+    if parsed.port:
+        netloc = f"{netloc}:{parsed.port}"
+    return f"{parsed.scheme}://{netloc}"
+
+
+def requests_proxies(proxy):
+    """Paramètre `proxies` de requests pour un proxy du pool"""
+    if not proxy:
+        return None
+    return {"http": proxy, "https": proxy}
+
+
+def playwright_proxy(proxy):
+    """Option `proxy` d'un contexte Playwright (identifiants séparés)"""
+    parsed = urlparse(proxy)
+    options = {"server": display_proxy(proxy)}
+    if parsed.username:
+        options["username"] = parsed.username
+        options["password"] = parsed.password or ""
+    return options
+
+
+class _ProxyStats:
+    """Compteurs d'un proxy, tous domaines confondus ou pour un domaine"""
+
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.bans = 0
+        self.latency = None
+        self.consecutive_failures = 0
+        self.strikes = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def samples(self):
+        return self.successes + self.failures + self.bans
+
+    def score(self, latency_reference):
+        # Taux de succès lissé : un proxy neuf part de 0,5
+        success_rate = (self.successes + 1) / (self.samples + 2)
+        latency = latency_reference if self.latency is None else self.latency
+        return success_rate * latency_reference / (latency_reference + latency)
+
+
+class ProxyPool:
+    """Choisit un proxy par requête, pondéré par son score sur le domaine
+
+    Le score combine taux de succès et latence (moyenne glissante). Les
+    échecs réseau répétés mettent le proxy en quarantaine pour tous les
+    domaines ; un blocage (403, 429) ne l'écarte que du domaine concerné.
+    Chaque quarantaine successive double de durée. L'état est propre au
+    processus : il se reconstruit en quelques requêtes.
+    """
+
+    LATENCY_ALPHA = 0.3
+
+    def __init__(
+        self,
+        proxies=None,
+        failure_threshold=None,
+        quarantine_base=None,
+        quarantine_max=None,
+        latency_reference=None,
+        min_samples=None,
+    ):
+        self.proxies = load_proxies() if proxies is None else list(proxies)
+        self.failure_threshold = (
+            failure_threshold or Config.SCRAPING_PROXY_FAILURE_THRESHOLD
+        )
+        self.quarantine_base = quarantine_base or Config.SCRAPING_PROXY_QUARANTINE_BASE
+        self.quarantine_max = quarantine_max or Config.SCRAPING_PROXY_QUARANTINE_MAX
+        self.latency_reference = (
+            latency_reference or Config.SCRAPING_PROXY_LATENCY_REFERENCE
+        )
+        self.min_samples = min_samples or Config.SCRAPING_PROXY_MIN_SAMPLES
+        self._global = {proxy: _ProxyStats() for proxy in self.proxies}
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.proxies)
+
+    def _domain_stats(self, proxy, domain):
+        key = (proxy, domain)
+        if key not in self._domains:
+            self._domains[key] = _ProxyStats()
+        return self._domains[key]
+
+    def _quarantine_end(self, proxy, domain):
+        end = self._global[proxy].quarantined_until
+        if domain and (proxy, domain) in self._domains:
+            end = max(end, self._domains[(proxy, domain)].quarantined_until)
+        return end
+
+    def is_quarantined(self, proxy, domain=None):
+        with self._lock:
+            if proxy not in self._global:
+                return False
+            return self._quarantine_end(proxy, domain) > time.time()
+
+    def _score(self, proxy, domain):
+        stats = self._global[proxy]
+        domain_stats = self._domains.get((proxy, domain))
+        if domain_stats is not None and domain_stats.samples >= self.min_samples:
+            stats = domain_stats
+        return max(0.01, stats.score(self.latency_reference))
+
+    def choose(self, domain=None):
+        """Proxy pour la prochaine requête vers `domain` (None si pool vide)"""
+        if not self.proxies:
+            return None
+        now = time.time()
+        with self._lock:
+            candidates = [
+                proxy
+                for proxy in self.proxies
+                if self._quarantine_end(proxy, domain) <= now
+            ]
+            if not candidates:
+                # Tous en quarantaine : celui qui en sort le plus tôt
+                return min(
+                    self.proxies, key=lambda proxy: self._quarantine_end(proxy, domain)
+                )
+            weights = [self._score(proxy, domain) for proxy in candidates]
+        return random.choices(candidates, weights=weights)[0]
+
+    def _quarantine(self, stats, proxy, scope):
+        stats.strikes += 1
+        stats.consecutive_failures = 0
+        duration = min(
+            self.quarantine_max, self.quarantine_base * 2 ** (stats.strikes - 1)
+        )
+        stats.quarantined_until = time.time() + duration
+        PROXY_EVENTS.labels(result="quarantined").inc()
+        logger.warning(
+            f"Proxy {display_proxy(proxy)} en quarantaine {duration:.0f}s ({scope})"
+        )
+
+    def record_success(self, proxy, domain, latency):
+        if proxy not in self._global:
+            return
+        with self._lock:
+            for stats in (self._global[proxy], self._domain_stats(proxy, domain)):
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                stats.strikes = 0
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += self.LATENCY_ALPHA * (latency - stats.latency)
+        PROXY_EVENTS.labels(result="success").inc()
+
+    def record_failure(self, proxy, domain, exc, rendered=False):
+        """Classer l'erreur : panne du proxy, blocage par le site, ou sans rapport"""
+        if proxy not in self._global:
+            return
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        with self._lock:
+            global_stats = self._global[proxy]
+            domain_stats = self._domain_stats(proxy, domain)
+            if status == PROXY_AUTH_STATUS:
+                global_stats.failures += 1
+                self._quarantine(global_stats, proxy, "refusé par le proxy")
+                result = "failure"
+            elif status in BAN_STATUSES:
+                global_stats.bans += 1
+                domain_stats.bans += 1
+                self._quarantine(domain_stats, proxy, f"bloqué par {domain}")
+                result = "banned"
+            elif status is None and counts_as_failure(exc, rendered):
+                for stats in (global_stats, domain_stats):
+                    stats.failures += 1
+                    stats.consecutive_failures += 1
+                if global_stats.consecutive_failures >= self.failure_threshold:
+                    self._quarantine(global_stats, proxy, "échecs réseau répétés")
+                result = "failure"
+            else:
+                # 404, 5xx du site, contenu refusé : le proxy a fait son travail
+                return
+        PROXY_EVENTS.labels(result=result).inc()
+
+    @contextmanager
+    def track(self, proxy, url, rendered=False):
+        """Enregistrer l'issue (latence, échec, blocage) d'une requête via `proxy`"""
+        if proxy is None:
+            yield
+            return
+        domain = urlparse(url).netloc
+        start = time.time()
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(proxy, domain, e, rendered)
+            raise
+        self.record_success(proxy, domain, time.time() - start)
+
+    @contextmanager
+    def use(self, url, rendered=False):
+        """Choisir un proxy pour `url` et enregistrer l'issue de la requête"""
+        proxy = self.choose(urlparse(url).netloc)
+        with self.track(proxy, url, rendered):
+            yield proxy
+
+    def get_stats(self):
+        """Statistiques du pool (proxies affichés sans identifiants)"""
+        now = time.time()
+        with self._lock:
+            proxies = []
+            for proxy in self.proxies:
+                stats = self._global[proxy]
+                banned_on = sorted(
+                    domain
+                    for (banned_proxy, domain), domain_stats in self._domains.items()
+                    if banned_proxy == proxy and domain_stats.quarantined_until > now
+                )
+                proxies.append(
+                    {
+                        "proxy": display_proxy(proxy),
+                        "successes": stats.successes,
+                        "failures": stats.failures,
+                        "bans": stats.bans,
+                        "latency": (
+                            round(stats.latency, 3)
+                            if stats.latency is not None
+                            else None
+                        ),
+                        "score": round(stats.score(self.latency_reference), 3),
+                        "quarantined_for": max(
+                            0, round(stats.quarantined_until - now, 1)
+                        ),
+                        "banned_on": banned_on,
+                    }
+                )
+        return {
+            "size": len(proxies),
+            "available": sum(1 for proxy in proxies if not proxy["quarantined_for"]),
+            "proxies": proxies,
+        }
+
+
+# Instance globale (proxies de la configuration)
+proxy_pool = ProxyPool()
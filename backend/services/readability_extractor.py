@@ -0,0 +1,78 @@
+"""
+Extraction du contenu principal d'une page d'article par l'algorithme Readability
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+from lxml import html as lxml_html
+from readability import Document
+from readability.readability import Unparseable
+from services.html_parser import LxmlNode, parse_html
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# "selectors" : sélecteurs de contenu + extraction hiérarchique (historique)
+EXTRACTION_MODES = ("selectors", "readability")
+
+
+def parse_mode_overrides(raw):
+    """Parser "domaine=mode,..." en {domaine: mode}"""
+    overrides = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, mode = (part.strip().lower() for part in item.split("=", 1))
+        if mode in EXTRACTION_MODES:
+            overrides[domain] = mode
+        else:
+            logger.warning(f"Mode d'extraction invalide ignoré: {item}")
+    return overrides
+
+
+class ReadabilityExtractor:
+    """Contenu principal d'une page : score des blocs de texte et densité de liens
+
+    Readability note les conteneurs selon la longueur et la ponctuation de
+    leurs paragraphes, pénalise les classes/ids de navigation et les blocs
+    dominés par des liens, puis garde le meilleur et ses voisins pertinents.
+    L'arbre lxml déjà construit est réutilisé (sans nouvelle analyse).
+    """
+
+    def __init__(self, min_text_length=None, retry_length=None):
+        self.min_text_length = (
+            min_text_length or Config.SCRAPING_READABILITY_MIN_TEXT_LENGTH
+        )
+        self.retry_length = retry_length or Config.SCRAPING_READABILITY_RETRY_LENGTH
+
+    def extract(self, document, url=None):
+        """Texte du contenu principal de `document` (HTML ou document lxml analysé)
+
+        Attention : les éléments masqués (hidden, display:none) sont retirés
+        de l'arbre lxml fourni. Retourne "" si aucun contenu n'est identifié.
+        """
+        if isinstance(document, (str, bytes)):
+            document = parse_html(document, "lxml")
+        if not isinstance(document, LxmlNode):
+            # Repli BeautifulSoup (document vide ou illisible par lxml)
+            return ""
+        try:
+            # Sans url : pas de réécriture des liens, seul le texte est gardé
+            summary = Document(
+                document.element,
+                min_text_length=self.min_text_length,
+                retry_length=self.retry_length,
+            ).summary(html_partial=True)
+        except Unparseable as e:
+            logger.info(f"Readability sans résultat pour {url}: {e}")
+            return ""
+        if not summary or not summary.strip():
+            return ""
+        return LxmlNode(
+            lxml_html.fragment_fromstring(summary, create_parent="div")
+        ).get_text(" ", strip=True)
@@ -0,0 +1,203 @@
+"""
+Lecture en streaming des réponses HTTP : plafond de taille, type de contenu, arrêt anticipé
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import re
+import httpx
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Types acceptés pour une page (HTML, XML des flux, texte)
+ALLOWED_CONTENT_TYPES = (
+    "text/",
+    "application/xhtml+xml",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+)
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_BODY_END = b"</body"
+
+
+class ContentRejectedError(Exception):
+    """Réponse abandonnée avant la fin de la lecture (type ou taille)
+
+    La réponse (statut 2xx) est attachée : ni retry ni disjoncteur ne la
+    traitent comme une panne de l'amont.
+    """
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+
+class UnsupportedContentTypeError(ContentRejectedError):
+    """Le serveur renvoie un PDF, une vidéo, une archive..."""
+
+
+class ResponseTooLargeError(ContentRejectedError):
+    """Le corps dépasse le plafond d'octets configuré"""
+
+
+class FetchedResponse:
+    """Réponse HTTP déjà lue (mêmes attributs que requests/httpx utilisés ici)"""
+
+    def __init__(self, url, status_code, headers, text, truncated=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self.truncated = truncated
+
+
+class _BodyBuffer:
+    """Accumule les blocs lus et décide quand arrêter la lecture"""
+
+    def __init__(self, reader, response):
+        self.reader = reader
+        self.response = response
+        self.chunks = []
+        self.size = 0
+        self.truncated = False
+        self._tail = b""
+        self._closing = False
+
+    def feed(self, chunk):
+        """Ajouter un bloc ; retourne True quand la lecture doit s'arrêter"""
+        if not chunk:
+            return False
+        if self.size + len(chunk) > self.reader.max_bytes:
+            raise ResponseTooLargeError(
+                f"Réponse supérieure à {self.reader.max_bytes} octets",
+                self.response,
+            )
+        if self.reader.stop_at_body_end:
+            if self._closing:
+                # </body vu au bloc précédent : lire jusqu'au « > » qui la ferme
+                return self._close_body_tag(chunk, 0)
+            window = (self._tail + chunk).lower()
+            index = window.find(_BODY_END)
+            if index != -1:
+                self._closing = True
+                return self._close_body_tag(
+                    chunk, max(0, index + len(_BODY_END) - len(self._tail))
+                )
+            # Fin des blocs lus : une balise </body peut être coupée entre deux blocs
+            self._tail = window[-(len(_BODY_END) - 1) :]
+        self._append(chunk)
+        budget = self.reader.read_budget
+        if budget and self.size >= budget:
+            self.truncated = True
+            return True
+        return False
+
+    def _close_body_tag(self, chunk, start):
+        """Garder le bloc jusqu'à la fin de la balise </body> (à partir de `start`)"""
+        end = chunk.find(b">", start)
+        if end == -1:
+            self._append(chunk)
+            return False
+        self._append(chunk[: end + 1])
+        self.truncated = True
+        return True
+
+    def _append(self, chunk):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+
+    def content(self):
+        return b"".join(self.chunks)
+
+
+class ResponseReader:
+    """Lit un corps de réponse par blocs sans jamais dépasser `max_bytes`
+
+    `read_budget` (0 = illimité) et `stop_at_body_end` tronquent la lecture
+    au lieu de l'abandonner : le début de la page suffit à l'extraction.
+    """
+
+    def __init__(
+        self, max_bytes=None, read_budget=None, stop_at_body_end=None, chunk_size=None
+    ):
+        self.max_bytes = max_bytes or Config.SCRAPING_MAX_RESPONSE_BYTES
+        self.read_budget = (
+            Config.SCRAPING_READ_BUDGET_BYTES if read_budget is None else read_budget
+        )
+        self.stop_at_body_end = (
+            Config.SCRAPING_STOP_AT_BODY_END
+            if stop_at_body_end is None
+            else stop_at_body_end
+        )
+        self.chunk_size = chunk_size or Config.SCRAPING_READ_CHUNK_SIZE
+
+    def check_headers(self, response):
+        """Refuser d'emblée les types non textuels et les tailles annoncées trop grandes"""
+        content_type = (response.headers.get("Content-Type") or "").lower()
+        mime = content_type.split(";", 1)[0].strip()
+        if mime and not mime.startswith(ALLOWED_CONTENT_TYPES):
+            raise UnsupportedContentTypeError(
+                f"Type de contenu non pris en charge: {mime}", response
+            )
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise ResponseTooLargeError(
+                f"Content-Length {length} supérieur à {self.max_bytes} octets",
+                response,
+            )
+
+    @staticmethod
+    def encoding(headers):
+        """Encodage annoncé ; à défaut (ou ISO-8859-1 implicite), UTF-8"""
+        match = _CHARSET_RE.search(headers.get("Content-Type") or "")
+        encoding = match.group(1) if match else None
+        if encoding is None or encoding.lower() in ("iso-8859-1", "latin-1"):
+            return "utf-8"
+        return encoding
+
+    def _decode(self, content, headers):
+        try:
+            return str(content, self.encoding(headers), errors="replace")
+        except LookupError:
+            return str(content, "utf-8", errors="replace")
+
+    def _result(self, response, buffer):
+        if buffer.truncated:
+            logger.debug(f"Lecture arrêtée après {buffer.size} octets: {response.url}")
+        return FetchedResponse(
+            str(response.url),
+            response.status_code,
+            response.headers,
+            self._decode(buffer.content(), response.headers),
+            buffer.truncated,
+        )
+
+    def read(self, response):
+        """Lire une réponse requests (stream=True) ou httpx (stream=True) synchrone"""
+        self.check_headers(response)
+        buffer = _BodyBuffer(self, response)
+        if isinstance(response, httpx.Response):
+            chunks = response.iter_bytes(chunk_size=self.chunk_size)
+        else:
+            chunks = response.iter_content(chunk_size=self.chunk_size)
+        for chunk in chunks:
+            if buffer.feed(chunk):
+                break
+        return self._result(response, buffer)
+
+    async def aread(self, response):
+        """Lire une réponse httpx ouverte avec client.stream(...)"""
+        self.check_headers(response)
+        buffer = _BodyBuffer(self, response)
+        async for chunk in response.aiter_bytes(chunk_size=self.chunk_size):
+            if buffer.feed(chunk):
+                break
+        return self._result(response, buffer)
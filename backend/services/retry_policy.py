@@ -0,0 +1,140 @@
+"""
+Politique de retry partagée : backoff exponentiel, jitter, Retry-After et échéance
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+import requests
+from services.circuit_breaker import CircuitOpenError
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Statuts transitoires : la même requête peut réussir un peu plus tard
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# Erreurs de transport (connexion, timeout...) des deux clients HTTP
+TRANSPORT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    httpx.TransportError,
+)
+
+
+def parse_retry_after(value):
+    """Secondes demandées par un en-tête Retry-After (délai ou date HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Décide si, et après combien de temps, une requête échouée est rejouée
+
+    Les erreurs permanentes (404, 401...) ne sont jamais rejouées. Le délai
+    est exponentiel avec jitter complet, sauf si le serveur impose un
+    Retry-After. Aucune tentative n'est lancée au-delà de l'échéance globale.
+    Les attentes utilisent time.sleep (coopératif sous gevent) ou
+    asyncio.sleep dans le moteur async.
+    """
+
+    def __init__(
+        self,
+        max_attempts=None,
+        base_delay=None,
+        max_delay=None,
+        deadline=None,
+        max_retry_after=None,
+    ):
+        self.max_attempts = max_attempts or Config.SCRAPING_RETRY_MAX_ATTEMPTS
+        self.base_delay = (
+            Config.SCRAPING_RETRY_BASE_DELAY if base_delay is None else base_delay
+        )
+        self.max_delay = max_delay or Config.SCRAPING_RETRY_MAX_DELAY
+        self.deadline = deadline or Config.SCRAPING_RETRY_DEADLINE
+        self.max_retry_after = max_retry_after or Config.SCRAPING_RETRY_AFTER_MAX
+
+    @staticmethod
+    def _response(exc):
+        return getattr(exc, "response", None)
+
+    def is_retryable(self, exc):
+        if isinstance(exc, CircuitOpenError):
+            return False
+        response = self._response(exc)
+        if response is not None:
+            return response.status_code in RETRYABLE_STATUSES
+        return isinstance(exc, TRANSPORT_ERRORS)
+
+    def compute_delay(self, attempt, exc):
+        """Délai avant la tentative suivante (attempt commence à 0)"""
+        response = self._response(exc)
+        if response is not None and response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def next_delay(self, attempt, exc, started_at):
+        """Délai avant de rejouer, ou None s'il faut abandonner"""
+        if attempt + 1 >= self.max_attempts or not self.is_retryable(exc):
+            return None
+        delay = self.compute_delay(attempt, exc)
+        if delay > self.max_retry_after:
+            return None
+        if time.time() + delay - started_at > self.deadline:
+            return None
+        return delay
+
+    def call(self, func, description=""):
+        """Exécuter func() en la rejouant selon la politique"""
+        started_at = time.time()
+        attempt = 0
+        while True:
+            try:
+                return func(attempt)
+            except Exception as e:
+                delay = self.next_delay(attempt, e, started_at)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"{description} échoué (tentative {attempt + 1}/{self.max_attempts}), "
+                    f"nouvel essai dans {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    async def call_async(self, func, description=""):
+        """Version asynchrone de call : func(attempt) retourne une coroutine"""
+        started_at = time.time()
+        attempt = 0
+        while True:
+            try:
+                return await func(attempt)
+            except Exception as e:
+                delay = self.next_delay(attempt, e, started_at)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"{description} échoué (tentative {attempt + 1}/{self.max_attempts}), "
+                    f"nouvel essai dans {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,39 @@
+"""
+Métriques Prometheus de la couche de récupération
+"""
+
+import logging
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+
+HTML_CACHE_EVENTS = Counter(
+    "scraping_html_cache_total",
+    "Consultations du cache HTML (hit, miss, stale, revalidated)",
+    ["result"],
+)
+
+CIRCUIT_STATE = Gauge(
+    "scraping_circuits",
+    "Disjoncteurs par état (circuit : fournisseur, ou « domain » pour tous les domaines)",
+    ["circuit", "state"],
+)
+
+CIRCUIT_REJECTIONS = Counter(
+    "scraping_circuit_rejections_total",
+    "Appels refusés par un disjoncteur ouvert (fournisseur ou « domain »)",
+    ["circuit"],
+)
+
+HEDGE_EVENTS = Counter(
+    "scraping_hedge_total",
+    "Requêtes couvertes (launched, won, lost, budget_exhausted)",
+    ["result"],
+)
+
+PROXY_EVENTS = Counter(
+    "scraping_proxy_total",
+    "Requêtes passées par un proxy (success, failure, banned, quarantined)",
+    ["result"],
+)
@@ -9,20 +9,65 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 import logging
-import requests
-from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import time
+import threading
 import re
 import json
+import asyncio
 import unicodedata  # Added for text cleaning
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from playwright.sync_api import sync_playwright
 from langchain_groq import ChatGroq
 from config import Config
 from database.mysql_connector import mysql_connector
 from database.redis_connector import redis_connector
+from services.http_session_manager import HttpSessionManager
+from services.async_fetch_engine import AsyncFetchEngine
+from services.politeness_scheduler import PolitenessScheduler
+from services.playwright_pool import PlaywrightBrowserPool
+from services.webdriver_pool import WebDriverPool
+from services.headless_render import HeadlessRenderPolicy
+from services.method_selector import FetchMethodSelector
+from services.page_classifier import PageClassifier
+from services.fetch_router import FetchRouter
+from services.html_cache import HtmlResponseCache
+from services.hedging import HedgeCancelledError, HedgePolicy
+from services.retry_policy import RetryPolicy
+from services.response_reader import ContentRejectedError, ResponseReader
+from services.proxy_pool import (
+    ProxyPool,
+    display_proxy,
+    playwright_proxy,
+    proxies_from_mapping,
+    proxy_pool,
+    requests_proxies,
+)
+from services.site_discovery import SiteDiscovery
+from services.html_parser import parse_html
+from services.structured_data import article_record, listing_records
+from services.content_extractor import extract_content
+from services.readability_extractor import (
+    EXTRACTION_MODES,
+    ReadabilityExtractor,
+    parse_mode_overrides,
+)
+from services.selector_matcher import SelectorMatcher
+from services.extraction_profiles import ExtractionProfiles
+from services.llm_selector_spec import LlmSelectorSpecs
+from services.pagination import (
+    PagePrefetcher,
+    prescan_next_page_url,
+    speculative_page_urls,
+)
+from services.scraping_metrics import HEDGE_EVENTS
+from services.circuit_breaker import (
+    CircuitOpenError,
+    circuit_breakers,
+    domain_circuit,
+    provider_circuit,
+)
 import random
 from typing import Optional
 
@@ -41,54 +86,223 @@ class ScrapingService:
         "Mozilla/5.0 (iPhone; CPU iPhone OS 17_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
     ]
 
-    def __init__(self, min_delay: float = 0.5, proxies: Optional[dict] = None):
+    # Sélecteurs CSS des articles dans une page de listing
+    LISTING_SELECTORS = [
+        # Sélecteurs génériques
+        "article",
+        "div.news-item",
+        "div.post",
+        "div.blog-post",
+        "li.news-item",
+        "div.article",
+        "div.story",
+        # Sélecteurs supplémentaires pour sites tech/actualités
+        "div.news",
+        "div.actualite",
+        "div.news-article",
+        "li.article",
+        "div.entry",
+        "div.content-article",
+        "section.article",
+        "div.news-content",
+        "div.article-content",
+        "div.news-block",
+        "div.article-block",
+        "div.post-content",
+        "div.news-summary",
+        "div.article-summary",
+        "div.news-excerpt",
+        # Sélecteurs spécifiques pour sites français
+        "div.article-item",
+        "div.news-card",
+        "div.article-card",
+        "li.news",
+        "div.actualite-item",
+        "div.article-preview",
+        "div.article-teaser",
+        "div.news-teaser",
+        "div.article-snippet",
+        # Sélecteurs pour sites d'actualités
+        "div.article-list-item",
+        "div.news-list-item",
+        "div.article-entry",
+        "article.article",
+        "div.article-wrapper",
+        "div.news-wrapper",
+        # Sélecteurs pour sites de blogs
+        "div.blog-entry",
+        "div.post-item",
+        "div.blog-item",
+        "li.blog-post",
+        "div.blog-article",
+        "div.post-article",
+    ]
+
+    # Libellés de navigation jamais retenus comme titres d'articles
+    NAVIGATION_TITLES = (
+        "accueil",
+        "menu",
+        "navigation",
+        "footer",
+        "boutique",
+        "services",
+    )
+
+    # Sélecteurs des pages d'articles, par ordre de priorité
+    ARTICLE_TITLE_SELECTORS = ["h1", "h2", ".title", ".article-title", ".post-title"]
+    ARTICLE_CONTENT_SELECTORS = [
+        "article",
+        ".article-content",
+        ".post-content",
+        ".entry-content",
+        ".content",
+        ".main-content",
+        ".article-body",
+        ".post-body",
+    ]
+    ARTICLE_DATE_SELECTORS = [
+        "time",
+        ".date",
+        ".published",
+        ".post-date",
+        ".article-date",
+    ]
+
+    DEFAULT_METHOD_ORDER = ["requests", "scrapedo", "selenium", "playwright"]
+
+    # Méthodes facturées à la requête : jamais de préchargement spéculatif
+    PAID_METHODS = ("scrapedo",)
+
+    # Moteurs de récupération disponibles pour get_html
+    FETCH_ENGINES = ("sync", "async")
+
+    ARTICLE_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+    def __init__(
+        self,
+        min_delay: Optional[float] = None,
+        proxies: Optional[dict] = None,
+        fetch_engine: Optional[str] = None,
+    ):
         self.db = mysql_connector
         self.cache = redis_connector
         self.config = Config
-        self.last_request_time = 0
-        self.min_delay = min_delay  # délai minimum entre deux requêtes (en secondes)
-        self.proxies = (
-            proxies  # ex: {"http": "http://proxy:port", "https": "http://proxy:port"}
+        # min_delay : délai minimum entre deux requêtes vers un même domaine (s)
+        self.scheduler = PolitenessScheduler(
+            rate=1.0 / min_delay if min_delay else None
+        )
+        # Un dict explicite (ex: {"http": "http://proxy:port", "https": ...})
+        # remplace les proxies de la configuration : il ne sert qu'à créer ce pool
+        self.proxy_pool = (
+            ProxyPool(proxies_from_mapping(proxies)) if proxies else proxy_pool
+        )
+        self.sessions = HttpSessionManager()
+        # Par domaine : [sémaphore, utilisateurs] tant qu'un article y est récupéré
+        self._detail_semaphores = {}
+        self._detail_lock = threading.Lock()
+        # Créneau déjà attendu par un préchargement, consommé par sa requête
+        self._held_slot = threading.local()
+        self.fetch_engine = fetch_engine or Config.SCRAPING_FETCH_ENGINE
+        if self.fetch_engine not in self.FETCH_ENGINES:
+            raise ValueError(f"Moteur de récupération inconnu: {self.fetch_engine}")
+        self.async_engine = AsyncFetchEngine(self)
+        self.method_selector = FetchMethodSelector(self.cache)
+        self.page_classifier = PageClassifier(self.cache)
+        self.html_cache = HtmlResponseCache(self.cache)
+        self.breakers = circuit_breakers
+        self.hedge_policy = HedgePolicy(self.method_selector, self.cache)
+        self.retry_policy = RetryPolicy()
+        self.response_reader = ResponseReader()
+        self.site_discovery = SiteDiscovery(
+            lambda url: self._http_get_with_retry(url).text, self.scheduler, self.cache
+        )
+        self.render_policy = HeadlessRenderPolicy(self.LISTING_SELECTORS)
+        # Sélecteurs de listing compilés : un seul parcours du DOM par page
+        self.listing_matcher = SelectorMatcher(self.LISTING_SELECTORS)
+        self.readability = ReadabilityExtractor()
+        self.extraction_profiles = ExtractionProfiles(self.cache)
+        self.llm_specs = LlmSelectorSpecs(self.cache)
+        self.extraction_overrides = parse_mode_overrides(
+            Config.SCRAPING_EXTRACTION_MODE_OVERRIDES
+        )
+        self.webdriver_pool = WebDriverPool(
+            self._selenium_options,
+            setup=self.render_policy.install_selenium_blocking,
+            proxy_pool=self.proxy_pool,
+        )
+        self.playwright_pool = PlaywrightBrowserPool(
+            # Chromium n'accepte un proxy par contexte que s'il est lancé avec un proxy
+            launch_options=(
+                {"proxy": {"server": "http://per-context"}}
+                if self.proxy_pool.enabled
+                else None
+            )
         )
 
-    def _rate_limit(self):
-        now = time.time()
-        elapsed = now - self.last_request_time
-        if elapsed < self.min_delay:
-            time.sleep(self.min_delay - elapsed)
-        self.last_request_time = time.time()
+    def _reserve_request_slot(self, url):
+        """Réserver le prochain créneau de requête du domaine et retourner l'attente (s)"""
+        if self._take_held_slot(url):
+            return 0
+        return self.scheduler.reserve(url)
+
+    def _rate_limit(self, url):
+        if not self._take_held_slot(url):
+            self.scheduler.acquire(url)
+
+    def _hold_request_slot(self, url):
+        """Attendre le créneau de `url` pour la prochaine requête de ce thread"""
+        self.scheduler.acquire(url)
+        self._held_slot.url = url
+
+    def _take_held_slot(self, url):
+        if getattr(self._held_slot, "url", None) != url:
+            return False
+        self._held_slot.url = None
+        return True
+
+    def _run_async(self, coro):
+        """Exécuter une coroutine depuis du code synchrone"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Une boucle tourne déjà dans ce thread : utiliser un thread dédié
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
 
     def _get_random_user_agent(self):
         return random.choice(self.USER_AGENTS)
 
-    def _http_get_with_retry(
-        self, url, headers=None, retries=3, backoff=1.5, timeout=10
-    ):
-        """GET HTTP avec retry et backoff"""
-        attempt = 0
-        last_exc = None
-        while attempt < retries:
-            try:
-                self._rate_limit()
-                h = headers or {}
-                if "User-Agent" not in h:
-                    h["User-Agent"] = self._get_random_user_agent()
-                resp = requests.get(
-                    url, headers=h, timeout=timeout, proxies=self.proxies
-                )
-                resp.raise_for_status()
-                # Ensure correct encoding, especially for accented characters
-                if resp.encoding is None or resp.encoding == "ISO-8859-1":
-                    resp.encoding = "utf-8"
-                return resp
-            except Exception as e:
-                last_exc = e
-                logger.warning(
-                    f"HTTP GET failed (tentative {attempt+1}/{retries}): {e}"
-                )
-                time.sleep(backoff * (attempt + 1))
-                attempt += 1
-        raise last_exc
+    def _check_robots(self, url):
+        """Refuser les URLs interdites par robots.txt (applique aussi le Crawl-delay)"""
+        if self.config.SCRAPING_RESPECT_ROBOTS:
+            self.site_discovery.check(url)
+
+    def _http_get_with_retry(self, url, headers=None, timeout=10):
+        """GET HTTP rejoué selon la politique de retry partagée"""
+        circuit = domain_circuit(urlparse(url).netloc)
+
+        def attempt_get(attempt):
+            # Circuit ouvert entre-temps (autre worker) : inutile d'insister
+            if attempt and self.breakers.is_open(circuit):
+                raise CircuitOpenError(f"Disjoncteur {circuit} ouvert")
+            self._rate_limit(url)
+            h = dict(headers or {})
+            if "User-Agent" not in h:
+                h["User-Agent"] = self._get_random_user_agent()
+            with self.proxy_pool.use(url) as proxy, self.sessions.stream(
+                "GET",
+                url,
+                headers=h,
+                timeout=timeout,
+                proxies=requests_proxies(proxy),
+            ) as resp:
+                # httpx lève aussi sur 304 (revalidation du cache HTML)
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                return self.response_reader.read(resp)
+
+        return self.retry_policy.call(attempt_get, f"HTTP GET {url}")
 
     def _clean_text(self, text: str) -> str:
         """
@@ -101,60 +315,185 @@ class ScrapingService:
         # Normalisation Unicode (NFC pour la forme canonique de composition)
         text = unicodedata.normalize("NFC", text)
         # Supprimer les caractères de contrôle et les espaces multiples
-        text = re.sub(r"\s+", " ", text).strip()
+        text = " ".join(text.split())
         return text
 
-    def get_html(self, url, method_order=None, max_wait=10) -> str:
-        """Centralise la récupération du HTML avec fallback, rotation UA, proxy, retry, etc."""
-        method_order = method_order or [
-            "requests",
-            "scrapedo",
-            "selenium",
-            "playwright",
-        ]
-        last_exc = None
-        for method in method_order:
+    def _fetch_with_method(self, url, method, max_wait=10, router=None) -> str:
+        """Récupérer le HTML avec une seule méthode
+
+        Avec un `router`, la requête HTTP revalide l'éventuelle entrée en cache.
+        """
+        if method == "scrapedo":
+            return self.get_site_content_professional(url)
+        elif method == "requests":
+            if router is None:
+                return self._http_get_with_retry(url).text
+            resp = self._http_get_with_retry(url, headers=router.request_headers())
+            return router.accept_response(resp.status_code, resp.text, resp.headers)
+        elif method == "selenium":
+            return self.get_site_content_selenium(url, max_wait=max_wait)
+        elif method == "playwright":
+            return self.get_site_content_playwright(url, max_wait=max_wait)
+        raise ValueError(f"Méthode de récupération inconnue: {method}")
+
+    def fetch_html(self, url, method_order=None, max_wait=10, hedge=None) -> dict:
+        """Récupérer le HTML avec fallback et indiquer la méthode retenue
+
+        L'ordre des méthodes est adapté par domaine d'après les résultats
+        passés (voir FetchMethodSelector) et le type de page détecté (voir
+        PageClassifier). Avec `hedge`, la méthode suivante est lancée en
+        parallèle si la principale dépasse sa latence p90 sur le domaine.
+        Retourne {"html", "method", "reason"}.
+        """
+        if hedge is None:
+            hedge = self.config.SCRAPING_HEDGE_ENABLED
+        if self.fetch_engine == "async":
+            return self._run_async(
+                self.async_engine.fetch_html(url, method_order, max_wait, hedge=hedge)
+            )
+        self._check_robots(url)
+        router = FetchRouter(self, url, method_order)
+        cached = router.cached_result()
+        if cached:
+            return cached
+        if hedge:
+            return self._fetch_hedged(router, url, max_wait)
+        for method in router:
+            start = time.time()
             try:
-                if method == "scrapedo":
-                    html = self.get_site_content_professional(url)
-                    logger.info(f"HTML récupéré via Scrape.do")
-                    return html
-                elif method == "requests":
-                    resp = self._http_get_with_retry(url)
-                    logger.info(f"HTML récupéré via requests")
-                    return resp.text
-                elif method == "selenium":
-                    html = self.get_site_content_selenium(url, max_wait=max_wait)
-                    logger.info(f"HTML récupéré via Selenium")
-                    return html
-                elif method == "playwright":
-                    html = self.get_site_content_playwright(url, max_wait=max_wait)
-                    logger.info(f"HTML récupéré via Playwright")
-                    return html
+                html = self._fetch_with_method(url, method, max_wait, router)
             except Exception as e:
-                logger.warning(f"Méthode {method} échouée: {e}")
-                last_exc = e
-        logger.error(f"Toutes les méthodes de récupération HTML ont échoué pour {url}")
-        if last_exc is not None and isinstance(last_exc, BaseException):
-            raise last_exc
-        raise Exception("Impossible de récupérer le HTML")
-
-    def scrape_with_scrapedo(self, url: str, params: dict = {}) -> dict:
+                router.on_error(method, e, time.time() - start)
+                continue
+            result = router.on_html(method, html, time.time() - start)
+            if result:
+                return result
+        return router.finish()
+
+    def _fetch_hedged(self, router, url, max_wait):
+        """Boucle de fetch_html avec couverture de la méthode principale lente
+
+        Une fois le résultat obtenu, aucune requête pas encore démarrée n'est
+        lancée. Un perdant déjà en cours ne peut pas être interrompu : son
+        résultat est simplement ignoré. On ne couvre donc jamais par un
+        navigateur dont le pool n'a plus de créneau libre.
+        """
+        methods = iter(router)
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedge")
+        pending = {}
+        deferred = None
+        cancelled = threading.Event()
+
+        def fetch(method):
+            if cancelled.is_set():
+                raise HedgeCancelledError(f"Requête {method} annulée: {url}")
+            return self._fetch_with_method(url, method, max_wait, router)
+
+        def launch(method):
+            future = executor.submit(fetch, method)
+            pending[future] = (method, time.time())
+
+        try:
+            while True:
+                primary, deferred = deferred or next(methods, None), None
+                if primary is None:
+                    return router.finish()
+                launch(primary)
+                hedge = None
+                timeout = self.hedge_policy.delay(router.domain, primary)
+                while pending:
+                    done, _ = wait(
+                        pending, timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+                    if not done:
+                        # Méthode principale au-delà de son p90 : couvrir une fois
+                        candidate = next(methods, None)
+                        if (
+                            candidate is not None
+                            and self._has_free_browser_slot(candidate)
+                            and self.hedge_policy.try_acquire()
+                        ):
+                            hedge = candidate
+                            launch(candidate)
+                            router.reason += (
+                                f"; couverture {candidate} après {timeout:.1f}s"
+                            )
+                        else:
+                            deferred = candidate
+                        timeout = None
+                        continue
+                    for future in done:
+                        method, start = pending.pop(future)
+                        try:
+                            html = future.result()
+                        except Exception as e:
+                            router.on_error(method, e, time.time() - start)
+                            continue
+                        result = router.on_html(method, html, time.time() - start)
+                        if result:
+                            if hedge is not None:
+                                HEDGE_EVENTS.labels(
+                                    result="won" if method == hedge else "lost"
+                                ).inc()
+                            return result
+        finally:
+            cancelled.set()
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _has_free_browser_slot(self, method):
+        """Faux si `method` est un navigateur dont le pool est saturé"""
+        if method == "selenium":
+            return self.webdriver_pool.has_free_slot()
+        if method == "playwright":
+            return self.playwright_pool.has_free_slot()
+        return True
+
+    def get_html(self, url, method_order=None, max_wait=10, hedge=None) -> str:
+        """Centralise la récupération du HTML avec fallback, rotation UA, proxy, retry, etc."""
+        return self.fetch_html(url, method_order, max_wait, hedge)["html"]
+
+    def get_html_many(self, urls, method_order=None, max_wait=10) -> list:
+        """Récupérer plusieurs URLs sur une seule boucle asyncio (ordre conservé)
+
+        Chaque élément est le HTML, ou l'exception levée pour cette URL.
+        """
+        return self._run_async(self.async_engine.get_many(urls, method_order, max_wait))
+
+    def scrape_with_scrapedo(self, url: str, params: Optional[dict] = None) -> dict:
         """Scraper avec Scrape.do"""
         try:
             if not self.config.HAS_SCRAPEDO:
                 raise Exception("Scrape.do API key non configurée")
 
+            circuit = provider_circuit("scrapedo")
+            self.breakers.check(circuit)
+
             api_url = "https://api.scrape.do/"
-            params.update(
-                {
-                    "token": self.config.SCRAPEDO_API_KEY,
-                    "url": url,
-                    # Ajouter d'autres paramètres scrape.do ici si besoin (super, geoCode, etc.)
-                }
-            )
-            response = requests.get(api_url, params=params, timeout=30)
-            response.raise_for_status()
+            # Dictionnaire propre à l'appel : les préchargements tournent en parallèle
+            params = {
+                **(params or {}),
+                "token": self.config.SCRAPEDO_API_KEY,
+                "url": url,
+                # Ajouter d'autres paramètres scrape.do ici si besoin (super, geoCode, etc.)
+            }
+
+            def attempt_scrapedo(attempt):
+                if attempt and self.breakers.is_open(circuit):
+                    raise CircuitOpenError(f"Disjoncteur {circuit} ouvert")
+                with self.sessions.stream(
+                    "GET", api_url, params=params, timeout=30
+                ) as response:
+                    response.raise_for_status()
+                    return self.response_reader.read(response)
+
+            try:
+                response = self.retry_policy.call(attempt_scrapedo, "Scrape.do")
+            except Exception as e:
+                self.breakers.record_failure(circuit, e)
+                raise
+            self.breakers.record_success(circuit)
             return {
                 "success": True,
                 "html": response.text,
@@ -178,52 +517,110 @@ class ScrapingService:
             logger.error(f"Erreur lors de la récupération du contenu: {e}")
             raise
 
+    def _selenium_options(self, proxy=None):
+        """Options Chrome des drivers du pool (User-Agent tiré à la création)"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(f"--user-agent={self._get_random_user_agent()}")
+        # Proxy attribué au driver par le pool (Chrome ignore les identifiants)
+        if proxy:
+            chrome_options.add_argument(f"--proxy-server={display_proxy(proxy)}")
+        return self.render_policy.configure_selenium_options(chrome_options)
+
     def get_site_content_selenium(self, url: str, max_wait: int = 10) -> str:
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(f"--user-agent={self._get_random_user_agent()}")
-            # Proxy support (si self.proxies)
-            if self.proxies and "http" in self.proxies:
-                chrome_options.add_argument(f"--proxy-server={self.proxies['http']}")
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.set_page_load_timeout(max_wait)
-            driver.get(url)
-            time.sleep(2)
-            html = driver.page_source
-            driver.quit()
-            return html
+            with self.webdriver_pool.checkout() as driver:
+                driver.set_page_load_timeout(max_wait)
+                proxy = self.webdriver_pool.proxy_for(driver)
+                try:
+                    with self.proxy_pool.track(proxy, url, rendered=True):
+                        driver.get(url)
+                finally:
+                    self.webdriver_pool.record_navigation(driver)
+                self.render_policy.wait_selenium(driver, max_wait)
+                return driver.page_source
         except Exception as e:
             logger.error(f"Erreur Selenium: {e}")
-            if "driver" in locals():
-                driver.quit()
             raise
 
     def get_site_content_playwright(self, url: str, max_wait: int = 10) -> str:
+        def render(context):
+            self.render_policy.install_playwright_blocking(context)
+            page = context.new_page()
+            page.set_default_timeout(max_wait * 1000)
+            self.render_policy.goto_playwright(page, url, max_wait)
+            return page.content()
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(user_agent=self._get_random_user_agent())
-                # Proxy support (si self.proxies)
-                if self.proxies and "http" in self.proxies:
-                    context = browser.new_context(
-                        user_agent=self._get_random_user_agent(),
-                        proxy={"server": self.proxies["http"]},
-                    )
-                page = context.new_page()
-                page.set_default_timeout(max_wait * 1000)
-                page.goto(url, wait_until="networkidle")
-                html = page.content()
-                browser.close()
-                return html
+            context_options = {"user_agent": self._get_random_user_agent()}
+            with self.proxy_pool.use(url, rendered=True) as proxy:
+                if proxy:
+                    context_options["proxy"] = playwright_proxy(proxy)
+                return self.playwright_pool.run(
+                    render,
+                    context_options=context_options,
+                    timeout=max_wait * 3
+                    + self.config.SCRAPING_PLAYWRIGHT_QUEUE_TIMEOUT,
+                )
         except Exception as e:
             logger.error(f"Erreur Playwright: {e}")
             raise
 
+    def _articles_from_feed(self, site_url, max_articles, html=None, extraction=None):
+        """Articles listés par le flux du site, complétés depuis leurs pages"""
+        try:
+            items = self.site_discovery.feed_items(site_url, max_articles, html)
+        except Exception as e:
+            logger.warning(f"Lecture des flux impossible pour {site_url}: {e}")
+            return []
+        candidates = [
+            {
+                "title": self._clean_text(item["title"]),
+                "url": item["url"],
+                "content": self._clean_text(item["summary"]),
+                "date": item["date"],
+            }
+            for item in items
+        ]
+        self._enrich_candidates(candidates, site_url, extraction)
+        articles = []
+        for candidate in candidates:
+            if not candidate["title"] or len(candidate["content"] or "") <= 30:
+                continue
+            article = {
+                "title": candidate["title"],
+                "url": candidate["url"],
+                "content": candidate["content"],
+            }
+            if candidate["date"]:
+                article["date"] = candidate["date"]
+            articles.append(article)
+        return articles
+
+    def _prefetch_next_pages(
+        self, prefetcher, html, page_url, remaining_pages, method=None
+    ):
+        """Précharger la page suivante (et les suivantes si le motif est évident)
+
+        Pas de spéculation au-delà de la page suivante avec une méthode payante.
+        """
+        if remaining_pages <= 0:
+            return
+        next_url = prescan_next_page_url(html, page_url)
+        if not next_url or next_url == page_url:
+            return
+        urls = [next_url]
+        if (
+            self.config.SCRAPING_PAGINATION_SPECULATIVE
+            and method not in self.PAID_METHODS
+        ):
+            urls += speculative_page_urls(page_url, next_url, remaining_pages - 1)
+        prefetcher.prefetch(urls)
+
     def find_next_page_url(self, soup, base_url):
         """Trouver l'URL de la page suivante"""
         try:
@@ -249,162 +646,139 @@ class ScrapingService:
             return None
 
     def extract_full_article_content(self, element, title):
-        """Extrait le contenu complet d'un article avec une approche hiérarchique"""
-        content_parts = []
-
-        # 1. Paragraphes principaux (priorité haute)
-        paragraphs = element.find_all("p")
-        for p in paragraphs:
-            txt = self._clean_text(p.get_text(strip=True))
-            if txt and len(txt) > 15 and txt != title:
-                # Éviter les doublons
-                if not any(txt in existing for existing in content_parts):
-                    content_parts.append(txt)
-
-        # 2. Contenu des divs avec classe spécifique
-        content_divs = element.find_all(
-            "div",
-            class_=lambda x: x
-            and any(
-                keyword in x.lower()
-                for keyword in [
-                    "content",
-                    "text",
-                    "body",
-                    "article",
-                    "post",
-                    "entry",
-                    "description",
-                    "excerpt",
-                    "summary",
-                ]
-            ),
-        )
-        for div in content_divs:
-            txt = self._clean_text(div.get_text(strip=True, separator="\n"))
-            if txt and len(txt) > 30 and txt != title:
-                if not any(txt in existing for existing in content_parts):
-                    content_parts.append(txt)
-
-        # 3. Sous-titres et intertitres
-        subtitles = element.find_all(["h2", "h3", "h4", "h5", "h6"])
-        for subtitle in subtitles:
-            txt = self._clean_text(subtitle.get_text(strip=True))
-            if txt and len(txt) > 10 and txt != title:
-                if not any(txt in existing for existing in content_parts):
-                    content_parts.append(txt)
-
-        # 4. Listes (ul, ol)
-        lists = element.find_all(["ul", "ol"])
-        for list_elem in lists:
-            if isinstance(list_elem, Tag):
-                items = list_elem.find_all("li")
-                for item in items:
-                    txt = self._clean_text(item.get_text(strip=True))
-                    if txt and len(txt) > 10:
-                        if not any(txt in existing for existing in content_parts):
-                            content_parts.append(txt)
-
-        # 5. Spans avec contenu textuel
-        spans = element.find_all("span")
-        for span in spans:
-            txt = self._clean_text(span.get_text(strip=True))
-            if txt and len(txt) > 20 and txt != title:
-                if not any(txt in existing for existing in content_parts):
-                    content_parts.append(txt)
-
-        # 6. Contenu des sections
-        sections = element.find_all("section")
-        for section in sections:
-            txt = self._clean_text(section.get_text(strip=True))
-            if txt and len(txt) > 50 and txt != title:
-                if not any(txt in existing for existing in content_parts):
-                    content_parts.append(txt)
-
-        # 7. Contenu des articles imbriqués
-        nested_articles = element.find_all("article")
-        for nested_article in nested_articles:
-            if nested_article != element:  # Éviter la récursion
-                txt = self._clean_text(nested_article.get_text(strip=True))
-                if txt and len(txt) > 30 and txt != title:
-                    if not any(txt in existing for existing in content_parts):
-                        content_parts.append(txt)
-
-        # Assembler le contenu
-        content = "\n\n".join(content_parts)
-
-        # Le nettoyage est géré par _clean_text
-        content = self._clean_text(content)
-
-        return content
+        """Extrait le contenu complet d'un article avec une approche hiérarchique
 
-    def extract_article_from_url(self, article_url, base_url):
-        """Extraire le contenu complet d'un article depuis son URL"""
+        Paragraphes, divs de contenu, intertitres, listes, spans, sections
+        puis articles imbriqués, relevés en un seul parcours du sous-arbre
+        (voir services.content_extractor).
+        """
+        return extract_content(element, title, self._clean_text)
+
+    def _fetch_article_html(self, article_url):
+        """Récupérer le HTML d'une page d'article (cache, requests puis Selenium)"""
+        self._check_robots(article_url)
+        entry = self.html_cache.lookup(article_url)
+        if entry and entry["fresh"]:
+            return entry["html"]
+        circuit = domain_circuit(urlparse(article_url).netloc)
+        self.breakers.check(circuit)
+
+        def attempt_article(attempt):
+            self._rate_limit(article_url)
+            with self.proxy_pool.use(article_url) as proxy, self.sessions.stream(
+                "GET",
+                article_url,
+                timeout=10,
+                headers={
+                    "User-Agent": self.ARTICLE_USER_AGENT,
+                    **self.html_cache.conditional_headers(entry),
+                },
+                proxies=requests_proxies(proxy),
+            ) as response:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return self.response_reader.read(response)
+
+        # Essayer d'abord avec requests
         try:
-            # Essayer d'abord avec requests
+            response = self.retry_policy.call(attempt_article, f"Article {article_url}")
+            if response.status_code == 304 and entry:
+                self.breakers.record_success(circuit)
+                self.html_cache.mark_revalidated(article_url, entry)
+                return entry["html"]
+            html = response.text
+            self.breakers.record_success(circuit)
+            self.html_cache.store(
+                article_url,
+                html,
+                "requests",
+                *self.html_cache.validators(response.headers),
+            )
+            return html
+        except ContentRejectedError:
+            # PDF, vidéo ou page démesurée : un navigateur n'y changerait rien
+            raise
+        except Exception as e:
+            self.breakers.record_failure(circuit, e)
+            # Fallback vers Selenium
             try:
-                response = requests.get(
-                    article_url,
-                    timeout=10,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    },
-                )
-                response.raise_for_status()
-                # Ensure correct encoding
-                if response.encoding is None or response.encoding == "ISO-8859-1":
-                    response.encoding = "utf-8"
-                html = response.text
-            except Exception:
-                # Fallback vers Selenium
                 html = self.get_site_content_selenium(article_url)
+            except Exception as selenium_error:
+                self.breakers.record_failure(circuit, selenium_error, rendered=True)
+                raise
+            self.breakers.record_success(circuit)
+            self.html_cache.store(article_url, html, "selenium")
+            return html
+
+    def _extraction_mode(self, url, extraction=None):
+        """Mode d'extraction : celui de la requête, sinon celui du domaine, sinon la configuration"""
+        if extraction:
+            return extraction
+        domain = urlparse(url).netloc.lower()
+        return self.extraction_overrides.get(
+            domain, self.config.SCRAPING_EXTRACTION_MODE
+        )
+
+    def extract_article_from_url(
+        self, article_url, base_url, html=None, extraction=None
+    ):
+        """Extraire le contenu complet d'un article depuis son URL
 
-            soup = BeautifulSoup(html, "html.parser")
+        `html` permet de fournir une page déjà récupérée (ex: moteur async).
+        `extraction` choisit le mode ("selectors" ou "readability").
+        """
+        try:
+            if html is None:
+                html = self._fetch_article_html(article_url)
+
+            mode = self._extraction_mode(article_url, extraction)
+            # Readability travaille sur l'arbre lxml
+            soup = parse_html(html, "lxml" if mode == "readability" else None)
+
+            # Article complet déclaré en données structurées : pas d'heuristique DOM
+            if self.config.SCRAPING_STRUCTURED_DATA:
+                record = article_record(html, article_url, soup)
+                content = self._clean_text(record["content"]) if record else ""
+                if len(content) > 100:
+                    return {
+                        "title": self._clean_text(record["title"]),
+                        "content": content,
+                        "date": record["date"],
+                        "url": article_url,
+                    }
 
             # Extraire le titre
-            title_selectors = ["h1", "h2", ".title", ".article-title", ".post-title"]
             title = ""
-            for selector in title_selectors:
+            for selector in self.ARTICLE_TITLE_SELECTORS:
                 title_elem = soup.select_one(selector)
                 if title_elem:
                     title = self._clean_text(title_elem.get_text(strip=True))
                     break
 
-            # Extraire le contenu principal
-            content_selectors = [
-                "article",
-                ".article-content",
-                ".post-content",
-                ".entry-content",
-                ".content",
-                ".main-content",
-                ".article-body",
-                ".post-body",
-            ]
-
-            content = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = self.extract_full_article_content(content_elem, title)
-                    if content and len(content) > 100:
-                        break
-
             # Extraire la date
-            date_selectors = [
-                "time",
-                ".date",
-                ".published",
-                ".post-date",
-                ".article-date",
-            ]
             date_str = ""
-            for selector in date_selectors:
+            for selector in self.ARTICLE_DATE_SELECTORS:
                 date_elem = soup.select_one(selector)
                 if date_elem:
                     date_str = self._clean_text(date_elem.get_text(strip=True))
                     break
 
+            # Extraire le contenu principal (Readability modifie l'arbre : en dernier)
+            content = ""
+            if mode == "readability":
+                content = self._clean_text(
+                    self.readability.extract(soup, url=article_url)
+                )
+                if len(content) <= 100:
+                    logger.info(
+                        f"Readability insuffisant pour {article_url}, repli sur les sélecteurs"
+                    )
+                    content = ""
+            if not content:
+                content = self._content_from_selectors(
+                    soup, title, self.ARTICLE_CONTENT_SELECTORS
+                )
+
             return {
                 "title": title,
                 "content": content,
@@ -416,11 +790,276 @@ class ScrapingService:
             logger.error(f"Erreur lors de l'extraction depuis URL: {e}")
             return None
 
+    def _content_from_selectors(self, soup, title, selectors):
+        """Contenu du premier conteneur offrant plus de 100 caractères"""
+        content = ""
+        for selector in selectors:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                content = self.extract_full_article_content(content_elem, title)
+                if content and len(content) > 100:
+                    return content
+        return content
+
+    def _collect_listing_articles(
+        self, matches, page_url, articles, max_articles, extraction=None
+    ):
+        """Ajouter à `articles` ceux des éléments de listing (sélecteur, éléments)
+
+        Retourne le nombre d'articles retenus par sélecteur.
+        """
+        # Set pour éviter les doublons
+        seen_titles = set()
+        produced = {}
+
+        for selector, elements in matches:
+            logger.info(f"Sélecteur '{selector}': {len(elements)} éléments trouvés")
+
+            # Extraire les candidats de ce sélecteur
+            candidates = []
+            for element in elements[:max_articles]:  # Limiter par page
+                try:
+                    candidate = self._parse_listing_element(
+                        element, page_url, seen_titles
+                    )
+                    if candidate:
+                        candidates.append(candidate)
+                except Exception as e:
+                    logger.warning(f"Erreur lors de l'extraction d'un article: {e}")
+                    continue
+
+            count = self._add_candidates(candidates, page_url, articles, extraction)
+            if count:
+                produced[selector] = count
+
+            if len(articles) >= max_articles:
+                break
+
+        return produced
+
+    def _collect_structured_articles(
+        self, html, soup, page_url, articles, max_articles, extraction=None
+    ):
+        """Ajouter à `articles` ceux déclarés en données structurées par la page
+
+        Retourne le nombre d'articles retenus (0 si la page en déclare trop peu).
+        """
+        records = listing_records(html, page_url, soup)
+        known = {article["url"] for article in articles}
+        seen_titles = {article["title"].lower() for article in articles}
+        candidates = []
+        for record in records:
+            title = self._clean_text(record["title"])
+            if (
+                record["url"] in known
+                or title.lower() in seen_titles
+                or not self._is_listing_title(title)
+            ):
+                continue
+            seen_titles.add(title.lower())
+            candidates.append(
+                {
+                    "title": title,
+                    "url": record["url"],
+                    "content": self._clean_text(record["content"]),
+                    "date": record["date"],
+                }
+            )
+        if len(candidates) < self.config.SCRAPING_STRUCTURED_MIN_RECORDS:
+            return 0
+        logger.info(f"{len(candidates)} articles déclarés en données structurées")
+        return self._add_candidates(
+            candidates[: max_articles - len(articles)], page_url, articles, extraction
+        )
+
+    def _add_candidates(self, candidates, page_url, articles, extraction=None):
+        """Compléter les candidats puis ajouter à `articles` ceux au contenu suffisant"""
+        count = 0
+        # Compléter en parallèle les contenus insuffisants
+        self._enrich_candidates(candidates, page_url, extraction)
+
+        for candidate in candidates:
+            title = candidate["title"]
+            content = candidate["content"]
+            # Vérifier que le contenu est suffisant
+            if content and len(content) > 30:  # Réduit pour être moins strict
+                article_data = {
+                    "title": title,
+                    "url": candidate["url"],
+                    "content": content,
+                }
+
+                if candidate["date"]:
+                    article_data["date"] = candidate["date"]
+
+                articles.append(article_data)
+                count += 1
+                logger.info(
+                    f"Article ajouté: {title[:50]}... (contenu: {len(content)} chars)"
+                )
+            else:
+                logger.info(f"Article ignoré (contenu insuffisant): {title[:50]}...")
+
+        return count
+
+    def _is_listing_title(self, title):
+        """Titre d'article plausible : assez long et hors libellés de navigation"""
+        return len(title) >= 10 and title.lower() not in self.NAVIGATION_TITLES
+
+    def _parse_listing_element(self, element, page_url, seen_titles):
+        """Extraire un candidat article (titre, url, contenu, date) d'un élément de listing"""
+        title_elem = element.find(["h1", "h2", "h3", "h4"])
+        link_elem = element.find("a")
+
+        if not title_elem:  # Seulement vérifier le titre, pas le lien
+            return None
+
+        title = self._clean_text(title_elem.get_text(strip=True))
+
+        # Filtrer les titres trop courts ou non pertinents
+        if not self._is_listing_title(title):
+            return None
+
+        # Éviter les doublons
+        title_normalized = title.lower().strip()
+        if title_normalized in seen_titles:
+            logger.info(f"Titre dupliqué ignoré: {title[:50]}...")
+            return None
+        seen_titles.add(title_normalized)
+
+        logger.info(f"Titre trouvé: {title[:50]}...")
+        url = ""
+        if link_elem:
+            href_value = link_elem.get("href")
+            if href_value:
+                url = str(href_value)
+                try:
+                    url = urljoin(page_url, url)
+                except Exception:
+                    url = ""
+
+        if not url:  # Si pas de lien trouvé, utiliser l'URL courante
+            url = page_url
+
+        # Extraction du contenu avec approche hiérarchique
+        content = self.extract_full_article_content(element, title)
+
+        # Ajouter une date si disponible
+        date_str = ""
+        date_elem = element.find(
+            ["time", "span.date", "div.date", "span.timestamp", "span.time", "div.time"]
+        )
+        if date_elem:
+            date_str = self._clean_text(date_elem.get_text(strip=True))
+
+        return {"title": title, "url": url, "content": content, "date": date_str}
+
+    def _enrich_candidates(self, candidates, page_url, extraction=None):
+        """Compléter depuis leur URL les candidats dont le contenu est insuffisant"""
+        to_enrich = [
+            candidate
+            for candidate in candidates
+            if (not candidate["content"] or len(candidate["content"]) < 100)
+            and candidate["url"]
+            and candidate["url"] != page_url
+        ]
+        if not to_enrich:
+            return
+
+        logger.info(
+            f"Contenu insuffisant pour {len(to_enrich)} article(s), extraction depuis leurs URLs"
+        )
+        full_articles = self.fetch_articles_concurrently(
+            [candidate["url"] for candidate in to_enrich], page_url, extraction
+        )
+        for candidate, full_article in zip(to_enrich, full_articles):
+            if full_article and full_article.get("content"):
+                candidate["content"] = full_article["content"]
+                # Mettre à jour le titre si meilleur
+                if full_article.get("title") and len(full_article["title"]) > len(
+                    candidate["title"]
+                ):
+                    candidate["title"] = full_article["title"]
+
+    @contextmanager
+    def _detail_slot(self, domain):
+        """Créneau de récupération d'article du domaine
+
+        Le sémaphore du domaine est oublié dès que plus personne ne le tient
+        ni ne l'attend : le dict ne garde que les domaines en cours.
+        """
+        with self._detail_lock:
+            entry = self._detail_semaphores.get(domain)
+            if entry is None:
+                semaphore = threading.BoundedSemaphore(
+                    self.config.SCRAPING_DETAIL_CONCURRENCY_PER_DOMAIN
+                )
+                entry = self._detail_semaphores[domain] = [semaphore, 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._detail_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._detail_semaphores[domain]
+
+    def fetch_articles_concurrently(self, article_urls, base_url, extraction=None):
+        """Extraire plusieurs articles en parallèle (résultats dans l'ordre des URLs)"""
+        if not article_urls:
+            return []
+
+        def fetch(article_url):
+            with self._detail_slot(urlparse(article_url).netloc):
+                return self.extract_article_from_url(
+                    article_url, base_url, extraction=extraction
+                )
+
+        if self.fetch_engine == "async":
+            htmls = self._run_async(
+                self.async_engine.get_many(
+                    article_urls,
+                    fetcher=self.async_engine.fetch_article_html,
+                    per_host=self.config.SCRAPING_DETAIL_CONCURRENCY_PER_DOMAIN,
+                )
+            )
+            results = []
+            for article_url, html in zip(article_urls, htmls):
+                if isinstance(html, BaseException):
+                    logger.error(f"Erreur lors de l'extraction depuis URL: {html}")
+                    results.append(None)
+                else:
+                    results.append(
+                        self.extract_article_from_url(
+                            article_url, base_url, html=html, extraction=extraction
+                        )
+                    )
+            return results
+
+        max_workers = min(len(article_urls), self.config.SCRAPING_DETAIL_CONCURRENCY)
+        if max_workers <= 1:
+            return [fetch(article_url) for article_url in article_urls]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, article_urls))
+
     def extract_articles_complete(
-        self, site_url, method="scrapedo", max_articles=20, max_ia_summaries=10
+        self,
+        site_url,
+        method="scrapedo",
+        max_articles=20,
+        max_ia_summaries=10,
+        hedge=None,
+        extraction=None,
     ):
-        """Logique complète d'extraction d'articles avec fallback et IA"""
+        """Logique complète d'extraction d'articles avec fallback et IA
+
+        `extraction` force le mode d'extraction des pages d'articles
+        ("selectors" ou "readability") ; par défaut, celui du domaine.
+        """
         try:
+            if extraction and extraction not in EXTRACTION_MODES:
+                raise ValueError(f"Mode d'extraction inconnu: {extraction}")
             if not site_url.startswith(("http://", "https://")):
                 site_url = "https://" + site_url
 
@@ -433,7 +1072,7 @@ class ScrapingService:
             url_to_scrape = site_url
             method_used = ""
             feedback = ""
-            html_pages = []
+            first_page_html = ""
 
             try:
                 max_articles = int(max_articles)
@@ -446,241 +1085,178 @@ class ScrapingService:
 
             start_time = time.time()
 
-            # Boucle de pagination (max 5 pages)
-            for page_num in range(5):
-                html = ""
-                try:
-                    # Utilisation de la méthode centralisée
-                    html = self.get_html(
-                        url_to_scrape,
-                        method_order=[method, "requests", "selenium", "playwright"],
-                    )
-                    method_used = method
-                except Exception as e:
-                    logger.warning(
-                        f"Toutes les méthodes de récupération HTML ont échoué: {e}"
-                    )
-                    feedback = f"Impossible de récupérer le contenu du site: {e}"
+            # Source rapide : flux RSS/Atom ou sitemap news déjà connu pour le site
+            if self.config.SCRAPING_USE_FEEDS:
+                articles = self._articles_from_feed(
+                    site_url, max_articles, extraction=extraction
+                )
+                if articles:
+                    method_used = "feed"
+                    feedback += "Articles issus du flux du site. "
+
+            # Boucle de pagination : la page suivante est récupérée en arrière-plan
+            # pendant l'extraction de la page courante
+            max_pages = 0 if articles else self.config.SCRAPING_MAX_PAGES
+            prefetcher = PagePrefetcher(
+                lambda url: self.fetch_html(
+                    url,
+                    method_order=[method, "requests", "selenium", "playwright"],
+                    hedge=hedge,
+                ),
+                self.config.SCRAPING_PREFETCH_WORKERS,
+                wait=self._hold_request_slot,
+            )
+            with prefetcher:
+                for page_num in range(max_pages):
                     html = ""
-                if not html:
-                    break
-                html_pages.append(html)
-
-                try:
-                    soup = BeautifulSoup(
-                        html, "html.parser"
-                    )  # Removed from_encoding='utf-8'
-                    # Sélecteurs CSS pour trouver les articles
-                    selectors = [
-                        # Sélecteurs génériques
-                        "article",
-                        "div.news-item",
-                        "div.post",
-                        "div.blog-post",
-                        "li.news-item",
-                        "div.article",
-                        "div.story",
-                        # Sélecteurs supplémentaires pour sites tech/actualités
-                        "div.news",
-                        "div.actualite",
-                        "div.news-article",
-                        "li.article",
-                        "div.entry",
-                        "div.content-article",
-                        "section.article",
-                        "div.news-content",
-                        "div.article-content",
-                        "div.news-block",
-                        "div.article-block",
-                        "div.post-content",
-                        "div.news-summary",
-                        "div.article-summary",
-                        "div.news-excerpt",
-                        # Sélecteurs spécifiques pour sites français
-                        "div.article-item",
-                        "div.news-card",
-                        "div.article-card",
-                        "li.news",
-                        "div.actualite-item",
-                        "div.article-preview",
-                        "div.article-teaser",
-                        "div.news-teaser",
-                        "div.article-snippet",
-                        # Sélecteurs pour sites d'actualités
-                        "div.article-list-item",
-                        "div.news-list-item",
-                        "div.article-entry",
-                        "article.article",
-                        "div.article-wrapper",
-                        "div.news-wrapper",
-                        # Sélecteurs pour sites de blogs
-                        "div.blog-entry",
-                        "div.post-item",
-                        "div.blog-item",
-                        "li.blog-post",
-                        "div.blog-article",
-                        "div.post-article",
-                    ]
-
-                    logger.info(
-                        f"Page {page_num + 1}: Recherche d'articles avec {len(selectors)} sélecteurs"
-                    )
+                    try:
+                        # Utilisation de la méthode centralisée
+                        fetch_result = prefetcher.get(url_to_scrape)
+                        html = fetch_result["html"]
+                        if not method_used:
+                            # Méthode de la première page ; les suffixes (+structured...) s'y ajoutent
+                            feedback += f"Méthode {fetch_result['method']}: {fetch_result['reason']}. "
+                            method_used = fetch_result["method"]
+                    except Exception as e:
+                        logger.warning(
+                            f"Toutes les méthodes de récupération HTML ont échoué: {e}"
+                        )
+                        feedback = f"Impossible de récupérer le contenu du site: {e}"
+                        html = ""
+                    if not html:
+                        break
+                    if not first_page_html:
+                        # Seul le début de la première page sert au repli IA
+                        first_page_html = html[:10000]
+                        if self.config.SCRAPING_USE_FEEDS:
+                            # Flux annoncé par la page : inutile de la parser
+                            articles = self._articles_from_feed(
+                                site_url, max_articles, html, extraction
+                            )
+                            if articles:
+                                method_used = "feed"
+                                feedback += "Articles issus du flux du site. "
+                                break
+                    if self.config.SCRAPING_PAGINATION_PREFETCH:
+                        self._prefetch_next_pages(
+                            prefetcher,
+                            html,
+                            url_to_scrape,
+                            max_pages - page_num - 1,
+                            fetch_result["method"],
+                        )
 
-                    # Set pour éviter les doublons
-                    seen_titles = set()
+                    try:
+                        soup = parse_html(html)
+                        # Sélecteurs CSS pour trouver les articles
+                        selectors = self.LISTING_SELECTORS
 
-                    for selector in selectors:
-                        elements = soup.select(selector)
                         logger.info(
-                            f"Sélecteur '{selector}': {len(elements)} éléments trouvés"
+                            f"Page {page_num + 1}: Recherche d'articles avec {len(selectors)} sélecteurs"
                         )
 
-                        for element in elements[:max_articles]:  # Limiter par page
-                            try:
-                                title_elem = element.find(["h1", "h2", "h3", "h4"])
-                                link_elem = element.find("a")
-
-                                if (
-                                    title_elem
-                                ):  # Seulement vérifier le titre, pas le lien
-                                    title = self._clean_text(
-                                        title_elem.get_text(strip=True)
+                        # Données structurées (JSON-LD, état embarqué, microdata) d'abord
+                        structured = (
+                            self._collect_structured_articles(
+                                html,
+                                soup,
+                                url_to_scrape,
+                                articles,
+                                max_articles,
+                                extraction,
+                            )
+                            if self.config.SCRAPING_STRUCTURED_DATA
+                            else 0
+                        )
+                        if structured:
+                            if "+structured" not in method_used:
+                                method_used += "+structured"
+                                feedback += "Données structurées de la page utilisées. "
+                        else:
+                            profile = self.extraction_profiles.listing(domain)
+                            produced = None
+                            if profile:
+                                # Sélecteurs appris d'abord : scan complet si le rendement chute
+                                before = len(articles)
+                                produced = self._collect_listing_articles(
+                                    self.extraction_profiles.listing_matcher(
+                                        profile
+                                    ).match(soup),
+                                    url_to_scrape,
+                                    articles,
+                                    max_articles,
+                                    extraction,
+                                )
+                                if self.extraction_profiles.yield_dropped(
+                                    profile,
+                                    len(articles) - before,
+                                    max_articles - before,
+                                ):
+                                    logger.info(
+                                        f"Rendement du profil de {domain} en baisse, scan complet"
                                     )
+                                    del articles[before:]
+                                    produced = None
+                            if produced is None:
+                                produced = self._collect_listing_articles(
+                                    self.listing_matcher.match(soup),
+                                    url_to_scrape,
+                                    articles,
+                                    max_articles,
+                                    extraction,
+                                )
+                                profile = None
+                            self.extraction_profiles.record_listing(
+                                domain, produced, selectors, profile
+                            )
 
-                                    # Filtrer les titres trop courts ou non pertinents
-                                    if len(title) < 10 or title.lower() in [
-                                        "accueil",
-                                        "menu",
-                                        "navigation",
-                                        "footer",
-                                        "boutique",
-                                        "services",
-                                    ]:
-                                        continue
-
-                                    # Éviter les doublons
-                                    title_normalized = title.lower().strip()
-                                    if title_normalized in seen_titles:
-                                        logger.info(
-                                            f"Titre dupliqué ignoré: {title[:50]}..."
-                                        )
-                                        continue
-                                    seen_titles.add(title_normalized)
-
-                                    logger.info(f"Titre trouvé: {title[:50]}...")
-                                    url = ""
-                                    if link_elem and isinstance(link_elem, Tag):
-                                        href_value = link_elem.get("href")
-                                        if href_value:
-                                            url = str(href_value)
-                                            try:
-                                                url = urljoin(url_to_scrape, url)
-                                            except Exception:
-                                                url = ""
-
-                                    if (
-                                        not url
-                                    ):  # Si pas de lien trouvé, utiliser l'URL courante
-                                        url = url_to_scrape
-
-                                    if (
-                                        title
-                                    ):  # Ajouter l'article si on a au moins un titre
-                                        # Extraction du contenu avec approche hiérarchique
-                                        content = self.extract_full_article_content(
-                                            element, title
-                                        )
-
-                                        # Si le contenu est insuffisant, essayer d'extraire depuis l'URL de l'article
-                                        if not content or len(content) < 100:
-                                            if url and url != url_to_scrape:
-                                                logger.info(
-                                                    f"Contenu insuffisant, tentative d'extraction depuis l'URL: {url}"
-                                                )
-                                                full_article = (
-                                                    self.extract_article_from_url(
-                                                        url, url_to_scrape
-                                                    )
-                                                )
-                                                if full_article and full_article.get(
-                                                    "content"
-                                                ):
-                                                    content = full_article["content"]
-                                                    # Mettre à jour le titre si meilleur
-                                                    if full_article.get(
-                                                        "title"
-                                                    ) and len(
-                                                        full_article["title"]
-                                                    ) > len(
-                                                        title
-                                                    ):
-                                                        title = full_article["title"]
-
-                                        # Vérifier que le contenu est suffisant
-                                        if (
-                                            content and len(content) > 30
-                                        ):  # Réduit pour être moins strict
-                                            # Ajouter une date si disponible
-                                            date_str = ""
-                                            date_elem = element.find(
-                                                [
-                                                    "time",
-                                                    "span.date",
-                                                    "div.date",
-                                                    "span.timestamp",
-                                                    "span.time",
-                                                    "div.time",
-                                                ]
-                                            )
-                                            if date_elem:
-                                                date_str = self._clean_text(
-                                                    date_elem.get_text(strip=True)
-                                                )
-
-                                            article_data = {
-                                                "title": title,
-                                                "url": url,
-                                                "content": content,
-                                            }
-
-                                            if date_str:
-                                                article_data["date"] = date_str
-
-                                            articles.append(article_data)
-                                            logger.info(
-                                                f"Article ajouté: {title[:50]}... (contenu: {len(content)} chars)"
-                                            )
-                                        else:
-                                            logger.info(
-                                                f"Article ignoré (contenu insuffisant): {title[:50]}..."
-                                            )
-
-                            except Exception as e:
-                                logger.warning(
-                                    f"Erreur lors de l'extraction d'un article: {e}"
+                            if (
+                                not produced
+                                and self.config.SCRAPING_AI_FALLBACK_MODE == "spec"
+                            ):
+                                # Sélecteurs JSON générés une fois par domaine par le LLM
+                                candidates = self.llm_specs.candidates(
+                                    domain,
+                                    soup,
+                                    html,
+                                    url_to_scrape,
+                                    self._clean_text,
+                                    self.extract_full_article_content,
+                                    generate=page_num == 0,
                                 )
-                                continue
+                                if self._add_candidates(
+                                    candidates[:max_articles],
+                                    url_to_scrape,
+                                    articles,
+                                    extraction,
+                                ):
+                                    if "+ia-spec" not in method_used:
+                                        method_used += "+ia-spec"
+                                        feedback += (
+                                            "Sélecteurs générés par IA utilisés. "
+                                        )
 
                         if len(articles) >= max_articles:
                             break
 
-                    if len(articles) >= max_articles:
-                        break
+                        next_url = self.find_next_page_url(soup, url_to_scrape)
+                        if not next_url or next_url == url_to_scrape:
+                            break
+                        url_to_scrape = next_url
 
-                    next_url = self.find_next_page_url(soup, url_to_scrape)
-                    if not next_url or next_url == url_to_scrape:
+                    except Exception as e:
+                        logger.error(f"Erreur lors du parsing HTML: {e}")
                         break
-                    url_to_scrape = next_url
-
-                except Exception as e:
-                    logger.error(f"Erreur lors du parsing HTML: {e}")
-                    break
 
-            # Fallback IA si aucun article trouvé
-            if not articles and html_pages:
+            # Fallback IA si aucun article trouvé (HTML brut envoyé au LLM)
+            if (
+                not articles
+                and first_page_html
+                and self.config.SCRAPING_AI_FALLBACK_MODE == "raw"
+            ):
                 logger.info("Aucun article trouvé, fallback extraction IA...")
                 logger.info(
-                    f"HTML de la première page (premiers 500 caractères): {html_pages[0][:500]}"
+                    f"HTML de la première page (premiers 500 caractères): {first_page_html[:500]}"
                 )
 
                 try:
@@ -688,7 +1264,7 @@ class ScrapingService:
                     prompt = f"""
                     Voici le HTML d'une page d'actualité :
                     ---
-                    {html_pages[0][:10000]}
+                    {first_page_html}
                     ---
                     Ta mission : extraire tous les articles (titre, url, date, contenu principal) et retourne une liste JSON. Ne génère aucun code, ne donne que les données extraites.
                     """
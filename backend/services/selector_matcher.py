@@ -0,0 +1,103 @@
+"""
+Liste de sélecteurs CSS compilée en un seul parcours du document
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import re
+from services.html_parser import node_key
+
+logger = logging.getLogger(__name__)
+
+# Sélecteur simple : balise optionnelle suivie de classes (div.news.item)
+_SIMPLE_SELECTOR_RE = re.compile(r"^([a-zA-Z][\w-]*|\*)?((?:\.[\w-]+)*)$")
+
+
+def _compile(selector):
+    """(balise ou None, classes requises) ; None si le sélecteur est complexe"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    tag = match.group(1)
+    classes = frozenset(c for c in match.group(2).split(".") if c)
+    return (None if tag in (None, "*") else tag.lower()), classes
+
+
+def _classes(element):
+    value = element.get("class")
+    if not value:
+        return frozenset()
+    return frozenset(value.split() if isinstance(value, str) else value)
+
+
+class SelectorMatcher:
+    """Attribue à chaque élément le premier sélecteur de la liste qui le désigne
+
+    Les sélecteurs « balise.classe » sont indexés par balise : un seul
+    parcours de l'arbre (find_all sur ces balises) suffit, puis chaque
+    élément est testé contre les seules règles de sa balise. Les sélecteurs
+    complexes passent par select(). Un élément désigné par plusieurs
+    sélecteurs n'est retenu qu'une fois, sous le premier.
+    """
+
+    def __init__(self, selectors):
+        self.selectors = list(selectors)
+        self._by_tag = {}
+        self._any_tag = []
+        self._complex = []
+        for priority, selector in enumerate(self.selectors):
+            compiled = _compile(selector)
+            if compiled is None:
+                self._complex.append((priority, selector))
+                continue
+            tag, classes = compiled
+            if tag is None:
+                self._any_tag.append((priority, classes))
+            else:
+                self._by_tag.setdefault(tag, []).append((priority, classes))
+        if self._any_tag:
+            # Règles sans balise : fusionnées dans chaque balise, ordre conservé
+            for tag, rules in self._by_tag.items():
+                rules.extend(self._any_tag)
+                rules.sort(key=lambda rule: rule[0])
+
+    def _first_match(self, element):
+        rules = self._by_tag.get(element.name, self._any_tag)
+        classes = None
+        for priority, required in rules:
+            if required:
+                if classes is None:
+                    classes = _classes(element)
+                if not required <= classes:
+                    continue
+            return priority
+        return None
+
+    def match(self, soup):
+        """[(sélecteur, éléments)] dans l'ordre de la liste, éléments dans l'ordre du document"""
+        if self._any_tag or self._complex:
+            candidates = soup.find_all()
+        else:
+            candidates = soup.find_all(list(self._by_tag))
+        assigned = {}
+        for position, element in enumerate(candidates):
+            priority = self._first_match(element)
+            if priority is not None or self._complex:
+                assigned[node_key(element)] = [priority, position, element]
+        for priority, selector in self._complex:
+            for element in soup.select(selector):
+                entry = assigned.get(node_key(element))
+                if entry is not None and (entry[0] is None or entry[0] > priority):
+                    entry[0] = priority
+        buckets = [[] for _ in self.selectors]
+        for priority, _, element in sorted(
+            (entry for entry in assigned.values() if entry[0] is not None),
+            key=lambda entry: entry[1],
+        ):
+            buckets[priority].append(element)
+        return list(zip(self.selectors, buckets))
@@ -0,0 +1,322 @@
+"""
+robots.txt, sitemaps news et flux RSS/Atom : règles de crawl et sources rapides d'articles
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import logging
+import re
+import threading
+import time
+from html import unescape
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+from database.redis_connector import redis_connector
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class RobotsDisallowedError(Exception):
+    """URL interdite par le robots.txt du site"""
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme or 'https'}://{parsed.netloc}"
+
+
+def _in_scope(listing_url, url):
+    """Vrai si `url` relève de la rubrique `listing_url` (la racine couvre tout le site)"""
+    listing = urlparse(listing_url)
+    section = listing.path.rstrip("/")
+    if not section:
+        return not listing.query
+    path = urlparse(url).path
+    return path == section or path.startswith(f"{section}/")
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def _child(element, *names):
+    for child in element:
+        if _local(child.tag) in names:
+            return child
+    return None
+
+
+def _text(element, *names):
+    child = _child(element, *names)
+    if child is None or child.text is None:
+        return ""
+    return child.text.strip()
+
+
+def _strip_tags(value):
+    return " ".join(_TAG_RE.sub(" ", unescape(value or "")).split())
+
+
+def parse_feed(xml_text, base_url=""):
+    """Lire un flux RSS/Atom ou un sitemap
+
+    Retourne (type, entrées) ; type vaut "rss", "atom", "sitemap",
+    "sitemapindex" ou None si le document n'est pas reconnu. Chaque entrée
+    est {"url", "title", "date", "summary", "news"}.
+    """
+    try:
+        root = ElementTree.fromstring(xml_text.strip())
+    except (ElementTree.ParseError, ValueError):
+        return None, []
+    kind = _local(root.tag)
+    items = []
+    if kind in ("rss", "rdf"):
+        for item in root.iter():
+            if _local(item.tag) != "item":
+                continue
+            items.append(
+                {
+                    "url": _text(item, "link"),
+                    "title": _strip_tags(_text(item, "title")),
+                    "date": _text(item, "pubdate", "date"),
+                    "summary": _strip_tags(_text(item, "description", "encoded")),
+                    "news": False,
+                }
+            )
+        kind = "rss"
+    elif kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            url = ""
+            for link in entry:
+                if _local(link.tag) == "link" and link.get("rel") in (
+                    None,
+                    "alternate",
+                ):
+                    url = link.get("href", "")
+                    break
+            items.append(
+                {
+                    "url": url,
+                    "title": _strip_tags(_text(entry, "title")),
+                    "date": _text(entry, "published", "updated"),
+                    "summary": _strip_tags(_text(entry, "summary", "content")),
+                    "news": False,
+                }
+            )
+        kind = "atom"
+    elif kind in ("urlset", "sitemapindex"):
+        for node in root:
+            if _local(node.tag) not in ("url", "sitemap"):
+                continue
+            news = _child(node, "news")
+            items.append(
+                {
+                    "url": _text(node, "loc"),
+                    "title": _text(news, "title") if news is not None else "",
+                    "date": (
+                        _text(news, "publication_date") if news is not None else ""
+                    )
+                    or _text(node, "lastmod"),
+                    "summary": "",
+                    "news": news is not None,
+                }
+            )
+        kind = "sitemap" if kind == "urlset" else kind
+    else:
+        return None, []
+    for item in items:
+        item["url"] = urljoin(base_url, item["url"]) if item["url"] else ""
+    return kind, [item for item in items if item["url"]]
+
+
+def feed_links(html, base_url):
+    """Flux RSS/Atom annoncés par <link rel="alternate"> dans une page HTML"""
+    links = []
+    for match in _LINK_TAG_RE.finditer(html or ""):
+        attrs = {
+            m.group(1).lower(): unescape(m.group(2) or m.group(3) or m.group(4) or "")
+            for m in _ATTR_RE.finditer(match.group(0))
+        }
+        if (
+            "alternate" in attrs.get("rel", "").lower().split()
+            and attrs.get("type", "").lower() in _FEED_TYPES
+            and attrs.get("href")
+        ):
+            links.append(urljoin(base_url, attrs["href"]))
+    return list(dict.fromkeys(links))
+
+
+class SiteDiscovery:
+    """robots.txt et sources de liens d'articles, une fois par domaine
+
+    Le texte du robots.txt et la liste des flux découverts sont partagés via
+    Redis (repli en mémoire) avec un TTL ; le robots.txt analysé reste en
+    mémoire du processus jusqu'à expiration. Un robots.txt absent ou
+    inaccessible autorise tout. Le Crawl-delay est transmis au scheduler.
+    """
+
+    ROBOTS_PREFIX = "robots_txt"
+    FEEDS_PREFIX = "site_feeds"
+
+    def __init__(
+        self,
+        fetch,
+        scheduler=None,
+        cache=None,
+        ttl=None,
+        error_ttl=None,
+        user_agent=None,
+        max_crawl_delay=None,
+        max_sitemap_fetches=None,
+    ):
+        self.fetch = fetch
+        self.scheduler = scheduler
+        self.cache = cache or redis_connector
+        self.ttl = ttl or Config.SCRAPING_ROBOTS_TTL
+        self.error_ttl = error_ttl or Config.SCRAPING_ROBOTS_ERROR_TTL
+        self.user_agent = user_agent or Config.SCRAPING_ROBOTS_USER_AGENT
+        self.max_crawl_delay = max_crawl_delay or Config.SCRAPING_MAX_CRAWL_DELAY
+        self.max_sitemap_fetches = (
+            max_sitemap_fetches or Config.SCRAPING_SITEMAP_MAX_FETCHES
+        )
+        self._robots = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _origin_lock(self, origin):
+        with self._lock:
+            if origin not in self._locks:
+                self._locks[origin] = threading.Lock()
+            return self._locks[origin]
+
+    def _download_robots(self, origin):
+        """Texte du robots.txt (vide si absent) et durée de validité"""
+        try:
+            return self.fetch(f"{origin}/robots.txt"), self.ttl
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status is not None and 400 <= status < 500:
+                return "", self.ttl
+            logger.warning(f"robots.txt inaccessible pour {origin}: {e}")
+            return "", self.error_ttl
+
+    def robots(self, url):
+        """RobotFileParser du domaine de `url` (téléchargé au plus une fois par TTL)"""
+        origin = _origin(url)
+        entry = self._robots.get(origin)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        with self._origin_lock(origin):
+            entry = self._robots.get(origin)
+            if entry and entry[1] > time.time():
+                return entry[0]
+            key = f"{self.ROBOTS_PREFIX}:{origin}"
+            cached = self.cache.get_cached_data(key)
+            if cached is not None:
+                text, ttl = cached.get("text", ""), cached.get("ttl", self.ttl)
+            else:
+                text, ttl = self._download_robots(origin)
+                self.cache.set_cached_data(key, {"text": text, "ttl": ttl}, ttl)
+            parser = RobotFileParser(f"{origin}/robots.txt")
+            parser.parse(text.splitlines())
+            self._robots[origin] = (parser, time.time() + ttl)
+        self._apply_crawl_delay(origin, parser)
+        return parser
+
+    def _apply_crawl_delay(self, origin, parser):
+        if self.scheduler is None:
+            return
+        delay = parser.crawl_delay(self.user_agent)
+        if delay:
+            delay = min(float(delay), self.max_crawl_delay)
+        domain = urlparse(origin).netloc.lower()
+        if self.scheduler.crawl_delays.get(domain) != (delay or None):
+            if delay:
+                logger.info(f"Crawl-delay de {delay}s appliqué à {domain}")
+            self.scheduler.set_crawl_delay(domain, delay)
+
+    def can_fetch(self, url):
+        return self.robots(url).can_fetch(self.user_agent, url)
+
+    def check(self, url):
+        """Lever RobotsDisallowedError si le robots.txt interdit `url`"""
+        if not self.can_fetch(url):
+            raise RobotsDisallowedError(f"URL interdite par robots.txt: {url}")
+
+    def _read_feed(self, url):
+        if not self.can_fetch(url):
+            return None, []
+        try:
+            return parse_feed(self.fetch(url), url)
+        except Exception as e:
+            logger.info(f"Flux {url} illisible: {e}")
+            return None, []
+
+    def _news_sitemaps(self, url):
+        """Sitemaps news déclarés dans le robots.txt (index suivis si nommés « news »)"""
+        queue = list(self.robots(url).site_maps() or [])
+        found = []
+        fetches = 0
+        while queue and fetches < self.max_sitemap_fetches:
+            sitemap_url = queue.pop(0)
+            fetches += 1
+            kind, items = self._read_feed(sitemap_url)
+            if kind == "sitemapindex":
+                queue[:0] = [i["url"] for i in items if "news" in i["url"].lower()]
+            elif kind == "sitemap" and any(item["news"] for item in items):
+                found.append(sitemap_url)
+        return found
+
+    def feed_sources(self, url, html=None):
+        """Flux pour la page `url` : [(url du flux, annoncé par la page)]
+
+        Les flux annoncés par <link rel="alternate"> sont mémorisés pour
+        cette page seulement (`html` permet de les découvrir) ; les sitemaps
+        news du robots.txt valent pour tout le site.
+        """
+        key = f"{self.FEEDS_PREFIX}:{_origin(url)}"
+        site_feeds = self.cache.get_cached_data(key)
+        if not isinstance(site_feeds, list):
+            site_feeds = self._news_sitemaps(url)
+            self.cache.set_cached_data(key, site_feeds, self.ttl)
+        page_key = f"{self.FEEDS_PREFIX}:page:{urldefrag(url)[0]}"
+        page_feeds = self.cache.get_cached_data(page_key)
+        if page_feeds is None and html is not None:
+            page_feeds = feed_links(html, url)
+            self.cache.set_cached_data(page_key, page_feeds, self.ttl)
+        page_feeds = page_feeds or []
+        return [(feed, True) for feed in page_feeds] + [
+            (feed, False) for feed in site_feeds if feed not in page_feeds
+        ]
+
+    def feed_items(self, url, limit, html=None):
+        """Entrées du premier flux exploitable pour la page (liste vide sinon)
+
+        Hors de la racine du site, seules les entrées de la rubrique de `url`
+        sont retenues, sauf pour un flux annoncé par la page dans sa rubrique.
+        """
+        for feed_url, announced in self.feed_sources(url, html):
+            kind, items = self._read_feed(feed_url)
+            if kind == "sitemap":
+                items = [item for item in items if item["news"]]
+            if not (announced and _in_scope(url, feed_url)):
+                items = [item for item in items if _in_scope(url, item["url"])]
+            if kind in ("rss", "atom", "sitemap") and items:
+                logger.info(f"{len(items)} articles trouvés dans le flux {feed_url}")
+                return items[:limit]
+        return []
@@ -0,0 +1,373 @@
+"""
+Données structurées des pages : JSON-LD, état embarqué (__NEXT_DATA__, __INITIAL_STATE__), microdata et OpenGraph
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import json
+import logging
+import re
+from html import unescape
+from urllib.parse import urldefrag, urljoin, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Types schema.org considérés comme des articles
+ARTICLE_TYPES = frozenset(
+    (
+        "article",
+        "newsarticle",
+        "reportagenewsarticle",
+        "analysisnewsarticle",
+        "opinionnewsarticle",
+        "backgroundnewsarticle",
+        "reviewnewsarticle",
+        "blogposting",
+        "liveblogposting",
+        "techarticle",
+        "report",
+    )
+)
+
+# Clés usuelles des objets article dans l'état embarqué des frameworks JS
+TITLE_KEYS = ("headline", "title")
+URL_KEYS = ("url", "canonicalUrl", "canonical_url", "permalink", "link", "href")
+DATE_KEYS = (
+    "datePublished",
+    "publishedAt",
+    "published_at",
+    "publishDate",
+    "publicationDate",
+    "firstPublishedAt",
+    "pubDate",
+    "date",
+)
+# Corps complet seulement : un résumé (description, og:description) n'est jamais le contenu
+BODY_KEYS = ("articleBody", "body", "content", "text")
+
+# Nœuds JSON visités au plus par document embarqué
+MAX_JSON_NODES = 50000
+
+_JSON_LD_RE = re.compile(
+    r"<script\b[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_NEXT_DATA_RE = re.compile(
+    r"<script\b[^>]*id\s*=\s*[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_STATE_RE = re.compile(
+    r"window\.(__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__|__NUXT__)\s*=\s*",
+)
+_META_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+# Dernier segment d'URL d'article : identifiant numérique, slug d'au moins trois mots ou page
+_ARTICLE_SLUG_RE = re.compile(r"\d|\w+-\w+-\w+|\.s?html?$|\.php$", re.IGNORECASE)
+_MICRODATA_SELECTOR = ", ".join(
+    f'[itemscope][itemtype$="/{name}"]'
+    for name in (
+        "Article",
+        "NewsArticle",
+        "BlogPosting",
+        "ReportageNewsArticle",
+        "AnalysisNewsArticle",
+        "OpinionNewsArticle",
+    )
+)
+
+
+def _text(value):
+    """Chaîne d'un champ JSON (HTML retiré) ; {"rendered": ...} accepté (WordPress)"""
+    if isinstance(value, dict):
+        value = value.get("rendered") or value.get("@value")
+    if isinstance(value, list):
+        value = " ".join(v for v in value if isinstance(v, str))
+    if not isinstance(value, str):
+        return ""
+    if "<" in value or "&" in value:
+        value = _TAG_RE.sub(" ", unescape(value))
+    return " ".join(value.split())
+
+
+def _first(obj, keys):
+    for key in keys:
+        value = _text(obj.get(key))
+        if value:
+            return value
+    return ""
+
+
+def _url(value):
+    if isinstance(value, dict):
+        value = value.get("@id") or value.get("url")
+    if isinstance(value, str) and value.startswith(("http://", "https://", "/")):
+        return value.strip()
+    return ""
+
+
+def _types(obj):
+    value = obj.get("@type")
+    values = value if isinstance(value, list) else [value]
+    return {v.rsplit("/", 1)[-1].lower() for v in values if isinstance(v, str)}
+
+
+def _record(title, url, date, content, base_url, source):
+    return {
+        "title": title,
+        "url": urldefrag(urljoin(base_url, url))[0] if url else "",
+        "date": date,
+        "content": content,
+        "source": source,
+    }
+
+
+def _is_article_url(url):
+    """URL d'article plausible (ni la racine ni une rubrique comme /economie/)"""
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    return bool(segments) and bool(_ARTICLE_SLUG_RE.search(segments[-1]))
+
+
+def _load_json(raw):
+    raw = raw.strip()
+    if raw.startswith("<!--"):
+        raw = raw[4:].rsplit("-->", 1)[0]
+    if raw.startswith("//<![CDATA["):
+        raw = raw[len("//<![CDATA[") :].rsplit("//]]>", 1)[0]
+    try:
+        return json.loads(raw)
+    except ValueError:
+        # JSON-LD parfois invalide (retours à la ligne bruts dans les chaînes)
+        try:
+            return json.loads(raw, strict=False)
+        except ValueError:
+            return None
+
+
+def _walk(data):
+    """Objets d'un document JSON dans l'ordre du document, bornés à MAX_JSON_NODES"""
+    stack = [data]
+    visited = 0
+    while stack and visited < MAX_JSON_NODES:
+        node = stack.pop()
+        visited += 1
+        children = node.values() if isinstance(node, dict) else node
+        if isinstance(node, dict):
+            yield node
+        stack.extend(
+            child
+            for child in reversed(list(children))
+            if isinstance(child, (dict, list))
+        )
+
+
+def _item_list_records(obj, base_url):
+    """Entrées d'une ItemList qui désignent des articles (URL d'article requise)
+
+    Les entrées typées article sont lues ailleurs comme des articles complets.
+    """
+    records = []
+    elements = obj.get("itemListElement")
+    for element in elements if isinstance(elements, list) else [elements]:
+        item = element.get("item") if isinstance(element, dict) else element
+        if isinstance(item, dict) and _types(item) & ARTICLE_TYPES:
+            continue
+        url = _url(element.get("url") if isinstance(element, dict) else None)
+        url = url or _url(item)
+        if not url or not _is_article_url(url):
+            continue
+        title = _text(element.get("name")) if isinstance(element, dict) else ""
+        if not title and isinstance(item, dict):
+            title = _first(item, ("headline", "name"))
+        records.append(_record(title, url, "", "", base_url, "json-ld"))
+    return records
+
+
+def json_ld_records(html, base_url=""):
+    """Articles déclarés en JSON-LD (NewsArticle…, ItemList d'articles)
+
+    Les fils d'Ariane (BreadcrumbList) sont ignorés : leurs entrées sont des
+    rubriques, pas des articles.
+    """
+    records = []
+    for match in _JSON_LD_RE.finditer(html or ""):
+        data = _load_json(match.group(1))
+        if data is None:
+            continue
+        for obj in _walk(data):
+            types = _types(obj)
+            if "breadcrumblist" in types:
+                continue
+            if types & ARTICLE_TYPES:
+                records.append(
+                    _record(
+                        _first(obj, ("headline", "name")),
+                        _url(obj.get("url")) or _url(obj.get("mainEntityOfPage")),
+                        _first(obj, ("datePublished", "dateCreated", "dateModified")),
+                        _first(obj, ("articleBody", "text")),
+                        base_url,
+                        "json-ld",
+                    )
+                )
+            elif "itemlist" in types:
+                records.extend(_item_list_records(obj, base_url))
+    return records
+
+
+def _state_blobs(html):
+    match = _NEXT_DATA_RE.search(html)
+    if match:
+        data = _load_json(match.group(1))
+        if data is not None:
+            yield "next-data", data
+    decoder = json.JSONDecoder(strict=False)
+    for match in _STATE_RE.finditer(html):
+        try:
+            data, _ = decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue
+        yield "initial-state", data
+
+
+def embedded_state_records(html, base_url=""):
+    """Objets « article » (titre + URL d'article) de l'état embarqué des frameworks JS"""
+    records = []
+    page = urldefrag(base_url)[0]
+    for source, data in _state_blobs(html or ""):
+        for obj in _walk(data):
+            title = _first(obj, TITLE_KEYS)
+            url = next((u for u in (_url(obj.get(k)) for k in URL_KEYS) if u), "")
+            if not title or not url:
+                continue
+            record = _record(
+                title,
+                url,
+                _first(obj, DATE_KEYS),
+                _first(obj, BODY_KEYS),
+                base_url,
+                source,
+            )
+            # Menus et liens de navigation (titre + href) ne sont pas des articles
+            if record["url"] != page and not _is_article_url(record["url"]):
+                continue
+            records.append(record)
+    return records
+
+
+def _itemprop(scope, name):
+    element = scope.select_one(f'[itemprop~="{name}"]')
+    if element is None:
+        return ""
+    for attribute in ("content", "datetime", "href", "src"):
+        value = element.get(attribute)
+        if value:
+            return " ".join(str(value).split())
+    return " ".join(element.get_text(" ", strip=True).split())
+
+
+def microdata_records(soup, base_url=""):
+    """Articles balisés en microdata schema.org (itemscope/itemprop)"""
+    if soup is None:
+        return []
+    records = []
+    for scope in soup.select(_MICRODATA_SELECTOR):
+        records.append(
+            _record(
+                _itemprop(scope, "headline") or _itemprop(scope, "name"),
+                _itemprop(scope, "url") or _itemprop(scope, "mainEntityOfPage"),
+                _itemprop(scope, "datePublished"),
+                _itemprop(scope, "articleBody"),
+                base_url,
+                "microdata",
+            )
+        )
+    return records
+
+
+def opengraph_record(html, base_url=""):
+    """Article décrit par les balises OpenGraph (None si la page n'en déclare pas)"""
+    meta = {}
+    for match in _META_RE.finditer(html or ""):
+        attrs = {
+            m.group(1).lower(): unescape(m.group(2) or m.group(3) or m.group(4) or "")
+            for m in _ATTR_RE.finditer(match.group(0))
+        }
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        if key and key not in meta and attrs.get("content"):
+            meta[key] = " ".join(attrs["content"].split())
+    if not meta.get("og:title"):
+        return None
+    return _record(
+        meta["og:title"],
+        meta.get("og:url") or base_url,
+        meta.get("article:published_time", ""),
+        "",
+        base_url,
+        "opengraph",
+    )
+
+
+def _merge(records):
+    """Un enregistrement par URL, champs complétés d'une source à l'autre"""
+    merged = {}
+    for record in records:
+        if not record["url"] or not record["title"]:
+            continue
+        current = merged.get(record["url"])
+        if current is None:
+            merged[record["url"]] = dict(record)
+            continue
+        for field in ("title", "date"):
+            if not current[field]:
+                current[field] = record[field]
+        if len(record["content"]) > len(current["content"]):
+            current["content"] = record["content"]
+    return list(merged.values())
+
+
+def listing_records(html, page_url, soup=None):
+    """Articles listés par la page (l'enregistrement de la page elle-même exclu)"""
+    records = _merge(
+        json_ld_records(html, page_url)
+        + embedded_state_records(html, page_url)
+        + microdata_records(soup, page_url)
+    )
+    page = urldefrag(page_url)[0]
+    return [record for record in records if record["url"] != page]
+
+
+def article_record(html, page_url, soup=None):
+    """Article décrit par la page elle-même : l'enregistrement de son URL, sinon l'unique article"""
+    page = urldefrag(page_url)[0]
+    og = opengraph_record(html, page_url)
+    declared = json_ld_records(html, page_url) + microdata_records(soup, page_url)
+    for record in declared:
+        # Un article sans URL décrit la page qui le déclare
+        record["url"] = record["url"] or page
+    records = _merge(
+        declared + ([og] if og else []) + embedded_state_records(html, page_url)
+    )
+    for record in records:
+        if record["url"] == page:
+            return record
+    typed = [r for r in records if r["source"] in ("json-ld", "microdata")]
+    return typed[0] if len(typed) == 1 else None
+
+
+def has_article_records(html, min_records=2):
+    """Vrai si le HTML brut porte déjà des articles exploitables (sans rendu)"""
+    if (
+        "ld+json" not in html
+        and "__NEXT_DATA__" not in html
+        and "window.__" not in html
+    ):
+        return False
+    records = _merge(json_ld_records(html) + embedded_state_records(html))
+    complete = [r for r in records if len(r["content"]) > 100]
+    return bool(complete) or len(records) >= min_records
@@ -0,0 +1,162 @@
+"""
+Pool de WebDrivers Selenium réutilisables
+"""
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPoolBusyError(Exception):
+    """Aucun WebDriver disponible dans le délai imparti"""
+
+
+class WebDriverPool:
+    """Pool de drivers Chrome avec emprunt/retour, contrôle de santé et recyclage
+
+    Avec un `proxy_pool`, chaque driver est lancé sur un proxy du pool
+    (options_factory(proxy)) et écarté dès que ce proxy part en quarantaine.
+    """
+
+    def __init__(
+        self,
+        options_factory,
+        setup=None,
+        max_drivers=None,
+        max_navigations=None,
+        proxy_pool=None,
+    ):
+        self.options_factory = options_factory
+        self.setup = setup
+        self.proxy_pool = proxy_pool
+        self.max_drivers = max_drivers or Config.SCRAPING_SELENIUM_MAX_DRIVERS
+        self.max_navigations = (
+            max_navigations or Config.SCRAPING_SELENIUM_MAX_NAVIGATIONS
+        )
+        self._idle = []
+        self._navigations = {}
+        self._proxies = {}
+        self._slots = threading.BoundedSemaphore(self.max_drivers)
+        self._lock = threading.Lock()
+        self.drivers_created = 0
+        self.drivers_recycled = 0
+        atexit.register(self.shutdown)
+
+    def _create_driver(self):
+        proxy = self.proxy_pool.choose() if self.proxy_pool is not None else None
+        driver = webdriver.Chrome(options=self.options_factory(proxy))
+        if self.setup is not None:
+            self.setup(driver)
+        with self._lock:
+            self._navigations[id(driver)] = 0
+            self._proxies[id(driver)] = proxy
+            self.drivers_created += 1
+        return driver
+
+    def proxy_for(self, driver):
+        """Proxy sur lequel le driver a été lancé (None sans pool de proxies)"""
+        with self._lock:
+            return self._proxies.get(id(driver))
+
+    def _is_healthy(self, driver):
+        proxy = self.proxy_for(driver)
+        if proxy is not None and self.proxy_pool.is_quarantined(proxy):
+            return False
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        with self._lock:
+            self._navigations.pop(id(driver), None)
+            self._proxies.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Erreur lors de la fermeture du driver: {e}")
+
+    def _take_idle(self):
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        """Emprunter un driver sain ; il est rendu (ou recyclé) à la sortie"""
+        timeout = timeout or Config.SCRAPING_SELENIUM_CHECKOUT_TIMEOUT
+        if not self._slots.acquire(timeout=timeout):
+            raise WebDriverPoolBusyError(
+                f"{self.max_drivers} drivers Selenium déjà utilisés"
+            )
+        driver = None
+        try:
+            driver = self._take_idle()
+            while driver is not None and not self._is_healthy(driver):
+                logger.info("Driver Selenium défaillant écarté du pool")
+                self._quit(driver)
+                driver = self._take_idle()
+            if driver is None:
+                driver = self._create_driver()
+            yield driver
+        finally:
+            if driver is not None:
+                self._checkin(driver)
+            self._slots.release()
+
+    def has_free_slot(self):
+        """Vrai si un emprunt n'attendrait pas (indication, rien n'est réservé)"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        self._slots.release()
+        return True
+
+    def record_navigation(self, driver):
+        with self._lock:
+            self._navigations[id(driver)] = self._navigations.get(id(driver), 0) + 1
+
+    def _checkin(self, driver):
+        with self._lock:
+            navigations = self._navigations.get(id(driver), 0)
+        if navigations >= self.max_navigations:
+            self.drivers_recycled += 1
+            self._quit(driver)
+            return
+        try:
+            # Repartir d'un état propre ; un driver cassé échoue ici et est fermé
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            self._quit(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def shutdown(self):
+        """Fermer les drivers inactifs"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def get_stats(self):
+        """Statistiques du pool"""
+        with self._lock:
+            return {
+                "max_drivers": self.max_drivers,
+                "idle": len(self._idle),
+                "in_use": len(self._navigations) - len(self._idle),
+                "created": self.drivers_created,
+                "recycled": self.drivers_recycled,
+            }
@@ -0,0 +1,34 @@
+"""
+Configuration pytest : imports depuis backend/ et cache en mémoire (sans Redis)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+
+
+class MemoryCache:
+    """Même interface que redis_connector, sans connexion Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get_connection(self):
+        return None
+
+    def get_cached_data(self, key):
+        return self.data.get(key)
+
+    def set_cached_data(self, key, data, expire_time=3600):
+        self.data[key] = data
+        return True
+
+    def delete_cached_data(self, key):
+        return self.data.pop(key, None) is not None
+
+
+@pytest.fixture
+def memory_cache():
+    return MemoryCache()
@@ -0,0 +1,104 @@
+"""
+Tests des disjoncteurs (mode local, sans Redis)
+"""
+
+import pytest
+import requests
+from services.circuit_breaker import (
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    domain_circuit,
+    metric_label,
+    provider_circuit,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr("services.circuit_breaker.time.time", clock)
+    return clock
+
+
+@pytest.fixture
+def registry(memory_cache):
+    return CircuitBreakerRegistry(
+        memory_cache, failure_threshold=2, recovery_timeout=30
+    )
+
+
+def _server_error():
+    response = requests.Response()
+    response.status_code = 503
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_opens_after_consecutive_failures(registry, clock):
+    circuit = domain_circuit("a.fr")
+    registry.record_failure(circuit, _server_error())
+    assert registry.allow(circuit)
+    registry.record_failure(circuit, _server_error())
+    assert registry.is_open(circuit)
+    with pytest.raises(CircuitOpenError):
+        registry.check(circuit)
+    # Les autres circuits ne sont pas touchés
+    assert registry.allow(domain_circuit("b.fr"))
+
+
+def test_success_resets_failure_count(registry, clock):
+    circuit = domain_circuit("a.fr")
+    registry.record_failure(circuit, _server_error())
+    registry.record_success(circuit)
+    registry.record_failure(circuit, _server_error())
+    assert not registry.is_open(circuit)
+
+
+def test_half_open_allows_a_single_probe(registry, clock):
+    circuit = provider_circuit("scrapedo")
+    for _ in range(2):
+        registry.record_failure(circuit)
+    clock.now += 31
+    assert registry.allow(circuit)
+    assert not registry.allow(circuit)
+    assert registry.get_states()[circuit]["state"] == "half_open"
+
+    # Appel test réussi : circuit refermé
+    registry.record_success(circuit)
+    assert registry.allow(circuit)
+    assert registry.get_states() == {}
+
+
+def test_failed_probe_reopens(registry, clock):
+    circuit = domain_circuit("a.fr")
+    for _ in range(2):
+        registry.record_failure(circuit)
+    clock.now += 31
+    assert registry.allow(circuit)
+    registry.record_failure(circuit, _server_error())
+    assert registry.is_open(circuit)
+    assert registry.get_states()[circuit]["retry_in"] == 30
+
+
+def test_client_errors_do_not_count(registry, clock):
+    circuit = domain_circuit("a.fr")
+    response = requests.Response()
+    response.status_code = 404
+    for _ in range(5):
+        registry.record_failure(
+            circuit, requests.exceptions.HTTPError(response=response)
+        )
+    assert registry.allow(circuit)
+
+
+def test_metric_labels_are_bounded():
+    assert metric_label(domain_circuit("a.fr")) == "domain"
+    assert metric_label(domain_circuit("b.fr")) == "domain"
+    assert metric_label(provider_circuit("scrapedo")) == "provider:scrapedo"
@@ -0,0 +1,73 @@
+"""
+Tests de content_extractor.extract_content : même résultat que l'ancienne version en sept passes
+"""
+
+import pytest
+from benchmarks.bench_article_content import legacy_extract, listing_page
+from services.content_extractor import extract_content
+from services.html_parser import available_engines, parse_html
+from services.scraping_service import ScrapingService
+
+ENGINES = available_engines()
+
+
+@pytest.fixture(scope="module")
+def service():
+    return ScrapingService.__new__(ScrapingService)
+
+
+def _assert_parity(service, html, selector, title=""):
+    for engine in ENGINES:
+        soup = parse_html(html, engine)
+        elements = soup.select(selector)
+        assert elements, engine
+        for element in elements:
+            expected = legacy_extract(service, element, title)
+            assert extract_content(element, title, service._clean_text) == expected
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parity_on_synthetic_listing(service, seed):
+    html = listing_page(articles=5, paragraphs=12, seed=seed)
+    _assert_parity(service, html, "article.article")
+
+
+def test_title_is_skipped_except_in_list_items(service):
+    title = "Un titre d'article assez long"
+    html = (
+        "<html><body><article>"
+        f"<h2>{title}</h2><p>{title}</p>"
+        f"<ul><li>{title}</li><li>Un élément de liste distinct</li></ul>"
+        "<p>Un paragraphe de contenu suffisamment long pour être retenu.</p>"
+        "</article></body></html>"
+    )
+    _assert_parity(service, html, "article", title)
+
+
+def test_nested_and_repeated_fragments(service):
+    html = (
+        "<html><body><div class='card'>"
+        "<div class='post-body'><p>Premier paragraphe du corps de l'article.</p>"
+        "<p>Premier paragraphe du corps de l'article.</p>"
+        "<span>Un span qui reprend un texte déjà vu ailleurs</span></div>"
+        "<section>Une section dont le texte dépasse cinquante caractères "
+        "<p>avec un paragraphe imbriqué assez long.</p></section>"
+        "<p>Un span qui reprend un texte déjà vu</p>"
+        "</div></body></html>"
+    )
+    _assert_parity(service, html, "div.card")
+
+
+def test_unicode_and_control_characters(service):
+    html = (
+        "<html><body><article>"
+        "<p>Café crème et été en Provence, un récit.</p>"
+        "<p>Un texte avec un caractère nul \x00 au milieu de la phrase.</p>"
+        "<p>Émission spéciale : « l'économie » en 2024 — bilan détaillé.</p>"
+        "</article></body></html>"
+    )
+    _assert_parity(service, html, "article")
+
+
+def test_empty_element(service):
+    _assert_parity(service, "<html><body><article></article></body></html>", "article")
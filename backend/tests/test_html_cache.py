@@ -0,0 +1,64 @@
+"""
+Tests du cache HTML : normalisation des URLs et stockage disque (sans Redis)
+"""
+
+import time
+import pytest
+from services.html_cache import HtmlResponseCache, normalize_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Exemple.FR/actu", "https://exemple.fr/actu"),
+        ("https://exemple.fr:443/actu", "https://exemple.fr/actu"),
+        ("http://exemple.fr:8080/actu", "http://exemple.fr:8080/actu"),
+        ("https://exemple.fr", "https://exemple.fr/"),
+        ("https://exemple.fr/actu#commentaires", "https://exemple.fr/actu"),
+        ("https://exemple.fr/?b=2&a=1", "https://exemple.fr/?a=1&b=2"),
+        (
+            "https://exemple.fr/?page=2&utm_source=x&UTM_medium=y&fbclid=z",
+            "https://exemple.fr/?page=2",
+        ),
+        ("https://exemple.fr/?q=", "https://exemple.fr/?q="),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_path_case_and_query_values_are_kept():
+    assert normalize_url("https://a.fr/Actu?page=2") != normalize_url(
+        "https://a.fr/actu?page=2"
+    )
+    assert normalize_url("https://a.fr/?page=2") != normalize_url(
+        "https://a.fr/?page=3"
+    )
+
+
+def _cache(memory_cache, tmp_path, ttl=60):
+    return HtmlResponseCache(
+        memory_cache, ttl=ttl, stale_ttl=60, disk_dir=str(tmp_path), enabled=True
+    )
+
+
+def test_store_and_lookup_share_normalized_key(memory_cache, tmp_path):
+    cache = _cache(memory_cache, tmp_path)
+    cache.store("https://a.fr/actu?utm_source=x", "<p>é</p>", "requests", '"v1"')
+    entry = cache.lookup("https://A.fr/actu#haut")
+    assert entry["html"] == "<p>é</p>"
+    assert entry["fresh"]
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+    assert cache.lookup("https://a.fr/autre") is None
+
+
+def test_stale_entry_is_kept_for_revalidation(memory_cache, tmp_path, monkeypatch):
+    cache = _cache(memory_cache, tmp_path, ttl=10)
+    cache.store("https://a.fr/", "<p>x</p>", "requests", None, "Mon, 01 Jan 2024")
+    now = time.time()
+    monkeypatch.setattr("services.html_cache.time.time", lambda: now + 30)
+    entry = cache.lookup("https://a.fr/")
+    assert not entry["fresh"]
+    assert cache.conditional_headers(entry) == {"If-Modified-Since": "Mon, 01 Jan 2024"}
+    cache.mark_revalidated("https://a.fr/", entry)
+    assert cache.lookup("https://a.fr/")["fresh"]
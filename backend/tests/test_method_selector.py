@@ -0,0 +1,105 @@
+"""
+Tests de la sélection adaptative de la méthode de récupération
+"""
+
+import pytest
+from services import method_selector as method_selector_module
+from services.method_selector import FetchMethodSelector, html_quality
+
+ORDER = ["requests", "scrapedo", "selenium", "playwright"]
+
+
+@pytest.fixture
+def roll(monkeypatch):
+    """Tirage d'exploration fixé (1.0 : jamais d'exploration)"""
+    value = [1.0]
+    monkeypatch.setattr(method_selector_module.random, "random", lambda: value[0])
+    return value
+
+
+@pytest.fixture
+def selector(memory_cache, roll):
+    return FetchMethodSelector(
+        memory_cache,
+        min_samples=3,
+        skip_threshold=0.2,
+        exploration_rate=0.1,
+        window=100,
+        latency_samples=10,
+    )
+
+
+def _seed(selector, method, successes, failures, latency=1.0, quality=1.0):
+    for _ in range(successes):
+        selector.record("a.fr", method, True, latency, quality)
+    for _ in range(failures):
+        selector.record("a.fr", method, False, latency)
+
+
+def test_requested_order_without_stats(selector):
+    assert selector.plan("a.fr", ORDER + ["requests"]) == (ORDER, "ordre demandé")
+
+
+def test_best_method_moves_first(selector):
+    _seed(selector, "requests", 3, 2, latency=1.0)
+    _seed(selector, "selenium", 5, 0, latency=4.0)
+    order, reason = selector.plan("a.fr", ORDER)
+    assert order == ["selenium", "requests", "scrapedo", "playwright"]
+    assert reason.startswith("selenium en tête")
+
+
+def test_first_method_kept_when_best(selector):
+    _seed(selector, "requests", 5, 0, latency=0.5)
+    _seed(selector, "selenium", 5, 0, latency=4.0)
+    assert selector.plan("a.fr", ORDER) == (ORDER, "ordre demandé")
+
+
+def test_failing_methods_move_last(selector):
+    _seed(selector, "requests", 0, 5)
+    _seed(selector, "scrapedo", 1, 9)
+    order, reason = selector.plan("a.fr", ORDER)
+    assert order == ["selenium", "playwright", "requests", "scrapedo"]
+    assert "requests, scrapedo relégué(s)" in reason
+
+
+def test_too_few_samples_are_ignored(selector):
+    _seed(selector, "requests", 0, 2)
+    _seed(selector, "playwright", 2, 0)
+    assert selector.plan("a.fr", ORDER) == (ORDER, "ordre demandé")
+
+
+def test_stats_are_per_domain(selector):
+    _seed(selector, "requests", 0, 5)
+    assert selector.plan("b.fr", ORDER) == (ORDER, "ordre demandé")
+
+
+def test_exploration_keeps_requested_order(selector, roll):
+    _seed(selector, "requests", 0, 5)
+    roll[0] = 0.05
+    assert selector.plan("a.fr", ORDER) == (ORDER, "exploration (ordre demandé)")
+    roll[0] = 0.1
+    assert selector.plan("a.fr", ORDER)[0][-1] == "requests"
+
+
+def test_window_halves_counters(memory_cache, roll):
+    selector = FetchMethodSelector(memory_cache, min_samples=1, window=4)
+    _seed(selector, "requests", 5, 0, latency=2.0)
+    stats = selector.get_stats("a.fr", "requests")
+    assert stats["attempts"] == 2.5
+    assert stats["success_rate"] == 1.0
+    assert stats["avg_latency"] == 2.0
+
+
+def test_latency_percentile(selector):
+    assert selector.latency_percentile("a.fr", "requests") is None
+    for latency in (0.5, 0.1, 0.9, 0.3, 0.7):
+        selector.record("a.fr", "requests", True, latency)
+    selector.record("a.fr", "requests", False, 30.0)
+    assert selector.latency_percentile("a.fr", "requests", 0.9) == 0.9
+    assert selector.latency_percentile("a.fr", "requests", 0.5) == 0.5
+
+
+def test_html_quality():
+    assert html_quality("") == 0.0
+    assert html_quality("<p>un</p><H2>deux</H2>") == 0.1
+    assert html_quality("<p>x</p>" * 40) == 1.0
@@ -0,0 +1,77 @@
+"""
+Tests de la pagination pipelinée : pré-analyse, pages spéculatives et préchargement
+"""
+
+import threading
+from services.pagination import (
+    PagePrefetcher,
+    PrefetchCancelled,
+    prescan_next_page_url,
+    speculative_page_urls,
+)
+
+BASE = "https://news.example.com/actualites/"
+
+
+def test_prescan_prefers_rel_next():
+    html = (
+        '<a class="next" href="/actualites/?page=9">Suivant</a>'
+        '<link rel="next" href="/actualites/?page=2">'
+    )
+    assert prescan_next_page_url(html, BASE) == BASE + "?page=2"
+
+
+def test_prescan_without_next_link():
+    assert prescan_next_page_url('<a href="/contact">Contact</a>', BASE) is None
+
+
+def test_speculative_query_and_path_numbers():
+    assert speculative_page_urls(BASE, BASE + "?page=2", 2) == [
+        BASE + "?page=3",
+        BASE + "?page=4",
+    ]
+    assert speculative_page_urls(BASE + "page/3/", BASE + "page/4/", 1) == [
+        BASE + "page/5/"
+    ]
+
+
+def test_speculative_requires_obvious_pattern():
+    # Le numéro ne suit pas la page courante
+    assert speculative_page_urls(BASE + "?page=2", BASE + "?page=5", 2) == []
+    # Autre chose que le numéro change
+    assert speculative_page_urls(BASE + "?page=2&s=a", BASE + "?page=3&s=b", 2) == []
+    assert speculative_page_urls(BASE, BASE + "suite", 2) == []
+    assert speculative_page_urls(BASE, BASE + "?page=2", 0) == []
+
+
+def test_get_returns_prefetched_result():
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return f"<html>{url}</html>"
+
+    with PagePrefetcher(fetch, max_workers=2) as prefetcher:
+        prefetcher.prefetch([BASE + "?page=2", BASE + "?page=2"])
+        assert prefetcher.get(BASE + "?page=2") == f"<html>{BASE}?page=2</html>"
+        assert prefetcher.get(BASE + "?page=3") == f"<html>{BASE}?page=3</html>"
+    assert sorted(fetched) == [BASE + "?page=2", BASE + "?page=3"]
+
+
+def test_close_cancels_prefetches_waiting_for_their_slot():
+    fetched = []
+    waiting = threading.Event()
+    release = threading.Event()
+
+    def wait(url):
+        waiting.set()
+        release.wait(5)
+
+    prefetcher = PagePrefetcher(fetched.append, max_workers=1, wait=wait)
+    prefetcher.prefetch([BASE + "?page=2"])
+    future = prefetcher.futures[BASE + "?page=2"]
+    assert waiting.wait(5)
+    prefetcher.close()
+    release.set()
+    assert isinstance(future.exception(5), PrefetchCancelled)
+    assert fetched == []
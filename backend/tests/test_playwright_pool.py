@@ -0,0 +1,121 @@
+"""
+Tests du pool Playwright : créneaux rendus à la fin réelle du travail, relance des workers espacée
+"""
+
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import pytest
+from services import playwright_pool
+from services.playwright_pool import BrowserPoolBusyError, PlaywrightBrowserPool
+
+
+class _Context:
+    def close(self):
+        pass
+
+
+class _Browser:
+    def is_connected(self):
+        return True
+
+    def new_context(self, **options):
+        return _Context()
+
+    def close(self):
+        pass
+
+
+class _Playwright:
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    """Workers sans Chromium : démarrage factice, compté"""
+    starts = []
+
+    def start(worker):
+        starts.append(worker.name)
+        worker.playwright = _Playwright()
+
+    def launch(worker):
+        worker.browser = _Browser()
+
+    monkeypatch.setattr(playwright_pool._BrowserWorker, "_start_playwright", start)
+    monkeypatch.setattr(playwright_pool._BrowserWorker, "_launch_browser", launch)
+    return starts
+
+
+def _pool(**kwargs):
+    options = dict(size=1, max_pages_per_browser=100, max_memory_mb=1024)
+    options.update(kwargs)
+    return PlaywrightBrowserPool(**options)
+
+
+def test_slot_held_until_stuck_job_finishes(fake_browser):
+    pool = _pool(max_concurrent_pages=1)
+    release = threading.Event()
+    try:
+        with pytest.raises(FutureTimeoutError):
+            pool.run(lambda context: release.wait(5), timeout=0.2)
+        # L'appelant a abandonné mais la page est toujours en cours de rendu
+        assert not pool.has_free_slot()
+        with pytest.raises(BrowserPoolBusyError):
+            pool.run(lambda context: "ok", timeout=0.1)
+        release.set()
+        assert pool.run(lambda context: "ok", timeout=5) == "ok"
+        assert pool.has_free_slot()
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_slot_released_when_job_fails(fake_browser):
+    pool = _pool(max_concurrent_pages=1)
+
+    def fail(context):
+        raise ValueError("rendu impossible")
+
+    try:
+        with pytest.raises(ValueError):
+            pool.run(fail, timeout=5)
+        assert pool.has_free_slot()
+    finally:
+        pool.shutdown()
+
+
+def test_failed_workers_respawn_with_backoff(monkeypatch):
+    starts = []
+    clock = [1000.0]
+
+    def start(worker):
+        starts.append(worker.name)
+        raise RuntimeError("chromium absent")
+
+    monkeypatch.setattr(playwright_pool._BrowserWorker, "_start_playwright", start)
+    monkeypatch.setattr(playwright_pool.time, "time", lambda: clock[0])
+    pool = _pool(respawn_delay=5, max_respawn_delay=8)
+    try:
+        # Échec du démarrage, ou délai dépassé si le travail arrive après l'échec
+        with pytest.raises((RuntimeError, FutureTimeoutError)):
+            pool.run(lambda context: "ok", timeout=1)
+        for worker in pool._workers:
+            worker.join(5)
+        assert len(starts) == 1
+        # Dans le délai : pas de nouveau démarrage, échec immédiat
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="Playwright indisponible"):
+                pool.run(lambda context: "ok", timeout=1)
+        assert len(starts) == 1
+        assert pool.has_free_slot()
+        # Délai écoulé : relance, puis délai doublé et plafonné
+        clock[0] += 5
+        with pytest.raises((RuntimeError, FutureTimeoutError)):
+            pool.run(lambda context: "ok", timeout=1)
+        for worker in pool._workers:
+            worker.join(5)
+        assert len(starts) == 2
+        assert pool._next_spawn == clock[0] + 8
+    finally:
+        pool.shutdown()
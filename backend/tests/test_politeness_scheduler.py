@@ -0,0 +1,48 @@
+"""
+Tests du seau à jetons par domaine
+"""
+
+from services.politeness_scheduler import PolitenessScheduler, parse_rate_overrides
+
+
+def test_burst_then_spacing():
+    scheduler = PolitenessScheduler(rate=2.0, burst=2, overrides={})
+    assert scheduler.reserve("https://a.fr/1") == 0
+    assert scheduler.reserve("https://a.fr/2") == 0
+    # Jetons épuisés : les réservations suivantes attendent 1/débit de plus chacune
+    first = scheduler.reserve("https://a.fr/3")
+    second = scheduler.reserve("https://a.fr/4")
+    assert 0.45 < first <= 0.5
+    assert 0.95 < second <= 1.0
+
+
+def test_domains_are_independent():
+    scheduler = PolitenessScheduler(rate=1.0, burst=1, overrides={})
+    scheduler.reserve("https://a.fr/")
+    assert scheduler.reserve("https://a.fr/") > 0
+    assert scheduler.reserve("https://b.fr/") == 0
+
+
+def test_crawl_delay_disables_burst():
+    scheduler = PolitenessScheduler(rate=10.0, burst=5, overrides={})
+    scheduler.set_crawl_delay("a.fr", 2)
+    assert scheduler.reserve("https://a.fr/") == 0
+    assert 1.9 < scheduler.reserve("https://a.fr/") <= 2.0
+    assert scheduler.get_stats()["a.fr"] == {
+        "rate": 0.5,
+        "burst": 1,
+        "crawl_delay": 2.0,
+    }
+
+
+def test_overrides():
+    scheduler = PolitenessScheduler(
+        rate=10.0, burst=5, overrides=parse_rate_overrides("lent.fr=0.5:1, x=abc")
+    )
+    assert scheduler.get_stats() == {}
+    scheduler.reserve("https://lent.fr/")
+    assert scheduler.get_stats()["lent.fr"]["rate"] == 0.5
+    assert parse_rate_overrides("a.fr=2,b.fr=1:3,invalide") == {
+        "a.fr": (2.0, None),
+        "b.fr": (1.0, 3.0),
+    }
@@ -0,0 +1,170 @@
+"""
+Tests de la lecture en streaming : plafond de taille, type de contenu, arrêt anticipé
+"""
+
+import asyncio
+import httpx
+import pytest
+from services.circuit_breaker import counts_as_failure
+from services.response_reader import (
+    ContentRejectedError,
+    ResponseReader,
+    ResponseTooLargeError,
+    UnsupportedContentTypeError,
+)
+from services.retry_policy import RetryPolicy
+
+PAGE = b"<html><head></head><body><p>Texte</p></body></html>"
+
+
+class _Response:
+    """Réponse requests (stream=True) factice : blocs fournis, blocs lus comptés"""
+
+    def __init__(self, chunks, headers=None, status_code=200):
+        self.url = "https://news.example.com/"
+        self.status_code = status_code
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        self.headers.update(headers or {})
+        self._chunks = chunks
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self._chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+def _reader(**kwargs):
+    options = dict(max_bytes=1000, read_budget=0, stop_at_body_end=False)
+    options.update(kwargs)
+    return ResponseReader(**options)
+
+
+def _split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_reads_whole_body():
+    response = _Response(_split(PAGE, 7))
+    result = _reader().read(response)
+    assert result.text == PAGE.decode()
+    assert result.status_code == 200
+    assert not result.truncated
+
+
+def test_body_over_size_cap_is_rejected():
+    response = _Response([b"x" * 400] * 5)
+    with pytest.raises(ResponseTooLargeError) as excinfo:
+        _reader().read(response)
+    # Abandon dès le bloc qui dépasse, sans lire la suite
+    assert response.chunks_read == 3
+    assert excinfo.value.response is response
+
+
+def test_content_length_over_cap_is_rejected_before_reading():
+    response = _Response([PAGE], headers={"Content-Length": "5000"})
+    with pytest.raises(ResponseTooLargeError):
+        _reader().read(response)
+    assert response.chunks_read == 0
+
+
+@pytest.mark.parametrize(
+    "content_type", ["application/pdf", "video/mp4", "application/zip; x=1"]
+)
+def test_non_text_content_type_is_rejected(content_type):
+    response = _Response([PAGE], headers={"Content-Type": content_type})
+    with pytest.raises(UnsupportedContentTypeError):
+        _reader().read(response)
+    assert response.chunks_read == 0
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    ["", "text/plain", "application/xhtml+xml", "application/rss+xml; charset=utf-8"],
+)
+def test_text_content_types_are_read(content_type):
+    response = _Response([PAGE], headers={"Content-Type": content_type})
+    assert _reader().read(response).text == PAGE.decode()
+
+
+@pytest.mark.parametrize("size", [1, 3, 5, 16, len(PAGE)])
+def test_stop_at_body_end_across_chunk_boundaries(size):
+    data = PAGE + b"<script>suivi()</script>" + b"x" * 500
+    response = _Response(_split(data, size))
+    result = _reader(stop_at_body_end=True).read(response)
+    assert result.text == PAGE.decode().replace("</html>", "")
+    assert result.truncated
+    assert response.chunks_read < len(_split(data, size))
+
+
+def test_closing_bracket_in_next_chunk():
+    response = _Response([b"<body>Texte</body", b' data-x="1">', b"<script>"])
+    result = _reader(stop_at_body_end=True).read(response)
+    assert result.text == '<body>Texte</body data-x="1">'
+    assert response.chunks_read == 2
+
+
+def test_stop_at_body_end_is_case_insensitive():
+    response = _Response([b"<HTML><BODY>Texte</BODY ></HTML>"])
+    result = _reader(stop_at_body_end=True).read(response)
+    assert result.text == "<HTML><BODY>Texte</BODY >"
+
+
+def test_read_budget_truncates_instead_of_failing():
+    response = _Response([b"a" * 100] * 8)
+    result = _reader(read_budget=250).read(response)
+    assert result.truncated
+    assert result.text == "a" * 300
+    assert response.chunks_read == 3
+
+
+def test_declared_latin1_is_decoded_as_utf8():
+    body = "Économie".encode("utf-8")
+    response = _Response(
+        [body], headers={"Content-Type": "text/html; charset=ISO-8859-1"}
+    )
+    assert _reader().read(response).text == "Économie"
+    body = "Économie".encode("cp1252")
+    response = _Response([body], headers={"Content-Type": "text/html; charset=cp1252"})
+    assert _reader().read(response).text == "Économie"
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ResponseTooLargeError("trop gros", _Response([])),
+        UnsupportedContentTypeError("pdf", _Response([])),
+    ],
+)
+def test_rejections_are_neither_retried_nor_upstream_failures(error):
+    assert isinstance(error, ContentRejectedError)
+    assert not RetryPolicy(max_attempts=3, base_delay=0).is_retryable(error)
+    assert not counts_as_failure(error)
+
+
+def test_httpx_sync_and_async_streams():
+    data = PAGE + b"x" * 500
+
+    async def body():
+        for chunk in _split(data, 10):
+            yield chunk
+
+    request = httpx.Request("GET", "https://news.example.com/")
+    reader = _reader(stop_at_body_end=True)
+    sync_response = httpx.Response(
+        200, headers={"Content-Type": "text/html"}, content=data, request=request
+    )
+    assert reader.read(sync_response).text == PAGE.decode().replace("</html>", "")
+
+    async def read_async():
+        response = httpx.Response(
+            200,
+            headers={"Content-Type": "text/html"},
+            content=body(),
+            request=request,
+        )
+        return await reader.aread(response)
+
+    result = asyncio.run(read_async())
+    assert result.truncated
+    assert result.text == PAGE.decode().replace("</html>", "")
@@ -0,0 +1,114 @@
+"""
+Tests de la politique de retry partagée
+"""
+
+import asyncio
+import pytest
+import requests
+from services.circuit_breaker import CircuitOpenError
+from services.retry_policy import RetryPolicy, parse_retry_after
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _http_error(status_code, headers=None):
+    return requests.exceptions.HTTPError(
+        response=_Response(status_code, headers), request=None
+    )
+
+
+def _policy(**kwargs):
+    options = dict(
+        max_attempts=3, base_delay=0, max_delay=1, deadline=10, max_retry_after=5
+    )
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+
+def test_transient_errors_are_retried():
+    policy = _policy()
+    assert policy.is_retryable(_http_error(503))
+    assert policy.is_retryable(_http_error(429))
+    assert policy.is_retryable(requests.exceptions.ConnectionError())
+    assert not policy.is_retryable(_http_error(404))
+    assert not policy.is_retryable(CircuitOpenError("ouvert"))
+    assert not policy.is_retryable(ValueError())
+
+
+def test_call_retries_until_success():
+    calls = []
+
+    def flaky(attempt):
+        calls.append(attempt)
+        if attempt < 2:
+            raise requests.exceptions.Timeout()
+        return "ok"
+
+    assert _policy().call(flaky) == "ok"
+    assert calls == [0, 1, 2]
+
+
+def test_call_stops_on_permanent_error_and_max_attempts():
+    calls = []
+
+    def not_found(attempt):
+        calls.append(attempt)
+        raise _http_error(404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _policy().call(not_found)
+    assert calls == [0]
+
+    calls.clear()
+
+    def down(attempt):
+        calls.append(attempt)
+        raise _http_error(502)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _policy().call(down)
+    assert calls == [0, 1, 2]
+
+
+def test_retry_after_is_honoured_and_capped():
+    policy = _policy()
+    assert policy.compute_delay(0, _http_error(429, {"Retry-After": "3"})) == 3
+    # Au-delà de max_retry_after : abandon plutôt qu'une longue attente
+    assert policy.next_delay(0, _http_error(503, {"Retry-After": "60"}), 0) is None
+
+
+def test_backoff_is_bounded_by_max_delay():
+    policy = _policy(base_delay=0.5, max_delay=1)
+    for attempt in range(6):
+        assert 0 <= policy.compute_delay(attempt, _http_error(502)) <= 1
+
+
+def test_deadline_stops_retries(monkeypatch):
+    policy = _policy(deadline=5)
+    monkeypatch.setattr("services.retry_policy.time.time", lambda: 100.0)
+    assert policy.next_delay(0, _http_error(502), started_at=99.0) is not None
+    assert policy.next_delay(0, _http_error(502), started_at=90.0) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("pas une date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_call_async():
+    calls = []
+
+    async def flaky(attempt):
+        calls.append(attempt)
+        if not attempt:
+            raise _http_error(503)
+        return "ok"
+
+    assert asyncio.run(_policy().call_async(flaky)) == "ok"
+    assert calls == [0, 1]
@@ -0,0 +1,90 @@
+"""
+Tests de SelectorMatcher : même résultat que l'ancienne boucle select() par sélecteur
+"""
+
+import pytest
+from services.html_parser import available_engines, node_key, parse_html
+from services.scraping_service import ScrapingService
+from services.selector_matcher import SelectorMatcher
+
+# Sélecteurs non indexables : repli sur select()
+COMPLEX_SELECTORS = [
+    "main > div.news",
+    "section.une article",
+    "[data-type=article]",
+    "ul.liste li:nth-child(2)",
+]
+
+PAGE = """<html><body><main>
+<section class="une">
+  <article class="article news-card"><h2>Titre à la une assez long</h2></article>
+  <div class="news news-item"><h3>Brève un</h3></div>
+</section>
+<div class="news">Bloc direct sous main</div>
+<div class="story Article-Card"><h3>Classe en casse mixte</h3></div>
+<div data-type="article" class="post"><h3>Attribut et classe</h3></div>
+<div data-type="article"><h3>Attribut seul</h3></div>
+<ul class="liste">
+  <li class="news-item">Un</li>
+  <li class="article news">Deux</li>
+  <li class="news">Trois</li>
+</ul>
+<div class="post"><div class="post">Imbriqués</div></div>
+<span class="news-item">Balise non ciblée</span>
+</main></body></html>"""
+
+
+def _legacy_match(selectors, soup):
+    """Ancienne version : select() par sélecteur, élément retenu sous le premier"""
+    seen = set()
+    result = []
+    for selector in selectors:
+        elements = []
+        for element in soup.select(selector):
+            key = node_key(element)
+            if key not in seen:
+                seen.add(key)
+                elements.append(element)
+        result.append((selector, elements))
+    return result
+
+
+def _keys(matches):
+    return [
+        (selector, [node_key(e) for e in elements]) for selector, elements in matches
+    ]
+
+
+@pytest.mark.parametrize("engine", available_engines())
+@pytest.mark.parametrize(
+    "selectors",
+    [
+        ScrapingService.LISTING_SELECTORS,
+        ScrapingService.LISTING_SELECTORS + COMPLEX_SELECTORS,
+        COMPLEX_SELECTORS + ScrapingService.LISTING_SELECTORS,
+        [".news", "div.post", "li", "*.article"],
+    ],
+    ids=["listing", "listing+complex", "complex-first", "class-only"],
+)
+def test_same_elements_as_select_loop(engine, selectors):
+    soup = parse_html(PAGE, engine)
+    matcher = SelectorMatcher(selectors)
+    expected = _legacy_match(selectors, soup)
+    assert _keys(matcher.match(soup)) == _keys(expected)
+    # Le document contient bien des éléments pour les sélecteurs testés
+    assert sum(len(elements) for _, elements in expected) > 5
+
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_elements_deduplicated_under_first_selector(engine):
+    soup = parse_html(PAGE, engine)
+    matches = dict(
+        SelectorMatcher(
+            ["section.une article", "article", "[data-type=article]"]
+        ).match(soup)
+    )
+    assert [e.get_text(strip=True) for e in matches["section.une article"]] == [
+        "Titre à la une assez long"
+    ]
+    assert matches["article"] == []
+    assert len(matches["[data-type=article]"]) == 2
@@ -0,0 +1,126 @@
+"""
+Tests de SiteDiscovery : robots.txt et flux d'articles limités à la rubrique demandée
+"""
+
+import pytest
+import requests
+from services.site_discovery import RobotsDisallowedError, SiteDiscovery, _in_scope
+
+ORIGIN = "https://news.example.com"
+
+ROBOTS = f"""User-agent: *
+Disallow: /prive/
+Sitemap: {ORIGIN}/sitemap-news.xml
+"""
+
+NEWS_SITEMAP = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url><loc>{ORIGIN}/economie/les-taux-remontent-1</loc>
+    <news:news><news:title>Les taux remontent</news:title></news:news></url>
+  <url><loc>{ORIGIN}/culture/un-festival-record-2</loc>
+    <news:news><news:title>Un festival record</news:title></news:news></url>
+  <url><loc>{ORIGIN}/a-propos</loc></url>
+</urlset>"""
+
+ECONOMIE_RSS = f"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <item><title>Les taux remontent</title><link>{ORIGIN}/economie/les-taux-remontent-1</link></item>
+  <item><title>La bourse recule</title><link>{ORIGIN}/economie/la-bourse-recule-3</link></item>
+</channel></rss>"""
+
+ECONOMIE_HTML = (
+    '<html><head><link rel="alternate" type="application/rss+xml" '
+    'href="/economie/rss.xml"></head><body></body></html>'
+)
+
+
+class _Site:
+    """fetch factice : documents par URL, 404 sinon, requêtes journalisées"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.requested = []
+
+    def __call__(self, url):
+        self.requested.append(url)
+        if url not in self.documents:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.exceptions.HTTPError(response=response)
+        return self.documents[url]
+
+
+@pytest.fixture
+def site():
+    return _Site(
+        {
+            f"{ORIGIN}/robots.txt": ROBOTS,
+            f"{ORIGIN}/sitemap-news.xml": NEWS_SITEMAP,
+            f"{ORIGIN}/economie/rss.xml": ECONOMIE_RSS,
+        }
+    )
+
+
+@pytest.fixture
+def discovery(site, memory_cache):
+    return SiteDiscovery(site, cache=memory_cache)
+
+
+@pytest.mark.parametrize(
+    "listing, url, expected",
+    [
+        (f"{ORIGIN}/", f"{ORIGIN}/culture/x", True),
+        (f"{ORIGIN}/economie/", f"{ORIGIN}/economie/x", True),
+        (f"{ORIGIN}/economie", f"{ORIGIN}/economie/x", True),
+        (f"{ORIGIN}/economie/", f"{ORIGIN}/economie-locale/x", False),
+        (f"{ORIGIN}/economie/", f"{ORIGIN}/culture/x", False),
+        (f"{ORIGIN}/?page=2", f"{ORIGIN}/culture/x", False),
+    ],
+)
+def test_in_scope(listing, url, expected):
+    assert _in_scope(listing, url) is expected
+
+
+def test_robots_downloaded_once_and_enforced(discovery, site):
+    assert discovery.can_fetch(f"{ORIGIN}/economie/")
+    with pytest.raises(RobotsDisallowedError):
+        discovery.check(f"{ORIGIN}/prive/page")
+    assert site.requested.count(f"{ORIGIN}/robots.txt") == 1
+
+
+def test_missing_robots_allows_everything(memory_cache):
+    discovery = SiteDiscovery(_Site({}), cache=memory_cache)
+    assert discovery.can_fetch(f"{ORIGIN}/prive/page")
+
+
+def test_announced_feed_is_used_for_its_section(discovery):
+    items = discovery.feed_items(f"{ORIGIN}/economie/", 10, html=ECONOMIE_HTML)
+    assert [item["title"] for item in items] == [
+        "Les taux remontent",
+        "La bourse recule",
+    ]
+
+
+def test_other_section_does_not_reuse_announced_feed(discovery):
+    discovery.feed_items(f"{ORIGIN}/economie/", 10, html=ECONOMIE_HTML)
+    items = discovery.feed_items(f"{ORIGIN}/culture/", 10, html="<html></html>")
+    # Seul le sitemap news du site s'applique, filtré sur la rubrique
+    assert [item["url"] for item in items] == [f"{ORIGIN}/culture/un-festival-record-2"]
+
+
+def test_site_root_gets_every_news_entry(discovery):
+    items = discovery.feed_items(f"{ORIGIN}/", 10, html="<html></html>")
+    assert [item["title"] for item in items] == [
+        "Les taux remontent",
+        "Un festival record",
+    ]
+
+
+def test_site_feeds_are_cached(discovery, site, memory_cache):
+    discovery.feed_items(f"{ORIGIN}/", 10)
+    discovery.feed_items(f"{ORIGIN}/culture/", 10)
+    assert memory_cache.get_cached_data(f"{SiteDiscovery.FEEDS_PREFIX}:{ORIGIN}") == [
+        f"{ORIGIN}/sitemap-news.xml"
+    ]
+    assert site.requested.count(f"{ORIGIN}/robots.txt") == 1
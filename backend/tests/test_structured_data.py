@@ -0,0 +1,239 @@
+"""
+Tests des données structurées : JSON-LD, état embarqué, microdata et article de la page
+"""
+
+import json
+from bs4 import BeautifulSoup
+from services.structured_data import (
+    article_record,
+    has_article_records,
+    json_ld_records,
+    listing_records,
+)
+
+PAGE = "https://news.example.com/economie/"
+ARTICLE_URL = (
+    "https://news.example.com/economie/la-banque-centrale-releve-ses-taux-12345"
+)
+BODY = "La banque centrale a relevé ses taux directeurs. " * 20
+
+
+def _json_ld(data):
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def _page(*scripts, body=""):
+    return f"<html><head>{''.join(scripts)}</head><body>{body}</body></html>"
+
+
+def test_breadcrumb_entries_are_not_articles():
+    html = _page(
+        _json_ld(
+            {
+                "@type": "BreadcrumbList",
+                "itemListElement": [
+                    {
+                        "@type": "ListItem",
+                        "position": 1,
+                        "name": "Accueil",
+                        "item": "https://news.example.com/",
+                    },
+                    {
+                        "@type": "ListItem",
+                        "position": 2,
+                        "name": "Économie et finances",
+                        "item": "https://news.example.com/economie/",
+                    },
+                ],
+            }
+        )
+    )
+    assert json_ld_records(html, PAGE) == []
+
+
+def test_item_list_keeps_only_article_urls():
+    html = _page(
+        _json_ld(
+            {
+                "@type": "ItemList",
+                "itemListElement": [
+                    {
+                        "@type": "ListItem",
+                        "url": "/economie/la-banque-centrale-releve-ses-taux-12345",
+                        "name": "La banque centrale relève ses taux",
+                    },
+                    {
+                        "@type": "ListItem",
+                        "url": "/culture/",
+                        "name": "Culture",
+                    },
+                ],
+            }
+        )
+    )
+    records = json_ld_records(html, PAGE)
+    assert [(r["url"], r["title"]) for r in records] == [
+        (ARTICLE_URL, "La banque centrale relève ses taux")
+    ]
+    assert records[0]["content"] == ""
+
+
+def test_graph_news_article_fields():
+    html = _page(
+        _json_ld(
+            {
+                "@context": "https://schema.org",
+                "@graph": [
+                    {"@type": "WebPage", "url": PAGE},
+                    {
+                        "@type": "NewsArticle",
+                        "headline": "La banque centrale relève ses taux",
+                        "mainEntityOfPage": {"@id": ARTICLE_URL + "#main"},
+                        "datePublished": "2024-03-01T08:00:00Z",
+                        "articleBody": "<p>" + BODY + "</p>",
+                    },
+                ],
+            }
+        )
+    )
+    assert json_ld_records(html, PAGE) == [
+        {
+            "title": "La banque centrale relève ses taux",
+            "url": ARTICLE_URL,
+            "date": "2024-03-01T08:00:00Z",
+            "content": BODY.strip(),
+            "source": "json-ld",
+        }
+    ]
+
+
+def test_invalid_json_ld_is_ignored():
+    html = _page('<script type="application/ld+json">{"@type": </script>')
+    assert json_ld_records(html, PAGE) == []
+
+
+def test_description_is_never_used_as_content():
+    html = _page(
+        _json_ld(
+            {
+                "@type": "NewsArticle",
+                "headline": "La banque centrale relève ses taux",
+                "description": "Un court chapô de présentation.",
+            }
+        ),
+        '<meta property="og:title" content="La banque centrale relève ses taux">'
+        '<meta property="og:description" content="Un court chapô de présentation.">',
+    )
+    record = article_record(html, ARTICLE_URL)
+    assert record["url"] == ARTICLE_URL
+    assert record["title"] == "La banque centrale relève ses taux"
+    assert record["content"] == ""
+
+
+def test_article_without_url_describes_its_page():
+    html = _page(
+        _json_ld(
+            {
+                "@type": "NewsArticle",
+                "headline": "La banque centrale relève ses taux",
+                "articleBody": BODY,
+            }
+        ),
+        '<meta property="og:title" content="Titre OpenGraph">'
+        '<meta property="og:description" content="Un court chapô.">',
+    )
+    record = article_record(html, ARTICLE_URL)
+    assert record["url"] == ARTICLE_URL
+    assert record["title"] == "La banque centrale relève ses taux"
+    assert record["content"] == BODY.strip()
+
+
+def test_article_record_ignores_other_pages_articles():
+    other = "https://news.example.com/economie/un-autre-article-sur-les-taux-999"
+    html = _page(
+        _json_ld(
+            [
+                {"@type": "NewsArticle", "headline": "Premier", "url": other},
+                {"@type": "NewsArticle", "headline": "Second", "url": other + "1"},
+            ]
+        )
+    )
+    assert article_record(html, ARTICLE_URL) is None
+
+
+def test_next_data_records():
+    state = {
+        "props": {
+            "pageProps": {
+                "articles": [
+                    {
+                        "title": "La banque centrale relève ses taux",
+                        "permalink": ARTICLE_URL,
+                        "publishedAt": "2024-03-01",
+                        "body": {"rendered": "<p>" + BODY + "</p>"},
+                    },
+                    {"title": "Sans URL", "body": BODY},
+                ]
+            }
+        }
+    }
+    html = _page(
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+    )
+    records = listing_records(html, PAGE)
+    assert records == [
+        {
+            "title": "La banque centrale relève ses taux",
+            "url": ARTICLE_URL,
+            "date": "2024-03-01",
+            "content": BODY.strip(),
+            "source": "next-data",
+        }
+    ]
+    assert has_article_records(html)
+
+
+def test_navigation_state_is_not_articles():
+    state = {
+        "props": {
+            "pageProps": {
+                "menu": [
+                    {"title": "Économie", "href": "/economie"},
+                    {"title": "Culture et loisirs", "href": "/culture/"},
+                    {
+                        "title": "International",
+                        "link": "https://news.example.com/monde",
+                    },
+                ]
+            }
+        }
+    }
+    html = _page(
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+    )
+    assert listing_records(html, PAGE) == []
+    assert not has_article_records(html)
+
+
+def test_microdata_records():
+    html = _page(
+        body=(
+            '<div itemscope itemtype="https://schema.org/NewsArticle">'
+            '<h2 itemprop="headline">La banque centrale relève ses taux</h2>'
+            f'<a itemprop="url" href="{ARTICLE_URL}">Lire</a>'
+            '<time itemprop="datePublished" datetime="2024-03-01">1er mars</time>'
+            "</div>"
+        )
+    )
+    soup = BeautifulSoup(html, "html.parser")
+    records = listing_records(html, PAGE, soup)
+    assert [(r["title"], r["url"], r["date"], r["source"]) for r in records] == [
+        ("La banque centrale relève ses taux", ARTICLE_URL, "2024-03-01", "microdata")
+    ]
+
+
+def test_page_without_structured_data():
+    html = _page(body="<p>Aucune donnée structurée</p>")
+    assert not has_article_records(html)
+    assert listing_records(html, PAGE) == []
+    assert article_record(html, PAGE) is None